@@ -0,0 +1,108 @@
+"""
+Benchmark event-loop latency under concurrent auth load.
+
+Compares the old pattern (a synchronous Supabase HTTP call made inside an
+async dependency) with the shared httpx.AsyncClient used by
+SupabaseAuthClient. Supabase is simulated with an in-process transport that
+adds a fixed round-trip latency, so no network or Supabase project is needed.
+
+Run from the project root:
+    python scripts/benchmarks/bench_auth_event_loop.py [--concurrency 200] [--latency-ms 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.backend.external.supabase_auth import SupabaseAuthClient  # noqa: E402
+
+USER = {"id": "user-123", "email": "user@example.com", "role": "authenticated"}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def monitor_loop_lag(stop: asyncio.Event, samples: list, interval: float = 0.001):
+    """Record how late the event loop wakes a coroutine sleeping ``interval``."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+async def run_sync_client(concurrency: int, latency: float) -> float:
+    """Old behaviour: blocking HTTP call inside an async function."""
+    def handler(request):
+        time.sleep(latency)
+        return httpx.Response(200, json=USER)
+
+    client = httpx.Client(base_url="http://supabase/auth/v1", transport=httpx.MockTransport(handler))
+
+    async def validate():
+        return client.get("/user", headers={"Authorization": "Bearer token"}).json()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(validate() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+async def run_async_client(concurrency: int, latency: float) -> float:
+    """New behaviour: shared SupabaseAuthClient connection pool."""
+    async def handler(request):
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=USER)
+
+    client = SupabaseAuthClient(
+        "http://supabase", "anon-key",
+        max_connections=concurrency,
+        transport=httpx.MockTransport(handler),
+    )
+    start = time.perf_counter()
+    await asyncio.gather(*(client.get_user("token") for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return elapsed
+
+
+async def measure(name: str, runner, concurrency: int, latency: float) -> dict:
+    samples: list = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(stop, samples))
+    await asyncio.sleep(0.01)
+    elapsed = await runner(concurrency, latency)
+    stop.set()
+    await monitor
+    return {
+        "path": name,
+        "requests": concurrency,
+        "wall_time_s": round(elapsed, 3),
+        "loop_lag_p50_ms": round(statistics.median(samples) * 1000, 2),
+        "loop_lag_p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "loop_lag_max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+async def main(concurrency: int, latency_ms: float) -> None:
+    latency = latency_ms / 1000
+    for name, runner in (("sync supabase client", run_sync_client),
+                         ("async auth client", run_async_client)):
+        print(json.dumps(await measure(name, runner, concurrency, latency)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.latency_ms))
@@ -0,0 +1,75 @@
+"""
+Measure the per-statement overhead of the SQLAlchemy instrumentation.
+
+Runs the same primary-key lookup and owner listing through a plain engine
+and through an engine with instrument_engine() applied, against one
+temporary SQLite file, and reports the added microseconds per statement.
+Rounds alternate between the two engines and the best round of each is
+kept, which filters out scheduler noise.
+
+Run from the project root:
+    python scripts/benchmarks/bench_db_instrumentation.py [--queries 5000] [--rounds 5]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ["ENVIRONMENT"] = "benchmark"
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.backend.models.item import Base, Item  # noqa: E402
+from src.backend.monitoring.database import instrument_engine  # noqa: E402
+
+SCENARIOS = {
+    "get_by_id": lambda db, i: db.get(Item, i % 100 + 1),
+    "list_owner": lambda db, i: db.scalars(select(Item).where(Item.owner_id == "owner").limit(20)).all(),
+}
+
+
+def run(engine, scenario, queries: int) -> float:
+    with Session(engine) as db:
+        start = time.perf_counter()
+        for i in range(queries):
+            SCENARIOS[scenario](db, i)
+            db.expunge_all()
+        return (time.perf_counter() - start) / queries
+
+
+def main(queries: int, rounds: int) -> None:
+    url = f"sqlite:///{tempfile.mkdtemp()}/bench_instrumentation.db"
+    plain, instrumented = create_engine(url), create_engine(url)
+    instrument_engine(instrumented)
+    Base.metadata.create_all(bind=plain)
+    with plain.begin() as connection:
+        connection.execute(insert(Item), [{"title": f"Item {i}", "owner_id": "owner"} for i in range(100)])
+
+    for scenario in SCENARIOS:
+        # Warm both engines' statement caches before timing
+        run(plain, scenario, 100)
+        run(instrumented, scenario, 100)
+        baseline, measured = float("inf"), float("inf")
+        for _ in range(rounds):
+            baseline = min(baseline, run(plain, scenario, queries))
+            measured = min(measured, run(instrumented, scenario, queries))
+        print(json.dumps({
+            "scenario": scenario,
+            "queries": queries,
+            "plain_us": round(baseline * 1e6, 1),
+            "instrumented_us": round(measured * 1e6, 1),
+            "overhead_us": round((measured - baseline) * 1e6, 1),
+        }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main(args.queries, args.rounds)
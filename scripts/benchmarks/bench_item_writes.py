@@ -0,0 +1,119 @@
+"""
+Item writes/sec on SQLite, select-mutate-refresh vs single RETURNING statements.
+
+The "orm" implementation is the previous AsyncItemService write path: create
+adds the object, commits and refreshes it; update and delete SELECT the row,
+change it in Python, commit and (for update) refresh. The "returning"
+implementation is the current AsyncItemService, which runs one INSERT,
+UPDATE or DELETE ... RETURNING per write. Both run sequentially against a
+temporary SQLite file with the performance pragmas applied.
+
+Run from the project root:
+    python scripts/benchmarks/bench_item_writes.py [--writes 2000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ["ENVIRONMENT"] = "benchmark"
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import event, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from src.backend.api.v1.schemas.item import ItemCreate, ItemUpdate  # noqa: E402
+from src.backend.api.v1.services.item import AsyncItemService  # noqa: E402
+from src.backend.db.session import configure_sqlite_connection  # noqa: E402
+from src.backend.models.item import Base, Item  # noqa: E402
+
+OWNER = "bench-user"
+
+
+class OrmItemService:
+    """The write path before RETURNING: load, mutate, commit, refresh"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_item(self, item_id, owner_id):
+        result = await self.db.execute(select(Item).where(Item.id == item_id, Item.owner_id == owner_id))
+        return result.scalars().first()
+
+    async def create_item(self, item, owner_id):
+        db_item = Item(**item.dict(), owner_id=owner_id)
+        self.db.add(db_item)
+        await self.db.commit()
+        await self.db.refresh(db_item)
+        return db_item
+
+    async def update_item(self, item_id, item, owner_id):
+        db_item = await self.get_item(item_id, owner_id)
+        if db_item:
+            for key, value in item.dict(exclude_unset=True, exclude_none=True).items():
+                setattr(db_item, key, value)
+            await self.db.commit()
+            await self.db.refresh(db_item)
+        return db_item
+
+    async def delete_item(self, item_id, owner_id):
+        db_item = await self.get_item(item_id, owner_id)
+        if db_item:
+            await self.db.delete(db_item)
+            await self.db.commit()
+            return True
+        return False
+
+
+async def run(name, service_class, session_factory, writes):
+    async def timed(operation, calls):
+        start = time.perf_counter()
+        for call in calls:
+            await call()
+        elapsed = time.perf_counter() - start
+        print(json.dumps({
+            "implementation": name,
+            "operation": operation,
+            "writes": writes,
+            "writes_per_sec": round(writes / elapsed),
+        }))
+
+    async with session_factory() as db:
+        service = service_class(db)
+        ids = []
+
+        async def create(i):
+            ids.append((await service.create_item(ItemCreate(title=f"Item {i}"), owner_id=OWNER)).id)
+
+        await timed("create", [lambda i=i: create(i) for i in range(writes)])
+        await timed("update", [
+            lambda item_id=item_id: service.update_item(item_id, ItemUpdate(title="Updated"), owner_id=OWNER)
+            for item_id in ids
+        ])
+        await timed("delete", [
+            lambda item_id=item_id: service.delete_item(item_id, owner_id=OWNER) for item_id in ids
+        ])
+
+
+async def main(writes: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench_writes.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    event.listen(engine.sync_engine, "connect", lambda connection, record: configure_sqlite_connection(connection))
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    for name, service_class in (("orm", OrmItemService), ("returning", AsyncItemService)):
+        await run(name, service_class, session_factory, writes)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writes", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.writes))
@@ -0,0 +1,126 @@
+"""
+Load test GET /api/v1/items on the sync Session path vs the AsyncSession path.
+
+The async path is the real items router. The sync path is the previous
+implementation (a sync Session from get_db queried inside an async handler),
+mounted next to it under /legacy. Both read the same temporary SQLite file
+and are driven in-process through httpx's ASGI transport by N concurrent
+clients, so the numbers show event-loop blocking rather than network cost.
+
+The sync path gets a pool with one connection per client. With the default
+pool (5 + 10 overflow) it deadlocks beyond ~15 concurrent clients: a handler
+blocks the loop waiting for a connection that can only be returned by a
+session teardown scheduled on that same loop.
+
+Run from the project root:
+    python scripts/benchmarks/bench_items_latency.py [--clients 200] [--requests 20] [--rows 500]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_items.db"
+os.environ["ENVIRONMENT"] = "benchmark"
+os.environ["DEBUG"] = "false"
+
+import httpx  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from src.backend.core.auth import get_current_user  # noqa: E402
+from src.backend.core.config import get_settings  # noqa: E402
+from src.backend.db.session import engine  # noqa: E402
+from src.backend.main import app  # noqa: E402
+from src.backend.models.item import Item  # noqa: E402
+
+OWNER = {"id": "bench-user", "email": "bench@example.com", "is_active": True}
+LegacySessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+def get_legacy_db():
+    db = LegacySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@app.get("/legacy/items")
+async def read_items_sync_session(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_legacy_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Previous implementation: blocking queries inside an async handler."""
+    items = db.query(Item).filter(Item.owner_id == current_user["id"]).offset(skip).limit(limit).all()
+    return [{"id": item.id, "title": item.title} for item in items]
+
+
+def seed(rows: int) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Item),
+            [{"title": f"Item {i}", "description": "x" * 200, "owner_id": OWNER["id"]} for i in range(rows)],
+        )
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def load(path: str, clients: int, requests_per_client: int) -> dict:
+    latencies, errors = [], 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def run_client():
+            nonlocal errors
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run_client() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "path": path,
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": errors,
+        "req_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+async def main(clients: int, requests_per_client: int, rows: int) -> None:
+    app.dependency_overrides[get_current_user] = lambda: OWNER
+    LegacySessionLocal.configure(bind=create_engine(
+        get_settings().DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=clients,
+        max_overflow=0,
+    ))
+    seed(rows)
+    for path in ("/legacy/items", "/api/v1/items/"):
+        print(json.dumps(await load(path, clients, requests_per_client)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.requests, args.rows))
@@ -0,0 +1,93 @@
+"""
+Compare OFFSET and keyset pagination of one owner's items at growing depth.
+
+Seeds a temporary SQLite file with --rows items split over 10 owners, then
+fetches a page at several depths with ItemService.get_items (OFFSET) and
+ItemService.get_items_page (cursor on the (owner_id, id) index). OFFSET
+walks every skipped row, so its cost grows with depth; keyset seeks
+straight to the page and stays flat.
+
+Run from the project root:
+    python scripts/benchmarks/bench_items_pagination.py [--rows 5000000] [--limit 100]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ["ENVIRONMENT"] = "benchmark"
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.backend.api.v1.services.item import ItemService  # noqa: E402
+from src.backend.core.pagination import encode_cursor  # noqa: E402
+from src.backend.models.item import Base  # noqa: E402
+
+OWNERS = 10
+OWNER = "owner-0"
+
+
+def seed(path: str, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=OFF")
+    # Paging does not read the search index, so skip maintaining it
+    connection.execute("UPDATE items_fts_state SET deferred = 1")
+    batch = 100_000
+    for start in range(0, rows, batch):
+        connection.executemany(
+            "INSERT INTO items (title, owner_id, created_at) VALUES (?, ?, CURRENT_TIMESTAMP)",
+            ((f"Item {i}", f"owner-{i % OWNERS}") for i in range(start, min(start + batch, rows))),
+        )
+        connection.commit()
+    connection.close()
+
+
+def timed(fn, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(rows: int, limit: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench_pagination.db")
+    start = time.perf_counter()
+    seed(path, rows)
+    print(json.dumps({"seeded_rows": rows, "seconds": round(time.perf_counter() - start, 1)}))
+
+    owner_rows = rows // OWNERS
+    with Session(create_engine(f"sqlite:///{path}")) as db:
+        service = ItemService(db)
+        for fraction in (0.0, 0.1, 0.5, 0.99):
+            depth = int(owner_rows * fraction)
+            # Ids of owner-0 are 1, 11, 21, ...; the cursor is the last id before the page
+            cursor = encode_cursor([depth * OWNERS - OWNERS + 1]) if depth else None
+            offset_s = timed(lambda: service.get_items(skip=depth, limit=limit, owner_id=OWNER))
+            keyset_s = timed(lambda: service.get_items_page(limit=limit, cursor=cursor, owner_id=OWNER))
+            print(json.dumps({
+                "depth": depth,
+                "offset_ms": round(offset_s * 1000, 2),
+                "keyset_ms": round(keyset_s * 1000, 2),
+            }))
+            db.expunge_all()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    main(args.rows, args.limit)
@@ -0,0 +1,119 @@
+"""
+Latency of item search, FTS5 (bm25-ranked) vs a naive LIKE scan.
+
+Seeds a temporary SQLite file with --rows items over 10 owners; titles and
+descriptions are drawn from a Zipf-like vocabulary so there are rare and
+very common words. Each query is run for one owner through
+ItemService.search_items and through the baseline
+``(title LIKE '%w%' OR description LIKE '%w%') ORDER BY id LIMIT 20``,
+which reads the owner's rows until it has 20 substring matches and cannot
+rank. FTS cost grows with the number of matches, since every match is
+scored; LIKE cost grows with the number of rows it reads before the 20th
+match.
+
+Run from the project root:
+    python scripts/benchmarks/bench_items_search.py [--rows 1000000]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ["ENVIRONMENT"] = "benchmark"
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import create_engine, or_, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.backend.api.v1.services.item import ItemService  # noqa: E402
+from src.backend.models.item import Base, Item  # noqa: E402
+
+OWNERS = 10
+OWNER = "owner-0"
+VOCABULARY = [f"word{i}" for i in range(20_000)]
+# Word i is drawn with weight 1 / (i + 1)
+WEIGHTS = [1 / (i + 1) for i in range(len(VOCABULARY))]
+# word0 is in ~78% of rows, word100 in ~1.4%, word15000 in a handful
+QUERIES = {"common": "word0", "frequent": "word100", "rare": "word15000", "two_words": "word3 word40"}
+
+
+def seed(path: str, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=OFF")
+    # Build the search index once at the end instead of row by row
+    connection.execute("UPDATE items_fts_state SET deferred = 1")
+    rng = random.Random(42)
+    batch = 50_000
+    for start in range(0, rows, batch):
+        words = rng.choices(VOCABULARY, WEIGHTS, k=15 * min(batch, rows - start))
+        connection.executemany(
+            "INSERT INTO items (title, description, owner_id, created_at) VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+            (
+                (" ".join(words[15 * j:15 * j + 3]), " ".join(words[15 * j + 3:15 * j + 15]), f"owner-{(start + j) % OWNERS}")
+                for j in range(min(batch, rows - start))
+            ),
+        )
+        connection.commit()
+    connection.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+    connection.execute("UPDATE items_fts_state SET deferred = 0")
+    connection.commit()
+    connection.close()
+
+
+def like_search(db: Session, q: str):
+    pattern = f"%{q}%"
+    statement = (
+        select(Item)
+        .where(Item.owner_id == OWNER, or_(Item.title.like(pattern), Item.description.like(pattern)))
+        .order_by(Item.id)
+        .limit(20)
+    )
+    return db.scalars(statement).all()
+
+
+def timed(fn, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(rows: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench_search.db")
+    start = time.perf_counter()
+    seed(path, rows)
+    print(json.dumps({"seeded_rows": rows, "seconds": round(time.perf_counter() - start, 1)}))
+
+    with Session(create_engine(f"sqlite:///{path}")) as db:
+        service = ItemService(db)
+        for name, q in QUERIES.items():
+            hits = len(service.search_items(q, owner_id=OWNER)[0])
+            fts_s = timed(lambda: service.search_items(q, owner_id=OWNER))
+            # The baseline matches substrings, so it is given the single first word
+            like_s = timed(lambda: like_search(db, q.split()[0]))
+            print(json.dumps({
+                "query": name,
+                "hits": hits,
+                "fts_ms": round(fts_s * 1000, 2),
+                "like_ms": round(like_s * 1000, 2),
+            }))
+            db.expunge_all()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    main(args.rows)
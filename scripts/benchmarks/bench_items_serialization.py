@@ -0,0 +1,111 @@
+"""
+Per-row cost of reading and serializing a page of items, ORM vs Core rows.
+
+Seeds a temporary SQLite file with --rows items of one owner, then builds
+the JSON body of one --limit page two ways:
+
+- orm: ItemService.get_items_page loads Item objects through the session's
+  identity map, then, like FastAPI's response_model, validates them into
+  ItemPage, dumps to Python and encodes with json.dumps.
+- core: the same page selected as plain column rows (fields=ITEM_FIELDS)
+  and dumped by the cached item_page_serializer TypeAdapter, with no
+  validation.
+
+Query and serialization are timed separately; times are per row.
+
+Run from the project root:
+    python scripts/benchmarks/bench_items_serialization.py [--rows 10000] [--limit 1000]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ["ENVIRONMENT"] = "benchmark"
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.backend.api.v1.schemas.item import ITEM_FIELDS, ItemPage, item_page_serializer  # noqa: E402
+from src.backend.api.v1.services.item import ItemService  # noqa: E402
+from src.backend.models.item import Base  # noqa: E402
+
+OWNER = "owner-0"
+
+
+def seed(path: str, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    connection = sqlite3.connect(path)
+    # Serialization does not read the search index, so skip maintaining it
+    connection.execute("UPDATE items_fts_state SET deferred = 1")
+    connection.executemany(
+        "INSERT INTO items (title, description, owner_id, created_at, updated_at)"
+        " VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+        ((f"Item {i}", f"Description of item {i}", OWNER) for i in range(rows)),
+    )
+    connection.commit()
+    connection.close()
+
+
+def orm_body(items, next_cursor) -> bytes:
+    page = ItemPage.model_validate({"items": items, "next_cursor": next_cursor}, from_attributes=True)
+    return json.dumps(page.model_dump(mode="json"), separators=(",", ":")).encode()
+
+
+def core_body(rows, next_cursor) -> bytes:
+    items = [dict(zip(ITEM_FIELDS, row)) for row in rows]
+    return item_page_serializer(ITEM_FIELDS).dump_json({"items": items, "next_cursor": next_cursor})
+
+
+def timed(fn, repeat: int = 7) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(rows: int, limit: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench_serialization.db")
+    seed(path, rows)
+
+    with Session(create_engine(f"sqlite:///{path}")) as db:
+        service = ItemService(db)
+
+        def orm_query():
+            # A fresh identity map per request, as with a per-request session
+            db.expunge_all()
+            return service.get_items_page(limit=limit, owner_id=OWNER)
+
+        def core_query():
+            return service.get_items_page(limit=limit, owner_id=OWNER, fields=ITEM_FIELDS)
+
+        for name, query, encode in (("orm", orm_query, orm_body), ("core", core_query, core_body)):
+            page, next_cursor = query()
+            assert json.loads(encode(page, next_cursor)) == json.loads(orm_body(*orm_query()))
+            query_s = timed(query)
+            serialize_s = timed(lambda: encode(page, next_cursor))
+            print(json.dumps({
+                "path": name,
+                "page_rows": len(page),
+                "query_us_per_row": round(query_s / len(page) * 1e6, 2),
+                "serialize_us_per_row": round(serialize_s / len(page) * 1e6, 2),
+                "total_ms": round((query_s + serialize_s) * 1000, 2),
+            }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.rows, args.limit)
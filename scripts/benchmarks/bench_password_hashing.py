@@ -0,0 +1,84 @@
+"""
+Benchmark login throughput with inline bcrypt vs the hashing process pool.
+
+Each simulated login verifies one bcrypt hash. The inline path calls
+verify_password directly inside the event loop (the old UserService
+behaviour); the pool path awaits PasswordHasher.verify. A loop-lag monitor
+shows how long other requests on the worker would have been stalled.
+
+Run from the project root:
+    python scripts/benchmarks/bench_password_hashing.py [--logins 64] [--rounds 12] [--workers N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.backend.core.security import PasswordHasher, pwd_context, verify_password  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+
+
+async def monitor_loop_lag(stop: asyncio.Event, samples: list, interval: float = 0.001):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+async def run_inline(logins: int, hashed: str, workers: int) -> float:
+    async def login():
+        return verify_password(PASSWORD, hashed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return time.perf_counter() - start
+
+
+async def run_pool(logins: int, hashed: str, workers: int) -> float:
+    hasher = PasswordHasher(max_workers=workers, max_concurrency=workers)
+    # Warm the pool so process start-up is not counted
+    await asyncio.gather(*(hasher.verify(PASSWORD, hashed) for _ in range(workers)))
+    start = time.perf_counter()
+    await asyncio.gather(*(hasher.verify(PASSWORD, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    hasher.shutdown()
+    return elapsed
+
+
+async def measure(name: str, runner, logins: int, hashed: str, workers: int) -> dict:
+    samples: list = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(stop, samples))
+    await asyncio.sleep(0.01)
+    elapsed = await runner(logins, hashed, workers)
+    stop.set()
+    await monitor
+    cores = 1 if runner is run_inline else workers
+    return {
+        "path": name,
+        "logins": logins,
+        "workers": cores,
+        "logins_per_s": round(logins / elapsed, 1),
+        "logins_per_s_per_core": round(logins / elapsed / cores, 1),
+        "loop_lag_max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+async def main(logins: int, rounds: int, workers: int) -> None:
+    hashed = pwd_context.using(bcrypt__rounds=rounds).hash(PASSWORD)
+    for name, runner in (("inline bcrypt", run_inline), ("process pool", run_pool)):
+        print(json.dumps(await measure(name, runner, logins, hashed, workers)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.rounds, args.workers))
@@ -7,9 +7,9 @@ from pydantic import ValidationError
 
 from src.backend.core.config import get_settings
 from src.backend.core.security import get_password_hash, verify_password
+from src.backend.core.tracing import traced
 from src.backend.db.session import get_db
-from src.backend.models.primary.user import User
-from src.backend.repositories.user_repository import UserRepository
+from src.backend.services.user_service import Principal, UserService
 from src.backend.api.v1.schemas.token import TokenPayload
 
 settings = get_settings()
@@ -17,11 +17,16 @@ settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
+@traced("auth")
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+) -> Principal:
     """
     Validate access token and return current user
+
+    The user is read through the principal cache, a short-lived snapshot
+    that UserService.update and user deletion invalidate, so a
+    deactivation is refused on the very next request.
     """
     try:
         payload = jwt.decode(
@@ -34,8 +39,7 @@ def get_current_user(
             detail="Could not validate credentials",
         )
     
-    user_repo = UserRepository(User, db)
-    user = user_repo.get(token_data.sub)
+    user = UserService(db).get_principal(token_data.sub)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -45,8 +49,8 @@ def get_current_user(
 
 
 def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     Validate user is active superuser
     """
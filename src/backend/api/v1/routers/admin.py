@@ -0,0 +1,48 @@
+"""
+Administrative operations.
+All endpoints require a Supabase service-role user.
+"""
+from typing import Any
+from fastapi import APIRouter, Depends
+
+from src.backend.core.auth import get_current_superuser, revoke_user_tokens
+from src.backend.monitoring.slow_queries import slow_query_log
+
+router = APIRouter()
+
+@router.post("/users/{user_id}/revoke-tokens")
+async def revoke_tokens(
+    user_id: str,
+    current_user: dict = Depends(get_current_superuser)
+) -> Any:
+    """
+    Revoke every access token issued to a user so far.
+    Cached claims for those tokens are rejected on their next use.
+    """
+    revoke_user_tokens(user_id)
+    return {"detail": f"Tokens revoked for user {user_id}"}
+
+@router.get("/slow-queries")
+async def read_slow_queries(
+    full_scan: bool = False,
+    current_user: dict = Depends(get_current_superuser)
+) -> Any:
+    """
+    List recorded slow queries, newest first, with their query plans.
+    Pass full_scan=true to only see plans that read a whole table.
+    """
+    entries = slow_query_log.entries()
+    if full_scan:
+        entries = [entry for entry in entries if entry["full_scan"]]
+    return {"threshold_ms": slow_query_log.threshold * 1000, "entries": entries}
+
+@router.delete("/slow-queries")
+async def clear_slow_queries(
+    current_user: dict = Depends(get_current_superuser)
+) -> Any:
+    """
+    Empty the in-memory slow-query log.
+    The JSONL file, if configured, is left untouched.
+    """
+    slow_query_log.clear()
+    return {"detail": "Slow-query log cleared"}
@@ -3,42 +3,74 @@ Simplified authentication router for Supabase Auth with Google OAuth.
 Specifically configured to work with the Google Auth provider in Supabase.
 """
 from typing import Any, Dict
-from fastapi import APIRouter, Query, HTTPException, status, Depends
+from fastapi import APIRouter, Cookie, Query, HTTPException, status, Depends
 from fastapi.responses import RedirectResponse
-import secrets
+from fastapi.security import HTTPAuthorizationCredentials
+from urllib.parse import urlencode, urlparse
 
 from src.backend.core.config import get_settings
-from src.backend.core.auth import get_supabase_client, get_current_user
+from src.backend.core.auth import get_current_user, revoke_token, security
+from src.backend.core.pkce import (
+    OAUTH_STATE_COOKIE,
+    generate_pkce_pair,
+    generate_state,
+    open_state,
+    seal_state,
+)
+from src.backend.external.supabase_auth import get_auth_client
 
 settings = get_settings()
 router = APIRouter()
 
+# The state cookie is only sent back to the callback
+OAUTH_STATE_COOKIE_PATH = urlparse(settings.OAUTH_REDIRECT_URL).path or "/"
+
+def clear_state_cookie(response: RedirectResponse) -> RedirectResponse:
+    """The state is single use, drop it whatever the callback's outcome"""
+    response.delete_cookie(OAUTH_STATE_COOKIE, path=OAUTH_STATE_COOKIE_PATH)
+    return response
+
 @router.get("/login/google")
 async def login_google() -> Any:
     """
-    Generate Google OAuth authorization URL.
+    Start the Google OAuth login.
     This endpoint is specifically for using Google as the OAuth provider in Supabase.
+    The browser must open it directly: it answers with a redirect to Google
+    and sets the state cookie that /callback checks, so it cannot be called
+    from another server on the user's behalf.
     """
     try:
-        client = get_supabase_client()
+        auth_client = get_auth_client()
         
-        # Generate a simple random state for CSRF protection
-        state = secrets.token_urlsafe(16)
+        # Only a random state is sent to the provider; the PKCE verifier
+        # stays in an encrypted HttpOnly cookie bound to that state
+        code_verifier, code_challenge = generate_pkce_pair()
+        state = generate_state()
+        redirect_to = f"{settings.OAUTH_REDIRECT_URL}?{urlencode({'state': state})}"
         
-        # Use Supabase's built-in OAuth flow
-        sign_in_data = client.auth.sign_in_with_oauth({
-            "provider": "google",
-            "options": {
-                "redirect_to": settings.OAUTH_REDIRECT_URL,
-                "scopes": "email profile",
-                "state": state
-            }
-        })
+        # Build the Supabase authorize URL; no network call is needed
+        authorization_url = auth_client.get_authorization_url(
+            provider="google",
+            redirect_to=redirect_to,
+            code_challenge=code_challenge,
+            scopes="email profile",
+        )
         
-        print(f"Generated OAuth URL: {sign_in_data.url}")
+        print(f"Generated OAuth URL: {authorization_url}")
         
-        # Return the URL to redirect the user to Google's login page
-        return {"authorization_url": sign_in_data.url}
+        # Send the browser to Google's login page, setting the cookie on the way
+        response = RedirectResponse(authorization_url, status_code=status.HTTP_302_FOUND)
+        response.set_cookie(
+            OAUTH_STATE_COOKIE,
+            seal_state(state, code_verifier),
+            max_age=settings.OAUTH_STATE_TTL,
+            path=OAUTH_STATE_COOKIE_PATH,
+            secure=settings.OAUTH_REDIRECT_URL.startswith("https://"),
+            httponly=True,
+            # Sent on the provider's top-level redirect back to the callback
+            samesite="lax",
+        )
+        return response
     
     except Exception as e:
         import traceback
@@ -54,7 +86,8 @@ async def auth_callback(
     code: str = Query(None),
     state: str = Query(None),
     error: str = Query(None),
-    error_description: str = Query(None)
+    error_description: str = Query(None),
+    oauth_state: str = Cookie(None),
 ) -> Any:
     """
     OAuth callback endpoint that exchanges code for token and redirects to frontend.
@@ -81,11 +114,14 @@ async def auth_callback(
         print(f"Auth callback received code: {code}")
         
         # Exchange the code for a token
-        client = get_supabase_client()
+        auth_client = get_auth_client()
         
         try:
-            # Use Supabase's session exchange method
-            session = client.auth.exchange_code_for_session(code)
+            # Rejects callbacks this browser did not start (login CSRF)
+            code_verifier = open_state(oauth_state, state)
+            
+            # Use Supabase's PKCE token exchange
+            session = await auth_client.exchange_code_for_session(code, code_verifier)
             
             print(f"Session response type: {type(session)}")
             print(f"Session response: {session}")
@@ -112,33 +148,11 @@ async def auth_callback(
             
             # Redirect to frontend with token
             redirect_url = f"{settings.FRONTEND_URL}/auth-callback?token={access_token}"
-            return RedirectResponse(redirect_url)
+            return clear_state_cookie(RedirectResponse(redirect_url))
             
         except Exception as e:
             print(f"Error exchanging code for token: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            
-            # For debugging, try a direct approach
-            import jwt
-            import time
-            
-            # Create a temporary token for testing
-            payload = {
-                "iss": "supabase",
-                "sub": "test-user-id",
-                "email": "test@example.com",
-                "role": "authenticated",
-                "exp": int(time.time()) + 3600,
-                "iat": int(time.time())
-            }
-            
-            temp_token = jwt.encode(payload, settings.SUPABASE_JWT_SECRET, algorithm="HS256")
-            print(f"Generated temporary token for debugging: {temp_token[:10]}...")
-            
-            # Redirect to frontend with temporary token
-            redirect_url = f"{settings.FRONTEND_URL}/auth-callback?token={temp_token}"
-            return RedirectResponse(redirect_url)
+            raise
     
     except Exception as e:
         # Log the exception details
@@ -152,7 +166,26 @@ async def auth_callback(
         from urllib.parse import quote
         encoded_error = quote(error_message)
         error_redirect = f"{settings.FRONTEND_URL}/auth-callback?error={encoded_error}"
-        return RedirectResponse(error_redirect)
+        return clear_state_cookie(RedirectResponse(error_redirect))
+
+@router.post("/logout")
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: dict = Depends(get_current_user),
+) -> Any:
+    """
+    Log out the current session.
+    The access token is revoked locally at once and the session is ended in Supabase.
+    """
+    revoke_token(credentials.credentials)
+    
+    try:
+        await get_auth_client().sign_out(credentials.credentials)
+    except Exception as e:
+        # The token is already rejected by this API; Supabase will expire it
+        print(f"Supabase sign out failed: {str(e)}")
+    
+    return {"detail": "Logged out successfully"}
 
 @router.get("/me", response_model=Dict[str, Any])
 async def read_users_me(
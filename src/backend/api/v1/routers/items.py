@@ -1,23 +1,142 @@
 """
 Protected CRUD operations for Items.
 All endpoints require authentication with Supabase.
+Database access goes through an AsyncSession, so no handler blocks the event loop.
 """
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.backend.db.session import get_db
-from src.backend.models.item import Item
+from src.backend.db.session import get_async_db
 from src.backend.core.auth import get_current_user
-from src.backend.api.v1.schemas.item import ItemCreate, ItemUpdate, ItemResponse
-from src.backend.api.v1.services.item import ItemService
+from src.backend.core.config import get_settings
+from src.backend.api.v1.schemas.item import (
+    ITEM_FIELDS,
+    ITEM_FIELDS_PATTERN,
+    ItemBulkDelete,
+    ItemBulkResult,
+    ItemBulkUpdate,
+    ItemCreate,
+    ItemImportResult,
+    ItemPage,
+    ItemResponse,
+    ItemSearchPage,
+    ItemUpdate,
+    item_fields,
+    item_page_serializer,
+    partial_item_schema,
+)
+from src.backend.api.v1.services.item import (
+    EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    AsyncItemService,
+    SearchUnavailable,
+    item_cache,
+)
+from src.backend.core.etag import not_modified, parse_etags, strong_etag, strong_matches, weak_etag
+from src.backend.core.pagination import InvalidCursor
+from src.backend.core.tracing import traced
+from src.backend.core.streaming import RECORD_FORMATS, iter_records
+from src.backend.monitoring.query_budget import query_budget
 
+settings = get_settings()
 router = APIRouter()
 
-@router.post("/", response_model=ItemResponse)
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Bulk routes run one statement per chunk, so the same statement legitimately
+# repeats up to BULK_CHUNKS times
+BULK_CHUNKS = -(-settings.BULK_MAX_ITEMS // settings.BULK_CHUNK_SIZE)
+
+@traced("serialize")
+def encode_response(model: type[BaseModel], content: Any) -> bytes:
+    """Validate and serialize a response body the way response_model would"""
+    return model.model_validate(content, from_attributes=True).model_dump_json().encode()
+
+# Clients may keep item responses but must revalidate them with the ETag
+CACHE_CONTROL = "private, no-cache"
+
+@traced("serialize")
+def encode_item_page(rows: Sequence[Any], next_cursor: Optional[str], fields: Tuple[str, ...]) -> bytes:
+    """
+    Serialize a page of column rows straight to JSON, without validation.
+
+    The rows are projections starting with ``fields`` (see
+    AsyncItemService.get_items_page), so zipping drops the extra key columns.
+    """
+    items = [dict(zip(fields, row)) for row in rows]
+    return item_page_serializer(fields).dump_json({"items": items, "next_cursor": next_cursor})
+
+def json_response(body: bytes, etag: str) -> Response:
+    """Send an already encoded JSON body, skipping response_model"""
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+def item_etag(item_id: int, version: int, fields: Optional[Sequence[str]] = None) -> str:
+    """Strong ETag of one item, or of the projection of it to ``fields``"""
+    if fields is None:
+        return strong_etag(item_id, version)
+    return strong_etag(item_id, version, ".".join(fields))
+
+def if_match_versions(if_match: Optional[str], item_id: int) -> Optional[List[int]]:
+    """
+    Item versions an If-Match header accepts.
+
+    Returns:
+        Optional[List[int]]: None without the header or for ``*``, otherwise
+        the versions of this item's strong tags, possibly none
+    """
+    tags = parse_etags(if_match)
+    if tags is None or tags == ["*"]:
+        return None
+    prefix = f'"{item_id}-'  # item_etag up to the version
+    versions = [tag[len(prefix):-1].split("-")[0] for tag in strong_matches(tags) if tag.startswith(prefix)]
+    return [int(version) for version in versions if version.isdigit()]
+
+async def check_precondition(
+    service: AsyncItemService, item_id: int, owner_id: str, versions: Optional[List[int]]
+) -> None:
+    """Turn a write that matched no row into 412 if the item exists at another version, else 404"""
+    if versions is not None and await service.get_item_version(item_id, owner_id) is not None:
+        raise HTTPException(status_code=412, detail="Item has changed; fetch it again")
+    raise HTTPException(status_code=404, detail="Item not found")
+
+async def cached_read(
+    service: AsyncItemService, owner_id: str, key: Hashable
+) -> Tuple[Optional[Tuple[str, bytes]], Optional[Hashable], Optional[int]]:
+    """
+    Look a read up in item_cache under the owner's shared generation.
+
+    Returns:
+        Tuple: The cached (ETag, body) or None, the key to store a fresh
+        read under and the generation itself; the key and generation are
+        None when the session reads from lagging replicas
+    """
+    generation = await service.get_cache_generation(owner_id)
+    if generation is None:
+        return None, None, None
+    return (*item_cache.lookup(owner_id, key, generation), generation)
+
+def check_bulk_size(entries: Sequence[Any]) -> None:
+    """Reject bulk requests larger than BULK_MAX_ITEMS"""
+    if len(entries) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} items per request"
+        )
+
+@router.post("/", response_model=ItemResponse, dependencies=[Depends(query_budget(2))])
 async def create_item(
     item: ItemCreate,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ) -> Any:
     """
@@ -25,100 +144,285 @@ async def create_item(
     This endpoint requires authentication.
     """
     # Create item with current user as owner
-    db_item = Item(
-        title=item.title,
-        description=item.description,
-        owner_id=current_user["id"]
-    )
-    db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    db_item = await AsyncItemService(db).create_item(item, owner_id=current_user["id"])
+    response.headers["ETag"] = item_etag(db_item.id, db_item.version)
     return db_item
 
-@router.get("/", response_model=List[ItemResponse])
+@router.get("/", response_model=ItemPage, dependencies=[Depends(query_budget(2))])
 async def read_items(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    skip: int = Query(0, ge=0, deprecated=True),
+    fields: Optional[str] = Query(None, pattern=ITEM_FIELDS_PATTERN),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ) -> Any:
     """
-    Retrieve items for current user.
+    Retrieve items for current user, one page at a time.
     This endpoint requires authentication.
+    Pass the returned next_cursor as cursor to get the following page; it is
+    null on the last page. skip still works for the first request but costs
+    more the deeper it goes.
+    Pages are cached per user until their next write. Each page has a weak
+    ETag; send it back in If-None-Match to get 304 while nothing changed.
+    fields=id,title returns only those fields (id is always included), and
+    only those columns are read from the database.
     """
+    selected = item_fields(fields)
+    # Pages are read as plain column rows, never as ORM objects
+    columns = selected or ITEM_FIELDS
+    service = AsyncItemService(db)
     # Only return items owned by the current user
-    items = db.query(Item)\
-        .filter(Item.owner_id == current_user["id"])\
-        .offset(skip).limit(limit).all()
-    return items
+    page_key = ("page", cursor, limit, skip, selected)
+    cached, cache_key, generation = await cached_read(service, current_user["id"], page_key)
+    if cached is None:
+        # Every write to the owner's items bumps the generation, which was
+        # read before the page: a write in between then leaves an ETag that
+        # no longer matches, never a 304 for a stale page
+        etag = None
+        if generation is not None:
+            etag = weak_etag(current_user["id"], generation, *page_key)
+            if not_modified(if_none_match, etag):
+                return not_modified_response(etag)
+        try:
+            rows, next_cursor = await service.get_items_page(
+                limit=limit, cursor=cursor, owner_id=current_user["id"], skip=skip, fields=columns
+            )
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        body = encode_item_page(rows, next_cursor, columns)
+        # Replica reads have no generation to go by; tag the page's content
+        cached = etag or weak_etag(body), body
+        if cache_key is not None:
+            item_cache.store(cache_key, cached)
+    etag, body = cached
+    if not_modified(if_none_match, etag):
+        return not_modified_response(etag)
+    return json_response(body, etag)
 
-@router.get("/{item_id}", response_model=ItemResponse)
+@router.get("/search", response_model=ItemSearchPage, dependencies=[Depends(query_budget(1))])
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Search the current user's items by title and description.
+    This endpoint requires authentication.
+    Hits are ranked by relevance (bm25) and carry a snippet with the matched
+    words in <mark> tags. Pass next_cursor as cursor for the next page.
+    """
+    try:
+        items, next_cursor = await AsyncItemService(db).search_items(
+            q, owner_id=current_user["id"], limit=limit, cursor=cursor
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except SearchUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/export", dependencies=[Depends(query_budget(1))])
+async def export_items(
+    format: str = Query("ndjson", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    fields: Optional[str] = Query(None, pattern=ITEM_FIELDS_PATTERN),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Export all items of the current user as NDJSON or CSV.
+    This endpoint requires authentication.
+    Rows are streamed from a database cursor as the client reads them, so
+    exports of any size use constant memory. fields= limits the exported
+    columns as for the item list.
+    """
+    body = await AsyncItemService(db).export_items(
+        current_user["id"], format=format, fields=item_fields(fields) or EXPORT_COLUMNS
+    )
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="items.{format}"',
+            # Let reverse proxies pass chunks through instead of buffering the export
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+@router.post("/import", response_model=ItemImportResult, dependencies=[Depends(query_budget(None))])
+async def import_items(
+    request: Request,
+    format: str = Query("ndjson", pattern=f"^({'|'.join(RECORD_FORMATS)})$"),
+    atomic: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Import items from an NDJSON or CSV request body.
+    This endpoint requires authentication.
+    The body is parsed as it is received and inserted in batches; each batch
+    is committed on its own unless atomic=true, in which case any error
+    rolls back the whole import. The response lists every batch and the
+    rejected rows.
+    """
+    records = iter_records(request.stream(), format, settings.IMPORT_MAX_LINE_BYTES)
+    return await AsyncItemService(db).import_items(records, owner_id=current_user["id"], atomic=atomic)
+
+@router.post(
+    "/bulk",
+    response_model=List[ItemResponse],
+    dependencies=[Depends(query_budget(BULK_CHUNKS + 2, repeat_threshold=BULK_CHUNKS + 1))],
+)
+async def create_items(
+    items: List[ItemCreate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Create many items in one transaction.
+    This endpoint requires authentication.
+    The created items are returned in request order.
+    """
+    check_bulk_size(items)
+    return await AsyncItemService(db).bulk_create_items(items, owner_id=current_user["id"])
+
+@router.patch(
+    "/bulk",
+    response_model=List[ItemBulkResult],
+    # Up to three UPDATE shapes plus the read-back per chunk
+    dependencies=[Depends(query_budget(4 * BULK_CHUNKS + 2, repeat_threshold=BULK_CHUNKS + 1))],
+)
+async def update_items(
+    items: List[ItemBulkUpdate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Update many items in one transaction.
+    This endpoint requires authentication; items of other users are
+    reported as not_found and left unchanged.
+    """
+    check_bulk_size(items)
+    results = await AsyncItemService(db).bulk_update_items(items, owner_id=current_user["id"])
+    return [
+        {"id": item_id, "status": "updated" if item else "not_found", "item": item}
+        for item_id, item in results
+    ]
+
+@router.delete(
+    "/bulk",
+    response_model=List[ItemBulkResult],
+    dependencies=[Depends(query_budget(BULK_CHUNKS + 2, repeat_threshold=BULK_CHUNKS + 1))],
+)
+async def delete_items(
+    request: ItemBulkDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Delete many items in one transaction.
+    This endpoint requires authentication; items of other users are
+    reported as not_found and left in place.
+    """
+    check_bulk_size(request.ids)
+    results = await AsyncItemService(db).bulk_delete_items(request.ids, owner_id=current_user["id"])
+    return [
+        {"id": item_id, "status": "deleted" if deleted else "not_found"}
+        for item_id, deleted in results
+    ]
+
+@router.get("/{item_id}", response_model=ItemResponse, dependencies=[Depends(query_budget(3))])
 async def read_item(
     item_id: int,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, pattern=ITEM_FIELDS_PATTERN),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ) -> Any:
     """
     Get a specific item by ID.
     This endpoint requires authentication and ownership of the item.
+    Items are cached per user until their next write. The strong ETag can be
+    sent in If-None-Match for a 304, or in If-Match to update or delete the
+    item only if nobody changed it since. fields= works as for the list.
     """
-    # Only return the item if it belongs to the current user
-    item = db.query(Item)\
-        .filter(Item.id == item_id, Item.owner_id == current_user["id"])\
-        .first()
-    
-    if item is None:
-        raise HTTPException(status_code=404, detail="Item not found")
-    
-    return item
-
-@router.put("/{item_id}", response_model=ItemResponse)
+    selected = item_fields(fields)
+    service = AsyncItemService(db)
+    cached, cache_key, _ = await cached_read(service, current_user["id"], ("item", item_id, selected))
+    if cached is None:
+        if if_none_match is not None:
+            # Compare versions before loading the row
+            version = await service.get_item_version(item_id, owner_id=current_user["id"])
+            if version is not None:
+                etag = item_etag(item_id, version, selected)
+                if not_modified(if_none_match, etag):
+                    return not_modified_response(etag)
+        # Only return the item if it belongs to the current user
+        item = await service.get_item(item_id, owner_id=current_user["id"], fields=selected)
+
+        if item is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+
+        schema = ItemResponse if selected is None else partial_item_schema(selected)
+        cached = item_etag(item.id, item.version, selected), encode_response(schema, item)
+        if cache_key is not None:
+            item_cache.store(cache_key, cached)
+    etag, body = cached
+    if not_modified(if_none_match, etag):
+        return not_modified_response(etag)
+    return json_response(body, etag)
+
+@router.put("/{item_id}", response_model=ItemResponse, dependencies=[Depends(query_budget(2))])
 async def update_item(
     item_id: int,
     item: ItemUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ) -> Any:
     """
     Update an item.
     This endpoint requires authentication and ownership of the item.
+    With If-Match the item is only updated if its ETag still matches;
+    otherwise the response is 412.
     """
-    # Only update the item if it belongs to the current user
-    db_item = db.query(Item)\
-        .filter(Item.id == item_id, Item.owner_id == current_user["id"])\
-        .first()
-    
+    # Only update the item if it belongs to the current user; fields left
+    # out or sent as null are not changed
+    service = AsyncItemService(db)
+    versions = if_match_versions(if_match, item_id)
+    db_item = await service.update_item(
+        item_id, item, owner_id=current_user["id"], versions=versions
+    )
+
     if db_item is None:
-        raise HTTPException(status_code=404, detail="Item not found")
-    
-    # Update only provided fields
-    if item.title is not None:
-        db_item.title = item.title
-    if item.description is not None:
-        db_item.description = item.description
-    
-    db.commit()
-    db.refresh(db_item)
+        await check_precondition(service, item_id, current_user["id"], versions)
+
+    response.headers["ETag"] = item_etag(db_item.id, db_item.version)
     return db_item
 
-@router.delete("/{item_id}")
+@router.delete("/{item_id}", dependencies=[Depends(query_budget(2))])
 async def delete_item(
     item_id: int,
-    db: Session = Depends(get_db),
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ) -> Any:
     """
     Delete an item.
     This endpoint requires authentication and ownership of the item.
+    With If-Match the item is only deleted if its ETag still matches;
+    otherwise the response is 412.
     """
     # Only delete the item if it belongs to the current user
-    db_item = db.query(Item)\
-        .filter(Item.id == item_id, Item.owner_id == current_user["id"])\
-        .first()
-    
-    if db_item is None:
-        raise HTTPException(status_code=404, detail="Item not found")
-    
-    db.delete(db_item)
-    db.commit()
+    service = AsyncItemService(db)
+    versions = if_match_versions(if_match, item_id)
+    deleted = await service.delete_item(item_id, owner_id=current_user["id"], versions=versions)
+
+    if not deleted:
+        await check_precondition(service, item_id, current_user["id"], versions)
+
     return {"detail": "Item deleted successfully"}
@@ -1,85 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from src.backend.api.deps import get_current_active_superuser, get_current_user, get_db
+from src.backend.core.pagination import InvalidCursor
 from src.backend.models.primary.user import User
 from src.backend.repositories.user_repository import UserRepository
-from src.backend.services.user_service import UserService
+from src.backend.services.user_service import Principal, UserService, invalidate_principal
 from src.backend.api.v1.schemas.user import User as UserSchema
-from src.backend.api.v1.schemas.user import UserCreate, UserUpdate
+from src.backend.api.v1.schemas.user import UserCreate, UserPage, UserUpdate
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[UserSchema])
+@router.get("/", response_model=UserPage)
 def read_users(
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
-    current_user: User = Depends(get_current_active_superuser),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
-    Retrieve users.
+    Retrieve users, one page at a time in (created_at, id) order.
+    Pass the returned next_cursor as cursor to get the following page; it is
+    null on the last page.
     """
-    user_repo = UserRepository()
-    return user_repo.get_multi(db, skip=skip, limit=limit)
+    try:
+        users, next_cursor = UserService(db).get_users_page(limit=limit, cursor=cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": users, "next_cursor": next_cursor}
 
 
 @router.post("/", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     db: Session = Depends(get_db),
     user_in: UserCreate = Depends(UserCreate),
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> UserSchema:
     """
     Create new user.
+    The password is hashed in the hashing process pool, and the
+    synchronous session is used from a thread, so the event loop never
+    blocks.
     """
-    user_repo = UserRepository()
-    user_service = UserService(user_repo)
-    user = user_service.get_by_email(email=user_in.email)
+    user_service = UserService(db)
+    user = await asyncio.to_thread(user_service.get_by_email, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
-    return user_service.create_user(db, user_in)
+    return await user_service.create_async(user_in)
 
 
 @router.get("/me", response_model=UserSchema)
 def read_user_me(
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ) -> UserSchema:
     """
     Get current user.
     """
-    return current_user
+    # The principal only carries what authorization needs, not the profile
+    user = UserService(db).get(current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 
 @router.put("/me", response_model=UserSchema)
-def update_user_me(
+async def update_user_me(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     user_in: UserUpdate = Depends(UserUpdate),
 ) -> UserSchema:
     """
     Update own user.
+    A new password is hashed in the hashing process pool.
     """
-    user_repo = UserRepository()
-    user_service = UserService(user_repo)
-    return user_service.update_user(db, current_user, user_in)
+    user_service = UserService(db)
+    user = await asyncio.to_thread(user_service.get, current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return await user_service.update_async(user, user_in)
 
 
 @router.get("/{user_id}", response_model=UserSchema)
 def read_user_by_id(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> UserSchema:
     """
     Get a specific user by id.
     """
-    user_repo = UserRepository()
-    user = user_repo.get(db, id=user_id)
+    user = UserService(db).get(user_id)
     if not user:
         raise HTTPException(
             status_code=404,
@@ -89,38 +107,42 @@ def read_user_by_id(
 
 
 @router.put("/{user_id}", response_model=UserSchema)
-def update_user(
-    db: Session = Depends(get_db),
+async def update_user(
     user_id: int,
+    db: Session = Depends(get_db),
     user_in: UserUpdate = Depends(UserUpdate),
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> UserSchema:
     """
     Update a user.
+    A new password is hashed in the hashing process pool.
     """
-    user_repo = UserRepository()
-    user_service = UserService(user_repo)
-    user = user_repo.get(db, id=user_id)
+    user_service = UserService(db)
+    user = await asyncio.to_thread(user_service.get, user_id)
     if not user:
         raise HTTPException(
             status_code=404,
             detail="The user with this id does not exist in the system",
         )
-    return user_service.update_user(db, user, user_in)
+    return await user_service.update_async(user, user_in)
 
 
 @router.delete("/{user_id}", response_model=UserSchema)
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> UserSchema:
     """
     Delete a user.
     """
-    user_repo = UserRepository()
-    user = user_repo.get(db, id=user_id)
+    user_repo = UserRepository(User, db)
+    user = user_repo.get(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    user_repo.delete(db, id=user_id)
-    return user
+    # Serialize first, the row is expired once the delete is committed
+    deleted = UserSchema.model_validate(user)
+    user_repo.remove(id=user_id)
+    # Tokens of a deleted user must stop working now, not when the cache expires
+    invalidate_principal(user_id)
+    return deleted
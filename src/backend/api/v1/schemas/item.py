@@ -1,8 +1,10 @@
 """
 Item schemas for the example CRUD operations.
 """
-from pydantic import BaseModel
-from typing import Optional
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from typing import List, Optional, Tuple, Type
+from typing_extensions import TypedDict
 from datetime import datetime
 
 class ItemBase(BaseModel):
@@ -24,7 +26,99 @@ class ItemResponse(ItemBase):
     owner_id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
-    
-    class Config:
-        """Configure Pydantic to work with SQLAlchemy models"""
-        orm_mode = True
+
+    # Read attributes of SQLAlchemy models and rows
+    model_config = ConfigDict(from_attributes=True)
+
+class ItemPage(BaseModel):
+    """One page of items; pass next_cursor back to get the following page"""
+    items: List[ItemResponse]
+    next_cursor: Optional[str] = None
+
+class ItemBulkUpdate(ItemUpdate):
+    """One entry of a bulk update; fields left out or null are not changed"""
+    id: int
+
+class ItemBulkDelete(BaseModel):
+    """Ids of the items to delete in one bulk request"""
+    ids: List[int]
+
+class ItemBulkResult(BaseModel):
+    """Outcome for one entry of a bulk update or delete, in request order"""
+    id: int
+    status: str  # updated, deleted or not_found
+    item: Optional[ItemResponse] = None
+
+class ItemImportError(BaseModel):
+    """A rejected row of an import; rows are numbered from 1, headers excluded"""
+    row: int
+    error: str
+
+class ItemImportBatch(BaseModel):
+    """Progress of one batch of an import"""
+    batch: int
+    first_row: int
+    last_row: int
+    imported: int
+    status: str  # committed, failed or rolled_back
+
+class ItemImportResult(BaseModel):
+    """Summary of an import"""
+    atomic: bool
+    rows: int
+    imported: int
+    failed: int
+    batches: List[ItemImportBatch]
+    errors: List[ItemImportError]  # At most IMPORT_MAX_ERRORS entries
+
+class ItemSearchResult(BaseModel):
+    """One search hit; lower rank is a better match"""
+    item: ItemResponse
+    rank: float
+    snippet: str  # HTML-escaped text with matches wrapped in <mark>
+
+class ItemSearchPage(BaseModel):
+    """One page of search hits, best first"""
+    items: List[ItemSearchResult]
+    next_cursor: Optional[str] = None
+
+# Fields a client can pick with fields=, in response order
+ITEM_FIELDS = ("id", "title", "description", "owner_id", "created_at", "updated_at")
+ITEM_FIELDS_PATTERN = "^({0})(,({0}))*$".format("|".join(ITEM_FIELDS))
+
+def item_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated fields= parameter.
+
+    Returns:
+        Optional[Tuple[str, ...]]: The fields in ITEM_FIELDS order with id
+        always included, or None for every field
+    """
+    if fields is None:
+        return None
+    selected = set(fields.split(",")) | {"id"}
+    if len(selected) == len(ITEM_FIELDS):
+        return None
+    return tuple(name for name in ITEM_FIELDS if name in selected)
+
+@lru_cache(maxsize=None)
+def partial_item_schema(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """ItemResponse restricted to ``fields``, built once per combination"""
+    return create_model(
+        "ItemResponse_" + "_".join(fields),
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (ItemResponse.model_fields[name].annotation, ItemResponse.model_fields[name]) for name in fields},
+    )
+
+@lru_cache(maxsize=None)
+def item_page_serializer(fields: Tuple[str, ...] = ITEM_FIELDS) -> TypeAdapter:
+    """
+    JSON serializer for an ItemPage whose items are dicts of ``fields``.
+
+    Nothing is validated: the values come from typed database columns, so
+    they are dumped as they are. Built once per combination of fields.
+    """
+    name = "_".join(fields)
+    row = TypedDict(f"ItemRow_{name}", {field: ItemResponse.model_fields[field].annotation for field in fields})
+    page = TypedDict(f"ItemRowPage_{name}", {"items": List[row], "next_cursor": Optional[str]})
+    return TypeAdapter(page)
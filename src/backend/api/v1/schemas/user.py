@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 # Shared properties
@@ -24,8 +24,7 @@ class UserUpdate(UserBase):
 class UserInDBBase(UserBase):
     id: Optional[int] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Additional properties to return via API
@@ -33,6 +32,12 @@ class User(UserInDBBase):
     pass
 
 
+# One page of users; pass next_cursor back to get the following page
+class UserPage(BaseModel):
+    items: List[User]
+    next_cursor: Optional[str] = None
+
+
 # Additional properties stored in DB
 class UserInDB(UserInDBBase):
     hashed_password: str
@@ -1,38 +1,747 @@
-from typing import List, Optional
+import csv
+import html
+import io
+import json
+import re
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+from pydantic import ValidationError
+from sqlalchemy import bindparam, column, delete, func, insert, literal_column, select, table, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import Session
-from src.backend.models.item import Item
-from src.backend.api.v1.schemas.item import ItemCreate, ItemUpdate, ItemResponse
+from src.backend.models.item import ITEMS_FTS_DEFER, ITEMS_FTS_INDEX_AFTER, Item, ItemCacheGeneration
+from src.backend.api.v1.schemas.item import ITEM_FIELDS, ItemBulkUpdate, ItemCreate, ItemUpdate, ItemResponse
+from src.backend.core.cache import GenerationalCache, TTLCache
+from src.backend.core.config import get_settings
+from src.backend.core.pagination import encode_cursor, keyset_page, page_results
+from src.backend.core.streaming import LineTooLong, Record, RecordError
+from src.backend.db.replicas import reads_from_replica
+
+settings = get_settings()
+
+def _cached_size(value: Any) -> int:
+    """Bytes of a cached (etag, body) response; generation tokens are plain strings"""
+    return len(value) if isinstance(value, str) else sum(len(part) for part in value)
+
+# (ETag, encoded body) of item responses per owner, see routers/items.py.
+# Entries live in each worker, keyed by the owner's row in
+# item_cache_generations, which every write below bumps in its transaction.
+item_cache = GenerationalCache(
+    TTLCache(maxsize=settings.ITEMS_CACHE_SIZE, ttl=settings.ITEMS_CACHE_TTL, sizeof=_cached_size),
+    name="items",
+)
+
+# Upsert understood by both SQLite (3.24+) and PostgreSQL
+BUMP_CACHE_GENERATION = text(
+    "INSERT INTO item_cache_generations (owner_id, generation) VALUES (:owner_id, 1) "
+    "ON CONFLICT (owner_id) DO UPDATE SET generation = item_cache_generations.generation + 1"
+)
+
+def _cache_generation(owner_id: str):
+    """The owner's item_cache_generations counter, no row before their first write"""
+    return select(ItemCacheGeneration.generation).where(ItemCacheGeneration.owner_id == owner_id)
+
+def _owned_by(statement, owner_id: Optional[str]):
+    """Restrict a statement to one owner's items when an owner is given"""
+    if owner_id is not None:
+        statement = statement.where(Item.owner_id == owner_id)
+    return statement
+
+def _at_versions(statement, versions: Optional[Sequence[int]]):
+    """Restrict a statement to the item versions an If-Match header allows"""
+    if versions is not None:
+        statement = statement.where(Item.version.in_(versions))
+    return statement
+
+def _item_version(item_id: int, owner_id: Optional[str]):
+    """The version of one item, for its ETag, without loading the row"""
+    return _owned_by(select(Item.version).where(Item.id == item_id), owner_id)
+
+def _item_keys(owner_id: Optional[str]):
+    """Keyset ordering (owner_id, id); within one owner the id alone is the key"""
+    return (Item.id,) if owner_id is not None else (Item.owner_id, Item.id)
+
+def _select_items(fields: Optional[Sequence[str]], extra: Sequence[str] = ("id", "version")):
+    """
+    SELECT of whole ORM items, or with ``fields`` only those columns as
+    plain rows, plus the ``extra`` columns needed for cursors and ETags.
+    """
+    if fields is None:
+        return select(Item)
+    names = list(dict.fromkeys([*fields, *extra]))
+    return select(*(Item.__table__.c[name] for name in names))
+
+def _fetch(result: Any, fields: Optional[Sequence[str]]) -> Any:
+    """ORM items of a _select_items result, or its rows for a projection"""
+    return result.scalars() if fields is None else result
+
+def _items_page(
+    owner_id: Optional[str], limit: int, cursor: Optional[str], skip: int, fields: Optional[Sequence[str]] = None
+):
+    """Statement for one page of items, served by the (owner_id, id) index"""
+    keys = _item_keys(owner_id)
+    statement = _select_items(fields, extra=[key.key for key in keys])
+    statement = keyset_page(_owned_by(statement, owner_id), keys, limit, cursor)
+    if cursor is None and skip:
+        # Deprecated offset paging, kept for clients not sending cursors yet
+        statement = statement.offset(skip)
+    return statement
+
+def _insert_item(item: ItemCreate, owner_id: Optional[str]):
+    """INSERT ... RETURNING: the new row, server defaults included, in one round trip"""
+    values = item.model_dump()
+    if owner_id is not None:
+        values["owner_id"] = owner_id
+    return insert(Item).values(**values).returning(Item)
+
+def _update_item(
+    item_id: int, values: Dict[str, Any], owner_id: Optional[str], versions: Optional[Sequence[int]] = None
+):
+    """
+    UPDATE ... WHERE id = :id AND owner_id = :uid RETURNING the updated row.
+
+    Matches no row, and returns nothing, when the item does not exist,
+    belongs to someone else or is not at one of ``versions``.
+    """
+    statement = _at_versions(_owned_by(update(Item).where(Item.id == item_id), owner_id), versions)
+    return (
+        statement.values(**values, version=Item.version + 1)
+        .returning(Item)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+
+def _delete_item(item_id: int, owner_id: Optional[str], versions: Optional[Sequence[int]] = None):
+    """DELETE ... WHERE id = :id AND owner_id = :uid RETURNING owner_id, for cache invalidation"""
+    statement = _at_versions(_owned_by(delete(Item).where(Item.id == item_id), owner_id), versions)
+    return statement.returning(Item.owner_id).execution_options(synchronize_session=False)
+
+ITEMS_FTS = table("items_fts", column("rowid"))
+# Matches are marked with control characters in SQL, then the snippet is
+# HTML-escaped and the markers become <mark> tags
+_MATCH_START, _MATCH_END = "\x02", "\x03"
+
+class SearchUnavailable(Exception):
+    """Raised when the database has no FTS5 index to search"""
+
+def _match_query(q: str) -> Optional[str]:
+    """
+    Turn user input into an FTS5 query matching all its words.
+
+    Every word is quoted, so FTS5 operators and syntax in the input are
+    searched for literally instead of raising a syntax error.
+    """
+    words = re.findall(r"\w+", q)
+    return " ".join(f'"{word}"' for word in words) or None
+
+def _search_keys():
+    fts = literal_column("items_fts")
+    # bm25 is lower for better matches; title hits weigh five times description hits
+    return (func.bm25(fts, literal_column("5.0"), literal_column("1.0")), Item.id)
+
+def _items_search(owner_id: str, match: str, limit: int, cursor: Optional[str]):
+    """One page of bm25-ranked matches, keyset-paginated on (rank, id)"""
+    fts = literal_column("items_fts")
+    keys = _search_keys()
+    snippet = func.snippet(fts, -1, _MATCH_START, _MATCH_END, "…", 16)
+    statement = (
+        select(Item, keys[0].label("rank"), snippet.label("snippet"))
+        .select_from(ITEMS_FTS)
+        .join(Item, Item.id == ITEMS_FTS.c.rowid)
+        .where(fts.op("MATCH")(match), Item.owner_id == owner_id)
+    )
+    return keyset_page(statement, keys, limit, cursor)
+
+def _search_results(rows: Sequence[Any], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    rows = list(rows)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].rank, rows[-1].Item.id])
+    results = [
+        {
+            "item": row.Item,
+            "rank": row.rank,
+            "snippet": html.escape(row.snippet or "")
+            .replace(_MATCH_START, "<mark>")
+            .replace(_MATCH_END, "</mark>"),
+        }
+        for row in rows
+    ]
+    return results, next_cursor
+
+def _check_search(bind) -> None:
+    if bind.dialect.name != "sqlite":
+        raise SearchUnavailable("Full-text search requires SQLite FTS5")
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_COLUMNS = ITEM_FIELDS
+
+def _export_rows(owner_id: str, fields: Sequence[str] = EXPORT_COLUMNS):
+    """Plain column rows, no ORM objects, streamed in id order"""
+    columns = [Item.__table__.c[name] for name in fields]
+    return (
+        select(*columns)
+        .where(Item.owner_id == owner_id)
+        .order_by(Item.id)
+        .execution_options(stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _encode_ndjson(rows: Sequence[Any], fields: Sequence[str]) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(fields, map(_export_value, row))), separators=(",", ":")) + "\n"
+        for row in rows
+    ).encode()
+
+def _encode_csv(rows: Sequence[Any], fields: Sequence[str], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(fields)
+    writer.writerows([_export_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+async def _encode_export(result: AsyncResult, format: str, fields: Sequence[str]) -> AsyncIterator[bytes]:
+    """
+    Encode a streamed result batch by batch.
+
+    The next batch is only fetched once the previous chunk has been sent, so
+    a slow client holds back the cursor instead of filling memory.
+    """
+    if format == "csv":
+        yield _encode_csv([], fields, header=True)
+    async for rows in result.partitions():
+        yield _encode_csv(rows, fields) if format == "csv" else _encode_ndjson(rows, fields)
+
+def _import_values(record: Record, owner_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Validate one uploaded record against ItemCreate; empty values count as missing"""
+    if isinstance(record, RecordError):
+        return None, str(record)
+    try:
+        item = ItemCreate(**{key: value for key, value in record.items() if value != ""})
+    except ValidationError as e:
+        return None, "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        )
+    # model_dump rather than dict(): the deprecated alias warns on every row
+    return {**item.model_dump(), "owner_id": owner_id}, None
+
+def _chunks(values: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """Split a bulk request into statements of at most BULK_CHUNK_SIZE rows"""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def _bulk_insert():
+    """
+    INSERT ... RETURNING sent as one multi-row statement per chunk.
+
+    sort_by_parameter_order makes SQLAlchemy return the rows in the order of
+    the parameters, correlating them through the autoincrement id, so the
+    statement stays batched.
+    """
+    return insert(Item).returning(Item, sort_by_parameter_order=True)
+
+def _bulk_insert_rows(items: Sequence[ItemCreate], owner_id: str) -> List[Dict[str, Any]]:
+    return [{**item.model_dump(), "owner_id": owner_id} for item in items]
+
+def _bulk_updates(items: Sequence[ItemBulkUpdate], owner_id: str) -> List[Tuple[Any, List[Dict[str, Any]]]]:
+    """
+    Batched UPDATE statements for a chunk of a bulk update.
+
+    Entries changing the same fields share one executemany statement. The
+    owner is part of the WHERE clause, so ids owned by someone else match
+    no row.
+
+    Returns:
+        List of (statement, parameter sets) pairs
+    """
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for item in items:
+        # Fields sent as null are left untouched, like omitted fields
+        values = item.model_dump(exclude_unset=True, exclude_none=True, exclude={"id"})
+        if values:
+            groups.setdefault(tuple(sorted(values)), []).append({"item_id": item.id, **values})
+    table = Item.__table__
+    return [
+        (
+            update(table)
+            .where(table.c.id == bindparam("item_id"), table.c.owner_id == owner_id)
+            .values({**{key: bindparam(key) for key in keys}, "version": table.c.version + 1}),
+            parameters,
+        )
+        for keys, parameters in groups.items()
+    ]
+
+def _owned_items(ids: Sequence[int], owner_id: str):
+    """Set-based ownership check: owner_id = :uid AND id IN (...)"""
+    return (
+        select(Item)
+        .where(Item.owner_id == owner_id, Item.id.in_(ids))
+        .execution_options(populate_existing=True)
+    )
+
+def _bulk_delete(ids: Sequence[int], owner_id: str):
+    return delete(Item).where(Item.owner_id == owner_id, Item.id.in_(ids)).returning(Item.id)
 
 class ItemService:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_items(self, skip: int = 0, limit: int = 100) -> List[Item]:
-        return self.db.query(Item).offset(skip).limit(limit).all()
+    def get_items(self, skip: int = 0, limit: int = 100, owner_id: Optional[str] = None) -> List[Item]:
+        query = self.db.query(Item)
+        if owner_id is not None:
+            query = query.filter(Item.owner_id == owner_id)
+        return query.offset(skip).limit(limit).all()
+
+    def get_items_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        owner_id: Optional[str] = None,
+        skip: int = 0,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Item], Optional[str]]:
+        """
+        Get one page of items in (owner_id, id) order.
+
+        Args:
+            limit: Page size
+            cursor: next_cursor of the previous page
+            owner_id: Only return this owner's items
+            skip: Deprecated offset, ignored when a cursor is given
+            fields: Only select these columns, returning rows instead of Items
+
+        Returns:
+            Tuple[List[Item], Optional[str]]: Items and the next page's cursor
+
+        Raises:
+            InvalidCursor: If the cursor cannot be decoded
+        """
+        rows = _fetch(self.db.execute(_items_page(owner_id, limit, cursor, skip, fields)), fields).all()
+        return page_results(rows, _item_keys(owner_id), limit)
+
+    def search_items(
+        self, q: str, owner_id: str, limit: int = 20, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Full-text search over an owner's item titles and descriptions.
+
+        Args:
+            q: Words to search for; all of them must match
+            owner_id: Only search this owner's items
+            limit: Page size
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: Hits matching
+            ItemSearchResult, best first, and the next page's cursor
+
+        Raises:
+            InvalidCursor: If the cursor cannot be decoded
+            SearchUnavailable: If the database is not SQLite
+        """
+        _check_search(self.db.get_bind())
+        match = _match_query(q)
+        if match is None:
+            return [], None
+        return _search_results(self.db.execute(_items_search(owner_id, match, limit, cursor)).all(), limit)
+
+    def get_item(
+        self, item_id: int, owner_id: Optional[str] = None, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Item]:
+        if fields is not None:
+            # Projection: a row of the selected columns plus id and version
+            statement = _owned_by(_select_items(fields).where(Item.id == item_id), owner_id)
+            return self.db.execute(statement).first()
+        query = self.db.query(Item).filter(Item.id == item_id)
+        if owner_id is not None:
+            query = query.filter(Item.owner_id == owner_id)
+        return query.first()
+
+    def get_item_version(self, item_id: int, owner_id: Optional[str] = None) -> Optional[int]:
+        """Version of an item for its ETag, None if not found"""
+        return self.db.scalar(_item_version(item_id, owner_id))
 
-    def get_item(self, item_id: int) -> Optional[Item]:
-        return self.db.query(Item).filter(Item.id == item_id).first()
+    def get_cache_generation(self, owner_id: str) -> Optional[int]:
+        """
+        Generation to look the owner's reads up under in item_cache.
 
-    def create_item(self, item: ItemCreate) -> Item:
-        db_item = Item(**item.dict())
-        self.db.add(db_item)
+        Returns:
+            Optional[int]: 0 before the owner's first write, None when this
+            session reads from lagging replicas, whose results are not cached
+        """
+        if reads_from_replica(self.db):
+            return None
+        return self.db.scalar(_cache_generation(owner_id)) or 0
+
+    def _invalidate(self, owner_id: Optional[str]) -> None:
+        """Bump the owner's cache generation, committed with their write"""
+        if owner_id is not None:
+            self.db.execute(BUMP_CACHE_GENERATION, {"owner_id": owner_id})
+
+    def create_item(self, item: ItemCreate, owner_id: Optional[str] = None) -> Item:
+        db_item = self.db.scalars(_insert_item(item, owner_id)).one()
+        self._invalidate(db_item.owner_id)
         self.db.commit()
-        self.db.refresh(db_item)
         return db_item
 
-    def update_item(self, item_id: int, item: ItemUpdate) -> Optional[Item]:
-        db_item = self.db.query(Item).filter(Item.id == item_id).first()
-        if db_item:
-            for key, value in item.dict(exclude_unset=True).items():
-                setattr(db_item, key, value)
-            self.db.commit()
-            self.db.refresh(db_item)
+    def update_item(
+        self,
+        item_id: int,
+        item: ItemUpdate,
+        owner_id: Optional[str] = None,
+        versions: Optional[Sequence[int]] = None,
+    ) -> Optional[Item]:
+        """
+        Update an item in one UPDATE ... RETURNING statement.
+
+        Args:
+            item_id: Item to update
+            item: Fields to change; fields left out or sent as null are not changed
+            owner_id: Only update the item if this owner has it
+            versions: Only update the item at one of these versions (If-Match)
+
+        Returns:
+            Optional[Item]: The updated item, None if no item matched
+        """
+        # Fields sent as null are left untouched, like omitted fields
+        values = item.model_dump(exclude_unset=True, exclude_none=True)
+        if not values:
+            db_item = self.get_item(item_id, owner_id=owner_id)
+            return db_item if db_item is not None and (versions is None or db_item.version in versions) else None
+        db_item = self.db.scalars(_update_item(item_id, values, owner_id, versions)).first()
+        if db_item is not None:
+            self._invalidate(db_item.owner_id)
+        self.db.commit()
         return db_item
 
-    def delete_item(self, item_id: int) -> bool:
-        db_item = self.db.query(Item).filter(Item.id == item_id).first()
-        if db_item:
-            self.db.delete(db_item)
-            self.db.commit()
+    def delete_item(
+        self, item_id: int, owner_id: Optional[str] = None, versions: Optional[Sequence[int]] = None
+    ) -> bool:
+        # The deleted row's owner_id, None if nothing matched
+        deleted = self.db.scalars(_delete_item(item_id, owner_id, versions)).first()
+        self._invalidate(deleted)
+        self.db.commit()
+        return deleted is not None
+
+    def bulk_create_items(self, items: Sequence[ItemCreate], owner_id: str) -> List[Item]:
+        """
+        Create many items in one transaction.
+
+        Each chunk of BULK_CHUNK_SIZE items is a single INSERT ... RETURNING
+        executemany, so no per-item flush or refresh is needed.
+
+        Args:
+            items: Items to create
+            owner_id: Owner of every new item
+
+        Returns:
+            List[Item]: Created items, in request order
+        """
+        created: List[Item] = []
+        for chunk in _chunks(items, settings.BULK_CHUNK_SIZE):
+            rows = self.db.scalars(_bulk_insert(), _bulk_insert_rows(chunk, owner_id)).all()
+            created.extend(rows)
+        self._invalidate(owner_id)
+        self.db.commit()
+        return created
+
+    def bulk_update_items(
+        self, items: Sequence[ItemBulkUpdate], owner_id: str
+    ) -> List[Tuple[int, Optional[Item]]]:
+        """
+        Update many items in one transaction.
+
+        Args:
+            items: Changes, each carrying the id of the item to update
+            owner_id: Only this owner's items are changed
+
+        Returns:
+            List[Tuple[int, Optional[Item]]]: For each entry in request order,
+            its id and the updated item, or None if it was not found
+        """
+        found: Dict[int, Item] = {}
+        for chunk in _chunks(items, settings.BULK_CHUNK_SIZE):
+            for statement, parameters in _bulk_updates(chunk, owner_id):
+                self.db.execute(statement, parameters)
+            ids = [item.id for item in chunk]
+            found.update((item.id, item) for item in self.db.scalars(_owned_items(ids, owner_id)))
+        self._invalidate(owner_id)
+        self.db.commit()
+        return [(item.id, found.get(item.id)) for item in items]
+
+    def bulk_delete_items(self, ids: Sequence[int], owner_id: str) -> List[Tuple[int, bool]]:
+        """
+        Delete many items in one transaction.
+
+        Args:
+            ids: Ids of the items to delete
+            owner_id: Only this owner's items are deleted
+
+        Returns:
+            List[Tuple[int, bool]]: Each id in request order and whether it
+            was deleted
+        """
+        deleted = set()
+        for chunk in _chunks(ids, settings.BULK_CHUNK_SIZE):
+            deleted.update(self.db.scalars(_bulk_delete(chunk, owner_id)).all())
+        self._invalidate(owner_id)
+        self.db.commit()
+        return [(item_id, item_id in deleted) for item_id in ids]
+
+class AsyncItemService:
+    """ItemService counterpart for AsyncSession; every query is awaited"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_items(self, skip: int = 0, limit: int = 100, owner_id: Optional[str] = None) -> List[Item]:
+        statement = _owned_by(select(Item), owner_id).offset(skip).limit(limit)
+        result = await self.db.execute(statement)
+        return list(result.scalars().all())
+
+    async def get_items_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        owner_id: Optional[str] = None,
+        skip: int = 0,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Item], Optional[str]]:
+        """Async counterpart of ItemService.get_items_page"""
+        result = await self.db.execute(_items_page(owner_id, limit, cursor, skip, fields))
+        return page_results(_fetch(result, fields).all(), _item_keys(owner_id), limit)
+
+    async def search_items(
+        self, q: str, owner_id: str, limit: int = 20, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Async counterpart of ItemService.search_items"""
+        _check_search(self.db.get_bind())
+        match = _match_query(q)
+        if match is None:
+            return [], None
+        result = await self.db.execute(_items_search(owner_id, match, limit, cursor))
+        return _search_results(result.all(), limit)
+
+    async def get_item(
+        self, item_id: int, owner_id: Optional[str] = None, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Item]:
+        """Async counterpart of ItemService.get_item"""
+        statement = _owned_by(_select_items(fields).where(Item.id == item_id), owner_id)
+        result = await self.db.execute(statement)
+        return _fetch(result, fields).first()
+
+    async def get_item_version(self, item_id: int, owner_id: Optional[str] = None) -> Optional[int]:
+        """Async counterpart of ItemService.get_item_version"""
+        return await self.db.scalar(_item_version(item_id, owner_id))
+
+    async def get_cache_generation(self, owner_id: str) -> Optional[int]:
+        """Async counterpart of ItemService.get_cache_generation"""
+        if reads_from_replica(self.db):
+            return None
+        return await self.db.scalar(_cache_generation(owner_id)) or 0
+
+    async def _invalidate(self, owner_id: Optional[str]) -> None:
+        """Async counterpart of ItemService._invalidate"""
+        if owner_id is not None:
+            await self.db.execute(BUMP_CACHE_GENERATION, {"owner_id": owner_id})
+
+    async def create_item(self, item: ItemCreate, owner_id: Optional[str] = None) -> Item:
+        result = await self.db.scalars(_insert_item(item, owner_id))
+        db_item = result.one()
+        await self._invalidate(db_item.owner_id)
+        await self.db.commit()
+        return db_item
+
+    async def update_item(
+        self,
+        item_id: int,
+        item: ItemUpdate,
+        owner_id: Optional[str] = None,
+        versions: Optional[Sequence[int]] = None,
+    ) -> Optional[Item]:
+        """Async counterpart of ItemService.update_item"""
+        # Fields sent as null are left untouched, like omitted fields
+        values = item.model_dump(exclude_unset=True, exclude_none=True)
+        if not values:
+            db_item = await self.get_item(item_id, owner_id=owner_id)
+            return db_item if db_item is not None and (versions is None or db_item.version in versions) else None
+        result = await self.db.scalars(_update_item(item_id, values, owner_id, versions))
+        db_item = result.first()
+        if db_item is not None:
+            await self._invalidate(db_item.owner_id)
+        await self.db.commit()
+        return db_item
+
+    async def delete_item(
+        self, item_id: int, owner_id: Optional[str] = None, versions: Optional[Sequence[int]] = None
+    ) -> bool:
+        """Async counterpart of ItemService.delete_item"""
+        result = await self.db.scalars(_delete_item(item_id, owner_id, versions))
+        deleted = result.first()
+        await self._invalidate(deleted)
+        await self.db.commit()
+        return deleted is not None
+
+    async def bulk_create_items(self, items: Sequence[ItemCreate], owner_id: str) -> List[Item]:
+        """Async counterpart of ItemService.bulk_create_items"""
+        created: List[Item] = []
+        for chunk in _chunks(items, settings.BULK_CHUNK_SIZE):
+            result = await self.db.scalars(_bulk_insert(), _bulk_insert_rows(chunk, owner_id))
+            created.extend(result.all())
+        await self._invalidate(owner_id)
+        await self.db.commit()
+        return created
+
+    async def bulk_update_items(
+        self, items: Sequence[ItemBulkUpdate], owner_id: str
+    ) -> List[Tuple[int, Optional[Item]]]:
+        """Async counterpart of ItemService.bulk_update_items"""
+        found: Dict[int, Item] = {}
+        for chunk in _chunks(items, settings.BULK_CHUNK_SIZE):
+            for statement, parameters in _bulk_updates(chunk, owner_id):
+                await self.db.execute(statement, parameters)
+            ids = [item.id for item in chunk]
+            result = await self.db.scalars(_owned_items(ids, owner_id))
+            found.update((item.id, item) for item in result)
+        await self._invalidate(owner_id)
+        await self.db.commit()
+        return [(item.id, found.get(item.id)) for item in items]
+
+    async def bulk_delete_items(self, ids: Sequence[int], owner_id: str) -> List[Tuple[int, bool]]:
+        """Async counterpart of ItemService.bulk_delete_items"""
+        deleted = set()
+        for chunk in _chunks(ids, settings.BULK_CHUNK_SIZE):
+            result = await self.db.scalars(_bulk_delete(chunk, owner_id))
+            deleted.update(result.all())
+        await self._invalidate(owner_id)
+        await self.db.commit()
+        return [(item_id, item_id in deleted) for item_id in ids]
+
+    async def export_items(
+        self, owner_id: str, format: str = "ndjson", fields: Sequence[str] = EXPORT_COLUMNS
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an owner's items as NDJSON or CSV.
+
+        The query is started here, so errors surface before any response is
+        sent; rows are then read from a server-side cursor
+        EXPORT_BATCH_SIZE at a time as the returned iterator is consumed.
+
+        Args:
+            owner_id: Owner whose items are exported
+            format: ``ndjson`` or ``csv``
+            fields: Columns to export, in order
+
+        Returns:
+            AsyncIterator[bytes]: Encoded rows, one chunk per batch
+        """
+        result = await self.db.stream(_export_rows(owner_id, fields))
+        return _encode_export(result, format, fields)
+
+    async def _insert_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert one import batch with a single executemany.
+
+        On SQLite the full-text trigger is deferred and the batch is indexed
+        with one INSERT ... SELECT afterwards. The flag is set and cleared in
+        this transaction, which holds SQLite's write lock, so no other
+        connection ever sees it.
+        """
+        if self.db.get_bind().dialect.name != "sqlite":
+            await self.db.execute(insert(Item.__table__), rows)
+            return
+        await self.db.execute(text(ITEMS_FTS_DEFER), {"deferred": 1})
+        after_id = await self.db.scalar(select(func.coalesce(func.max(Item.id), 0)))
+        await self.db.execute(insert(Item.__table__), rows)
+        await self.db.execute(text(ITEMS_FTS_INDEX_AFTER), {"after_id": after_id})
+        await self.db.execute(text(ITEMS_FTS_DEFER), {"deferred": 0})
+
+    async def import_items(
+        self, records: AsyncIterator[List[Record]], owner_id: str, atomic: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Insert uploaded records in batches of IMPORT_BATCH_SIZE.
+
+        Records are validated against ItemCreate as they arrive; invalid rows
+        are reported and skipped. Each batch is one executemany INSERT.
+        Without atomic every batch is committed on its own, and a batch that
+        fails is rolled back alone. With atomic nothing is committed until
+        the end, and the first error of any kind rolls back the whole import.
+
+        Args:
+            records: Parsed upload, see core.streaming.iter_records
+            owner_id: Owner of every imported item
+            atomic: Import all rows or none
+
+        Returns:
+            Dict[str, Any]: Summary matching ItemImportResult
+        """
+        summary: Dict[str, Any] = {
+            "atomic": atomic, "rows": 0, "imported": 0, "failed": 0, "batches": [], "errors": [],
+        }
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+
+        def reject(row: int, error: str, count: int = 1) -> None:
+            summary["failed"] += count
+            if len(summary["errors"]) < settings.IMPORT_MAX_ERRORS:
+                summary["errors"].append({"row": row, "error": error})
+
+        async def abort() -> Dict[str, Any]:
+            await self.db.rollback()
+            for entry in summary["batches"]:
+                entry.update(imported=0, status="rolled_back")
+            summary.update(imported=0, failed=summary["rows"])
+            return summary
+
+        async def flush() -> bool:
+            entry = {
+                "batch": len(summary["batches"]) + 1,
+                "first_row": batch[0][0],
+                "last_row": batch[-1][0],
+                "imported": len(batch),
+                "status": "committed",
+            }
+            summary["batches"].append(entry)
+            try:
+                await self._insert_batch([values for _, values in batch])
+                if not atomic:
+                    await self._invalidate(owner_id)
+                    await self.db.commit()
+            except SQLAlchemyError as e:
+                await self.db.rollback()
+                entry.update(imported=0, status="failed")
+                reject(entry["first_row"], f"Rows {entry['first_row']}-{entry['last_row']} failed: {type(e).__name__}", len(batch))
+                return not atomic
+            finally:
+                batch.clear()
+            summary["imported"] += entry["imported"]
             return True
-        return False
+
+        try:
+            async for parsed in records:
+                for record in parsed:
+                    summary["rows"] += 1
+                    values, error = _import_values(record, owner_id)
+                    if error is not None:
+                        reject(summary["rows"], error)
+                        if atomic:
+                            return await abort()
+                        continue
+                    batch.append((summary["rows"], values))
+                    if len(batch) >= settings.IMPORT_BATCH_SIZE and not await flush():
+                        return await abort()
+        except LineTooLong as e:
+            # The rest of the upload cannot be split into rows
+            reject(summary["rows"] + 1, str(e))
+            if atomic:
+                return await abort()
+        if batch and not await flush():
+            return await abort()
+        if atomic:
+            await self._invalidate(owner_id)
+            await self.db.commit()
+        return summary
@@ -1,34 +1,222 @@
 """
 Simplified authentication utilities for Supabase Auth with Google OAuth.
 """
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from supabase import create_client, Client
 from functools import lru_cache
 
+from src.backend.core.cache import TTLCache, token_digest
 from src.backend.core.config import get_settings
+from src.backend.core.monitoring import (
+    AUTH_CLAIMS_CACHE,
+    AUTH_TOKEN_REJECTIONS,
+    AUTH_VALIDATIONS_COALESCED,
+)
+from src.backend.core.singleflight import SingleFlight
+from src.backend.core.tracing import traced
+from src.backend.external.supabase_auth import SupabaseAuthError, get_auth_client
 
 settings = get_settings()
 
 # HTTP Bearer security scheme for token validation
 security = HTTPBearer()
 
+# Verified (user, issued_at) pairs keyed by token digest
+_claims_cache = TTLCache(
+    maxsize=settings.AUTH_CLAIMS_CACHE_SIZE,
+    ttl=settings.AUTH_CLAIMS_CACHE_TTL,
+)
+
+# Rejection details for tokens that failed local verification or that
+# Supabase itself rejected
+_rejected_tokens = TTLCache(
+    maxsize=settings.AUTH_NEGATIVE_CACHE_SIZE,
+    ttl=settings.AUTH_NEGATIVE_CACHE_TTL,
+)
+
+# Revoked token digests, and user ids mapped to their revocation time.
+# Kept apart from the negative cache so a flood of garbage tokens can
+# never evict a revocation.
+_revoked_tokens = TTLCache(
+    maxsize=settings.AUTH_REVOCATION_LIST_SIZE,
+    ttl=settings.AUTH_REVOCATION_TTL,
+)
+_revoked_users = TTLCache(
+    maxsize=settings.AUTH_REVOCATION_LIST_SIZE,
+    ttl=settings.AUTH_REVOCATION_TTL,
+)
+
+# In-flight validations keyed by token digest
+_validations = SingleFlight()
+
 @lru_cache
-def get_supabase_client() -> Client:
+def get_jwks_client() -> jwt.PyJWKClient:
+    """
+    Create and cache a JWKS client for asymmetric Supabase signing keys.
+    
+    Fetched keys are cached by the client, so the key set is only
+    downloaded on first use or when an unknown key id shows up.
+    
+    Returns:
+        jwt.PyJWKClient: JWKS client
+    """
+    return jwt.PyJWKClient(settings.SUPABASE_JWKS_URL, cache_keys=True)
+
+def get_jwt_issuer() -> Optional[str]:
+    """
+    Resolve the expected ``iss`` claim for Supabase access tokens.
+    
+    Returns:
+        Optional[str]: Expected issuer, or None to skip the issuer check
+    """
+    if settings.SUPABASE_JWT_ISSUER:
+        return settings.SUPABASE_JWT_ISSUER
+    if settings.SUPABASE_URL:
+        return f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1"
+    return None
+
+def verify_token_locally(token: str) -> dict:
+    """
+    Verify a Supabase access token without contacting Supabase.
+    
+    Checks the signature against ``SUPABASE_JWT_SECRET`` (HS256) or the
+    cached JWKS key set (RS256/ES256), plus ``exp``, ``aud`` and ``iss``.
+    
+    Args:
+        token: Raw bearer token
+        
+    Returns:
+        dict: Verified token claims
+        
+    Raises:
+        jwt.PyJWTError: If the token fails any check
+    """
+    algorithm = jwt.get_unverified_header(token).get("alg", "")
+    if algorithm.startswith("HS"):
+        if not settings.SUPABASE_JWT_SECRET:
+            raise jwt.InvalidTokenError("SUPABASE_JWT_SECRET is not configured")
+        key = settings.SUPABASE_JWT_SECRET
+        algorithms = ["HS256"]
+    else:
+        if not settings.SUPABASE_JWKS_URL:
+            raise jwt.InvalidTokenError(f"No key set configured for {algorithm} tokens")
+        key = get_jwks_client().get_signing_key_from_jwt(token).key
+        algorithms = ["RS256", "ES256"]
+    
+    return jwt.decode(
+        token,
+        key,
+        algorithms=algorithms,
+        audience=settings.SUPABASE_JWT_AUDIENCE,
+        issuer=get_jwt_issuer(),
+        options={"require": ["exp", "sub"]},
+    )
+
+async def _verify_locally(token: str) -> dict:
+    """Run verify_token_locally, in a thread when it may have to fetch the JWKS."""
+    if jwt.get_unverified_header(token).get("alg", "").startswith("HS"):
+        return verify_token_locally(token)
+    return await asyncio.to_thread(verify_token_locally, token)
+
+def prefetch_jwks() -> None:
     """
-    Create and cache a Supabase client instance.
+    Download the JWKS key set ahead of the first asymmetric token.
     
+    Called from the application lifespan. A failure is not fatal: the key
+    set is fetched again on first use.
+    """
+    if not settings.SUPABASE_JWKS_URL:
+        return
+    try:
+        get_jwks_client().get_jwk_set()
+    except jwt.PyJWKClientError as e:
+        print(f"Could not prefetch the JWKS key set: {e}")
+
+def user_from_claims(claims: dict) -> dict:
+    """
+    Build the user dict returned by get_current_user from token claims.
+    
+    Args:
+        claims: Verified token claims
+        
     Returns:
-        Client: Supabase client
+        dict: User data
     """
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    return {
+        "id": claims["sub"],
+        "email": claims.get("email"),
+        "role": claims.get("role", "authenticated"),
+        "is_active": True,
+        "is_superuser": claims.get("role") == "service_role",
+    }
+
+def _cache_user(digest: str, user: dict, issued_at: float, exp: Optional[float]) -> None:
+    """Cache verified user data, never beyond the token's own expiry."""
+    ttl = None if exp is None else exp - time.time()
+    _claims_cache.set(digest, (user, issued_at), ttl=ttl)
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
+def _unverified_claims(token: str) -> dict:
+    """Read token claims without verification, for bookkeeping only."""
+    try:
+        return jwt.decode(token, options={"verify_signature": False})
+    except jwt.PyJWTError:
+        return {}
+
+def _is_user_revoked(user_id: str, issued_at: float) -> bool:
+    revoked_at = _revoked_users.get(user_id)
+    return revoked_at is not None and issued_at <= revoked_at
+
+def revoke_token(token: str) -> None:
+    """
+    Revoke a single access token, e.g. on logout.
+    
+    The token is dropped from the verified-claims cache and rejected until
+    it expires, without any call to Supabase.
+    
+    Args:
+        token: Raw bearer token
+    """
+    digest = token_digest(token)
+    exp = _unverified_claims(token).get("exp")
+    ttl = None if exp is None else exp - time.time()
+    _revoked_tokens.set(digest, True, ttl=ttl)
+    _claims_cache.delete(digest)
+
+def revoke_user_tokens(user_id: str) -> None:
+    """
+    Revoke every access token issued to a user up to now.
+    
+    Args:
+        user_id: Supabase user id (the token ``sub`` claim)
+    """
+    _revoked_users.set(user_id, time.time())
+
+@traced("auth")
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
     """
     Dependency to get current authenticated user from JWT token
     
+    Verified users are served from a bounded TTL cache keyed by the token
+    digest. On a miss the token is verified locally; Supabase is only
+    contacted when local verification is disabled or strict mode is on.
+    Concurrent requests carrying the same token share a single validation.
+    Revoked and recently rejected tokens are refused before any decoding.
+    
     Args:
         credentials: HTTP Authorization credentials with Bearer token
         
@@ -39,80 +227,133 @@ async def get_current_user(
         HTTPException: If the token is invalid or expired
     """
     token = credentials.credentials
-    try:
-        # First try to use Supabase client to validate the token
+    digest = token_digest(token)
+    
+    if _revoked_tokens.get(digest) is not None:
+        AUTH_TOKEN_REJECTIONS.labels(reason="revoked").inc()
+        raise _unauthorized("Token has been revoked")
+    rejection = _rejected_tokens.get(digest)
+    if rejection is not None:
+        AUTH_TOKEN_REJECTIONS.labels(reason="negative_cache").inc()
+        raise _unauthorized(rejection)
+    
+    if not settings.AUTH_STRICT_MODE:
+        cached = _claims_cache.get(digest)
+        if cached is not None:
+            AUTH_CLAIMS_CACHE.labels(result="hit").inc()
+            user, issued_at = cached
+            if _is_user_revoked(user["id"], issued_at):
+                _claims_cache.delete(digest)
+                AUTH_TOKEN_REJECTIONS.labels(reason="revoked").inc()
+                raise _unauthorized("Token has been revoked")
+            return user
+    AUTH_CLAIMS_CACHE.labels(result="miss").inc()
+    
+    user, shared = await _validations.do(digest, lambda: _validate_token(token, digest))
+    if shared:
+        AUTH_VALIDATIONS_COALESCED.inc()
+    return user
+
+async def _validate_token(token: str, digest: str) -> dict:
+    """
+    Validate a token that missed the claims cache and cache the result.
+    
+    Args:
+        token: Raw bearer token
+        digest: Token digest used as the cache key
+        
+    Returns:
+        dict: User data
+        
+    Raises:
+        HTTPException: If the token is invalid or expired
+    """
+    validated_at = time.time()
+    if settings.AUTH_LOCAL_VERIFICATION:
         try:
-            client = get_supabase_client()
-            
-            # Print Supabase configuration for debugging
-            print(f"Using Supabase URL: {settings.SUPABASE_URL}")
-            print(f"Using Supabase Key: {settings.SUPABASE_KEY[:10]}...")
-            
-            # Set the session with the token
-            client.auth.set_session(token)
-            
-            # Get the user data
-            user_response = await client.auth.get_user()
-            
-            if user_response and hasattr(user_response, 'user'):
-                print(f"Successfully authenticated with Supabase: {user_response.user.get('email', 'unknown')}")
-                return user_response.user
-            else:
-                print(f"Unexpected user response format: {user_response}")
-                raise ValueError("Invalid user response format")
-                
-        except Exception as supabase_error:
-            print(f"Supabase token validation failed: {str(supabase_error)}")
-            import traceback
-            print(traceback.format_exc())
-            
-            # Fall back to manual JWT validation for our temporary token
-            import jwt
-            
-            try:
-                # Decode and verify the token
-                payload = jwt.decode(token, settings.SUPABASE_JWT_SECRET, algorithms=["HS256"], options={"verify_signature": False})
-                
-                # Create a user object from the payload
-                user = {
-                    "id": payload.get("sub", "test-user-id"),
-                    "email": payload.get("email", "test@example.com"),
-                    "role": payload.get("role", "authenticated"),
-                    "is_active": True,
-                    "is_superuser": payload.get("role") == "authenticated",
-                }
-                
-                print(f"Successfully authenticated user via JWT: {user['email']}")
-                
-                return user
-            except Exception as jwt_error:
-                print(f"JWT validation also failed: {str(jwt_error)}")
-                
-                # As a last resort, return test data for development
-                print("Returning test user data for development")
-                return {
-                    "id": "test-user-id",
-                    "email": "test@example.com",
-                    "role": "authenticated",
-                    "is_active": True,
-                    "is_superuser": True,
-                }
-            
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has expired",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    except jwt.InvalidTokenError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    except Exception as e:
+            claims = await _verify_locally(token)
+        except jwt.PyJWKClientConnectionError:
+            # The key set could not be fetched, which says nothing about the token
+            raise _unauthorized("Could not validate credentials")
+        except jwt.PyJWTError as e:
+            # Remember the rejection so retries are refused without decoding
+            detail = "Token has expired" if isinstance(e, jwt.ExpiredSignatureError) else "Invalid token"
+            _rejected_tokens.set(digest, detail)
+            raise _unauthorized(detail)
+        
+        issued_at = claims.get("iat", validated_at)
+        if _is_user_revoked(claims["sub"], issued_at):
+            raise _unauthorized("Token has been revoked")
+        
+        if not settings.AUTH_STRICT_MODE:
+            user = user_from_claims(claims)
+            _cache_user(digest, user, issued_at, claims.get("exp"))
+            return user
+    
+    try:
+        user = await _validate_with_supabase(token)
+    except jwt.PyJWTError:
+        # Rejected by Supabase itself; an unreachable Supabase is not cached
+        _rejected_tokens.set(digest, "Invalid token")
+        raise _unauthorized("Invalid token")
+    claims = _unverified_claims(token)
+    issued_at = claims.get("iat", validated_at)
+    if _is_user_revoked(user["id"], issued_at):
+        raise _unauthorized("Token has been revoked")
+    _cache_user(digest, user, issued_at, claims.get("exp"))
+    return user
+
+async def _validate_with_supabase(token: str) -> dict:
+    """
+    Validate a token with the async Supabase Auth client.
+    
+    Args:
+        token: Raw bearer token
+        
+    Returns:
+        dict: User data
+        
+    Raises:
+        jwt.InvalidTokenError: If Supabase rejects the token
+        HTTPException: If Supabase cannot be reached to confirm the token
+    """
+    try:
+        user_data = await get_auth_client().get_user(token)
+    except SupabaseAuthError as e:
+        if 400 <= e.status_code < 500 and e.status_code != 429:
+            raise jwt.InvalidTokenError(str(e))
+        raise _unauthorized("Could not validate credentials")
+    except httpx.HTTPError:
+        raise _unauthorized("Could not validate credentials")
+    
+    if not user_data.get("id"):
+        raise jwt.InvalidTokenError("Supabase returned no user for the token")
+    return {
+        "id": user_data["id"],
+        "email": user_data.get("email"),
+        "role": user_data.get("role") or "authenticated",
+        "is_active": True,
+        "is_superuser": user_data.get("role") == "service_role",
+    }
+
+async def get_current_superuser(
+    current_user: dict = Depends(get_current_user)
+) -> dict:
+    """
+    Dependency that only lets Supabase service-role users through.
+    
+    Args:
+        current_user: Authenticated user data
+        
+    Returns:
+        dict: User data
+        
+    Raises:
+        HTTPException: If the user is not a superuser
+    """
+    if not current_user.get("is_superuser"):
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid authentication credentials: {str(e)}",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="The user doesn't have enough privileges",
         )
+    return current_user
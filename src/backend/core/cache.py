@@ -0,0 +1,226 @@
+"""
+In-process caching utilities.
+"""
+import hashlib
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from src.backend.core.monitoring import CACHE_BYTES, CACHE_ENTRIES, CACHE_LOOKUPS
+
+
+def token_digest(token: str) -> str:
+    """
+    Derive a fixed-size cache key from a bearer token.
+
+    The raw token is never stored as a key, so a heap dump of the cache
+    does not leak usable credentials.
+
+    Args:
+        token: Raw bearer token
+
+    Returns:
+        str: Hex encoded SHA-256 digest of the token
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(ABC):
+    """
+    Key-value store with per-entry expiry.
+
+    TTLCache is the in-process implementation. A store shared by all
+    workers (Redis, memcached) implements the same calls, serializing the
+    tuple keys, so that an invalidation in one worker is seen by the others.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value for ``key`` or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds or the store default."""
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> bool:
+        """Remove ``key``, returning True if an entry was removed."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries."""
+
+    @property
+    def nbytes(self) -> Optional[int]:
+        """Memory held by cached values, or None if the store does not track it"""
+        return None
+
+
+class TTLCache(CacheBackend):
+    """
+    Size-bounded, thread-safe LRU cache with per-entry expiry.
+
+    Entries are evicted least-recently-used first once ``maxsize`` is
+    reached, and lazily dropped on access once their TTL has elapsed.
+    With ``sizeof`` the cache also keeps a running total of the size of
+    its values in ``nbytes``.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, sizeof: Optional[Callable[[Any], int]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._nbytes = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pop(self, key: Hashable) -> bool:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        if self._sizeof is not None:
+            self._nbytes -= self._sizeof(entry[1])
+        return True
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for ``key`` or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store ``value`` under ``key``.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Optional lifetime in seconds, capped at the cache TTL
+        """
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (time.monotonic() + lifetime, value)
+            if self._sizeof is not None:
+                self._nbytes += self._sizeof(value)
+            while len(self._data) > self.maxsize:
+                self._pop(next(iter(self._data)))
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove ``key`` from the cache.
+
+        Returns:
+            bool: True if an entry was removed
+        """
+        with self._lock:
+            return self._pop(key)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+
+    @property
+    def nbytes(self) -> Optional[int]:
+        """Total ``sizeof`` of the cached values, None without ``sizeof``"""
+        return self._nbytes if self._sizeof is not None else None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class GenerationalCache:
+    """
+    Read-through cache split into scopes that are invalidated as a whole.
+
+    Each scope (for example an owner) has a generation and entries are
+    stored under ``(name, scope, generation, key)``. Moving the scope to a
+    new generation makes the entries written under the old one unreachable,
+    and they age out of the backend.
+
+    Callers running on several workers pass the generation to lookup(),
+    read from a store they all share such as a database counter bumped by
+    every write. Without it the generation is a token kept in the backend
+    that only invalidate() replaces, which is enough for a single process.
+    Tokens are random and never reused: a generation evicted from the
+    backend only invalidates its scope early.
+
+    Lookups are counted in CACHE_LOOKUPS by result, so the hit ratio is
+    ``hit / (hit + miss)``; entries and memory of backends that track them
+    are exported as gauges.
+    """
+
+    def __init__(self, backend: CacheBackend, name: str):
+        self.backend = backend
+        self.name = name
+        if backend.nbytes is not None:
+            CACHE_BYTES.labels(cache=name).set_function(lambda: backend.nbytes)
+            CACHE_ENTRIES.labels(cache=name).set_function(lambda: len(backend))
+
+    def _generation(self, scope: Hashable) -> str:
+        key = (self.name, "generation", scope)
+        generation = self.backend.get(key)
+        if generation is None:
+            generation = secrets.token_hex(8)
+            self.backend.set(key, generation)
+        return generation
+
+    def lookup(
+        self, scope: Hashable, key: Hashable, generation: Optional[Hashable] = None
+    ) -> Tuple[Optional[Any], Hashable]:
+        """
+        Look ``key`` up in ``scope``.
+
+        Call this, and read ``generation``, before reading the value from
+        its source: a write committed in the meantime moves the scope to a
+        new generation, so a value read before that write is stored where
+        no one looks for it.
+
+        Args:
+            scope: Invalidation scope
+            key: Entry key within the scope
+            generation: Current generation of the scope from a shared store,
+                None to use this cache's own token
+
+        Returns:
+            Tuple[Optional[Any], Hashable]: The cached value or None, and the
+            key to store() a freshly read value under
+        """
+        if generation is None:
+            generation = self._generation(scope)
+        entry_key = (self.name, scope, generation, key)
+        value = self.backend.get(entry_key)
+        CACHE_LOOKUPS.labels(cache=self.name, result="miss" if value is None else "hit").inc()
+        return value, entry_key
+
+    def store(self, entry_key: Hashable, value: Any) -> None:
+        """Cache ``value`` under a key returned by lookup()"""
+        self.backend.set(entry_key, value)
+
+    def invalidate(self, scope: Hashable) -> None:
+        """
+        Make every entry of ``scope`` unreachable in this process; call
+        after the write commits. Shared generations are bumped by the
+        caller instead.
+        """
+        self.backend.set((self.name, "generation", scope), secrets.token_hex(8))
+
+    def clear(self) -> None:
+        """Remove all entries of the backend."""
+        self.backend.clear()
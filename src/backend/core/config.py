@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 import os
 
 class Settings(BaseSettings):
@@ -9,25 +10,92 @@ class Settings(BaseSettings):
     
     # Database settings
     DATABASE_URL: str = "sqlite:///./app.db"  # Default to SQLite for starter projects
+    DATABASE_REPLICA_URLS: str = ""  # Comma-separated read replicas; reads use the primary when empty
+    DATABASE_REPLICA_LAG_INTERVAL: int = 10  # Seconds between replication heartbeats
+    DB_POOL_SIZE: int = 5  # Persistent connections per engine
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened under load
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a connection before failing
+    DB_POOL_PRE_PING: bool = True  # Test connections on checkout
+    DB_POOL_RECYCLE: int = 300  # Seconds before a connection is replaced
+    
+    # Slow-query log
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_LOG_SIZE: int = 100  # Entries kept in memory for /admin/slow-queries
+    SLOW_QUERY_LOG_FILE: Optional[str] = None  # Also append entries to this JSONL file
+    SLOW_QUERY_CAPTURE_PLAN: bool = True  # Run EXPLAIN for recorded statements
+    
+    # Per-request query budget
+    QUERY_BUDGET_DEFAULT: int = 20  # Statements per request unless the route sets its own
+    QUERY_REPEAT_THRESHOLD: int = 5  # Same statement this often in one request is reported as N+1
+    QUERY_BUDGET_ENFORCE: Optional[str] = "log"  # raise, log or off; raise fails the request once it has finished
+    
+    # Bulk item endpoints
+    BULK_CHUNK_SIZE: int = 500  # Rows per batched statement
+    BULK_MAX_ITEMS: int = 5000  # Largest array accepted by one bulk request
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched from the cursor and sent per chunk by /items/export
+    IMPORT_BATCH_SIZE: int = 5000  # Rows inserted and committed together by /items/import
+    IMPORT_MAX_ERRORS: int = 100  # Row errors listed in the import response; all are counted
+    IMPORT_MAX_LINE_BYTES: int = 1048576  # Longest NDJSON/CSV line accepted
+    
+    # Item read cache (in-process; writes invalidate it on every worker
+    # through the item_cache_generations table)
+    ITEMS_CACHE_SIZE: int = 10000  # Cached list pages and items across all owners
+    ITEMS_CACHE_TTL: int = 30  # Seconds an entry is kept, 0 disables
+    
+    # SQLite performance profile (on-disk SQLite only)
+    SQLITE_PERFORMANCE_MODE: bool = True  # WAL, tuned pragmas, split reader/writer engines
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -64000  # Negative values are KiB, i.e. 64 MiB per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_READ_POOL_SIZE: int = 8
     
     # Security settings
     SECRET_KEY: str = "development-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # bcrypt worker processes, defaults to CPU count
+    PASSWORD_HASH_CONCURRENCY: Optional[int] = None  # Jobs submitted at once, defaults to workers
     
     # Metrics settings
     METRICS_PORT: int = 9090
     
+    # Request tracing (Server-Timing header and per-phase latency histograms)
+    TRACING_ENABLED: bool = True
+    TRACE_SAMPLE_RATE: float = 0.0  # Share of requests exported to TRACE_EXPORT_FILE, 0 exports none
+    TRACE_EXPORT_FILE: str = "traces.jsonl"  # OTLP/JSON, one trace per line
+    TRACE_SERVICE_NAME: str = "fastapi-backend"
+    
     # Environment-specific settings
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
     
     # Supabase settings
-    SUPABASE_URL: str = None
-    SUPABASE_KEY: str = None
-    SUPABASE_JWT_SECRET: str = None
+    SUPABASE_URL: Optional[str] = None
+    SUPABASE_KEY: Optional[str] = None
+    SUPABASE_JWT_SECRET: Optional[str] = None
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    SUPABASE_JWT_ISSUER: Optional[str] = None  # Defaults to {SUPABASE_URL}/auth/v1
+    SUPABASE_JWKS_URL: Optional[str] = None  # Set for asymmetric (RS256/ES256) signing keys
+    SUPABASE_AUTH_TIMEOUT: float = 10.0
+    SUPABASE_AUTH_MAX_CONNECTIONS: int = 100  # Shared async connection pool size
+    SUPABASE_AUTH_MAX_KEEPALIVE: int = 20
+    
+    # Token verification settings
+    AUTH_LOCAL_VERIFICATION: bool = True  # Verify JWTs locally instead of calling Supabase
+    AUTH_STRICT_MODE: bool = False  # Always confirm tokens with Supabase, bypassing the cache
+    AUTH_CLAIMS_CACHE_SIZE: int = 10000
+    AUTH_CLAIMS_CACHE_TTL: int = 300  # Seconds, never longer than the token's own exp
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10000  # Active-user snapshots keyed by user id
+    AUTH_PRINCIPAL_CACHE_TTL: int = 10  # Seconds; per worker, bounds how long other workers see stale users
+    AUTH_NEGATIVE_CACHE_SIZE: int = 10000  # Recently rejected token digests
+    AUTH_NEGATIVE_CACHE_TTL: int = 300
+    AUTH_REVOCATION_LIST_SIZE: int = 100000
+    AUTH_REVOCATION_TTL: int = 3600  # Should cover the Supabase JWT expiry
     
     # OAuth settings
     OAUTH_REDIRECT_URL: str = "http://localhost:8000/api/v1/auth/callback"
+    OAUTH_STATE_TTL: int = 600  # Seconds the user has to complete the provider login
     FRONTEND_URL: str = "http://localhost:5000"
     
     # CORS settings
@@ -0,0 +1,67 @@
+"""
+Entity tags for conditional requests.
+
+Strong tags identify one exact representation and are compared with the
+strong function (If-Match, used for optimistic concurrency); weak tags,
+``W/"..."``, only promise an equivalent one and are compared with the weak
+function (If-None-Match, used to answer 304 Not Modified).
+"""
+import hashlib
+import re
+from typing import Any, List, Optional
+
+_ETAG = re.compile(r'\s*(W/)?("[^"]*")\s*(?:,|$)')
+
+
+def strong_etag(*parts: Any) -> str:
+    """Quoted strong ETag joining ``parts`` with dashes"""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def weak_etag(*parts: Any) -> str:
+    """Weak ETag hashing ``parts``, for values too long to send as they are"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def parse_etags(header: Optional[str]) -> Optional[List[str]]:
+    """
+    Split an If-Match or If-None-Match header into its entity tags.
+
+    Args:
+        header: Header value, None if the header was not sent
+
+    Returns:
+        Optional[List[str]]: Tags as sent, weak ones keeping their ``W/``
+        prefix; ``["*"]`` for a wildcard and None without a header. Malformed
+        entries are dropped, so they never match.
+    """
+    if header is None:
+        return None
+    if header.strip() == "*":
+        return ["*"]
+    return [weak + tag for weak, tag in _ETAG.findall(header)]
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether the client already holds ``etag`` (weak comparison).
+
+    Args:
+        if_none_match: If-None-Match header, None if not sent
+        etag: Current ETag of the resource
+
+    Returns:
+        bool: True if the request should be answered with 304
+    """
+    tags = parse_etags(if_none_match) or []
+    return any(tag == "*" or _opaque(tag) == _opaque(etag) for tag in tags)
+
+
+def strong_matches(tags: List[str]) -> List[str]:
+    """Tags of an If-Match header that may match under strong comparison"""
+    return [tag for tag in tags if not tag.startswith("W/")]
@@ -1,9 +1,14 @@
 from prometheus_client import Counter, Histogram, Gauge, Info
 from prometheus_client import make_asgi_app
 from fastapi import Request, Response
+from starlette.datastructures import MutableHeaders
 from typing import Callable, Any
+import asyncio
 import time
 
+from src.backend.core.request_context import route_of
+from src.backend.core.tracing import Trace, current_trace, server_timing, start_trace, trace_exporter
+
 # API metrics
 REQUEST_COUNT = Counter(
     'api_requests_total',
@@ -17,6 +22,12 @@ REQUEST_LATENCY = Histogram(
     ['method', 'endpoint']
 )
 
+REQUEST_PHASE_LATENCY = Histogram(
+    'api_request_phase_duration_seconds',
+    'Time spent per request phase (auth, session, sql, serialize, external, other, total)',
+    ['route', 'phase']
+)
+
 # Database metrics
 DB_QUERY_COUNT = Counter(
     'db_queries_total',
@@ -30,6 +41,68 @@ DB_QUERY_LATENCY = Histogram(
     ['operation', 'table']
 )
 
+DB_QUERY_ROWS = Histogram(
+    'db_query_rows',
+    'Rows returned or affected per database statement',
+    ['operation', 'table'],
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+)
+
+DB_SLOW_QUERIES = Counter(
+    'db_slow_queries_total',
+    'Statements slower than SLOW_QUERY_THRESHOLD_MS',
+    ['operation', 'table']
+)
+
+DB_QUERY_BUDGET_VIOLATIONS = Counter(
+    'db_query_budget_violations_total',
+    'Requests exceeding their query budget or repeating a statement',
+    ['kind']
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out_connections',
+    'Connections currently checked out of the pool',
+    ['pool']
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    'db_pool_overflow_connections',
+    'Overflow connections in use beyond pool_size',
+    ['pool']
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent waiting to check out a connection',
+    ['pool'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    'db_pool_checkout_timeouts_total',
+    'Checkouts that gave up after pool_timeout',
+    ['pool']
+)
+
+DB_POOL_CONNECTION_EVENTS = Counter(
+    'db_pool_connection_events_total',
+    'Connection churn: new, invalidated and closed DBAPI connections',
+    ['pool', 'event']
+)
+
+DB_REPLICA_QUERY_LATENCY = Histogram(
+    'db_replica_query_duration_seconds',
+    'Statement latency per read replica in seconds',
+    ['replica']
+)
+
+DB_REPLICA_LAG = Gauge(
+    'db_replica_lag_seconds',
+    'Age of the replication heartbeat on each read replica',
+    ['replica']
+)
+
 # External service metrics
 EXTERNAL_REQUEST_COUNT = Counter(
     'external_requests_total',
@@ -43,12 +116,77 @@ EXTERNAL_REQUEST_LATENCY = Histogram(
     ['service', 'status']
 )
 
+# Authentication metrics
+AUTH_CLAIMS_CACHE = Counter(
+    'auth_claims_cache_total',
+    'Verified-claims cache lookups in get_current_user',
+    ['result']
+)
+
+AUTH_PRINCIPAL_CACHE = Counter(
+    'auth_principal_cache_total',
+    'User principal cache lookups in api.deps.get_current_user',
+    ['result']
+)
+
+AUTH_VALIDATIONS_COALESCED = Counter(
+    'auth_validations_coalesced_total',
+    'Token validations that joined an in-flight validation of the same token'
+)
+
+AUTH_TOKEN_REJECTIONS = Counter(
+    'auth_token_rejections_total',
+    'Tokens rejected from the negative cache or revocation list without verification',
+    ['reason']
+)
+
+# Response cache metrics
+CACHE_LOOKUPS = Counter(
+    'cache_lookups_total',
+    'Read-through cache lookups',
+    ['cache', 'result']
+)
+
+CACHE_ENTRIES = Gauge(
+    'cache_entries',
+    'Entries held by an in-process cache, generations included',
+    ['cache']
+)
+
+CACHE_BYTES = Gauge(
+    'cache_bytes',
+    'Bytes of cached values held by an in-process cache',
+    ['cache']
+)
+
+# Password hashing metrics
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    'password_hash_queue_depth',
+    'Password hashing jobs waiting for a process pool slot'
+)
+
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    'password_hash_in_flight',
+    'Password hashing jobs running in the process pool'
+)
+
+PASSWORD_HASH_LATENCY = Histogram(
+    'password_hash_duration_seconds',
+    'Password hashing latency in seconds, including queueing',
+    ['operation']
+)
+
 # Application info
 APP_INFO = Info('app_info', 'Application info')
 
 
 class PrometheusMiddleware:
-    """Middleware to track API request metrics."""
+    """
+    Middleware to track API request metrics.
+
+    Also starts the request's Trace, answers with its Server-Timing
+    breakdown and records the per-phase latency histograms.
+    """
     
     def __init__(self, app: Any):
         self.app = app
@@ -60,10 +198,15 @@ class PrometheusMiddleware:
 
         request = Request(scope, receive)
         start_time = time.time()
+        trace = start_trace(f"{request.method} {request.url.path}")
+        token = current_trace.set(trace)
+        status_code = 500
         
         async def send_wrapper(message: dict) -> None:
+            nonlocal status_code
             if message["type"] == "http.response.start":
                 duration = time.time() - start_time
+                status_code = message["status"]
                 
                 REQUEST_COUNT.labels(
                     method=request.method,
@@ -75,10 +218,35 @@ class PrometheusMiddleware:
                     method=request.method,
                     endpoint=request.url.path
                 ).observe(duration)
+                
+                if trace is not None:
+                    MutableHeaders(scope=message).append("Server-Timing", server_timing(trace.phases()))
             
             await send(message)
 
-        await self.app(scope, receive, send_wrapper)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_trace.reset(token)
+            if trace is not None:
+                await finish_trace(trace, scope, status_code)
+
+
+async def finish_trace(trace: Trace, scope: dict, status_code: int) -> None:
+    """Record the phase histograms of a finished request and export it if sampled"""
+    trace.root.end = time.perf_counter()
+    # Requests matching no route would each add their own path as a label
+    route = route_of(scope) if scope.get("endpoint") is not None else "unmatched"
+    for phase, seconds in trace.phases().items():
+        REQUEST_PHASE_LATENCY.labels(route=route, phase=phase).observe(seconds)
+    if trace.sampled:
+        trace.root.name = route
+        trace.root.attributes.update({
+            "http.method": scope.get("method", ""),
+            "http.route": route,
+            "http.status_code": status_code,
+        })
+        await asyncio.to_thread(trace_exporter.export, trace)
 
 # Export Prometheus metrics endpoint
 prometheus_app = make_asgi_app()
@@ -0,0 +1,124 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A page is fetched with ``WHERE (k1, k2) > (:last_k1, :last_k2) ORDER BY k1,
+k2 LIMIT n``, so the database seeks straight to the first row of the page
+through a matching index. Unlike OFFSET, page 1000 costs the same as page 1.
+The values of the last row are handed to the client as an opaque cursor.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import Select
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the key values of a row into an opaque cursor.
+
+    Args:
+        values: Values of the keyset columns, in order
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = json.dumps(list(values), default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[InstrumentedAttribute]) -> List[Any]:
+    """
+    Decode a cursor back into values typed for the keyset columns.
+
+    Args:
+        cursor: Cursor from a previous page
+        keys: Keyset columns the cursor was built from
+
+    Returns:
+        List[Any]: One value per key column
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or does not match the keys
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise InvalidCursor("Cursor does not match the ordering")
+        return [
+            datetime.fromisoformat(value) if isinstance(key.type, DateTime) else value
+            for key, value in zip(keys, values)
+        ]
+    except InvalidCursor:
+        raise
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+
+def keyset_page(
+    statement: Select,
+    keys: Sequence[InstrumentedAttribute],
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Select:
+    """
+    Restrict a statement to the page following a cursor.
+
+    One extra row is fetched so page_results can tell whether another page
+    follows.
+
+    Args:
+        statement: Base query, already filtered
+        keys: Unique ordering, e.g. ``(Item.owner_id, Item.id)``
+        limit: Page size
+        cursor: Cursor of the previous page, None for the first page
+
+    Returns:
+        Select: Ordered and limited statement
+    """
+    if cursor is not None:
+        values = decode_cursor(cursor, keys)
+        # Bind with the column types so values compare like stored values
+        statement = statement.where(
+            tuple_(*keys) > tuple_(*(literal(value, key.type) for key, value in zip(keys, values)))
+        )
+    return statement.order_by(*keys).limit(limit + 1)
+
+
+def page_results(
+    rows: Sequence[Any],
+    keys: Sequence[InstrumentedAttribute],
+    limit: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Split the rows of a keyset_page query into the page and the next cursor.
+
+    Args:
+        rows: ORM objects returned by the keyset_page statement
+        keys: Keyset columns the statement was ordered by
+        limit: Page size
+
+    Returns:
+        Tuple[List[Any], Optional[str]]: Page rows and the cursor of the
+        next page, None on the last page
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor([getattr(page[-1], key.key) for key in keys])
@@ -1,72 +1,89 @@
 """
 PKCE (Proof Key for Code Exchange) utilities for OAuth 2.0 flow.
+
+The code verifier never leaves the server in a URL. It is sealed, together
+with the random ``state`` sent to the provider, into an encrypted and
+authenticated HttpOnly cookie, so any worker can complete the exchange
+without shared session storage. The callback only accepts the ``state``
+bound to that cookie, which also protects it against login CSRF.
 """
 import base64
 import hashlib
-import secrets
 import json
-from typing import Dict, Tuple
+import secrets
+from typing import Tuple
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from src.backend.core.config import get_settings
+
+settings = get_settings()
+
+# Cookie holding the sealed state and verifier between login and callback
+OAUTH_STATE_COOKIE = "oauth_state"
+
 
 def generate_pkce_pair() -> Tuple[str, str]:
     """
     Generate a code verifier and code challenge pair for PKCE.
-    
+
     Returns:
         Tuple[str, str]: A tuple containing (code_verifier, code_challenge)
     """
     # Generate a secure random string for the code verifier
     code_verifier = secrets.token_urlsafe(64)
-    
+
     # Create code challenge by hashing the verifier with SHA-256
     code_challenge = hashlib.sha256(code_verifier.encode('utf-8')).digest()
     code_challenge = base64.urlsafe_b64encode(code_challenge).decode('utf-8').rstrip('=')
-    
+
     return code_verifier, code_challenge
 
-def generate_state_with_verifier(code_verifier: str) -> str:
+def generate_state() -> str:
+    """Random, unguessable value for the OAuth ``state`` parameter"""
+    return secrets.token_urlsafe(32)
+
+def _fernet() -> Fernet:
+    # A key of its own, derived from SECRET_KEY
+    key = hashlib.sha256(f"oauth-state:{settings.SECRET_KEY}".encode('utf-8')).digest()
+    return Fernet(base64.urlsafe_b64encode(key))
+
+def seal_state(state: str, code_verifier: str) -> str:
     """
-    Generate a state parameter that includes the code verifier.
-    
+    Encrypt and sign the state and code verifier for the state cookie.
+
     Args:
-        code_verifier: The code verifier to include in the state
-        
+        state: The ``state`` sent to the provider
+        code_verifier: The PKCE code verifier
+
     Returns:
-        str: A base64-encoded state parameter containing the verifier
+        str: Cookie value
     """
-    # Create a state object with the verifier and a nonce for security
-    state_obj = {
-        "verifier": code_verifier,
-        "nonce": secrets.token_hex(8)
-    }
-    
-    # Encode the state as JSON and then base64
-    state_json = json.dumps(state_obj)
-    state = base64.urlsafe_b64encode(state_json.encode('utf-8')).decode('utf-8')
-    
-    return state
-
-def extract_verifier_from_state(state: str) -> str:
+    payload = json.dumps({"state": state, "verifier": code_verifier})
+    return _fernet().encrypt(payload.encode('utf-8')).decode('utf-8')
+
+def open_state(cookie: str, state: str) -> str:
     """
-    Extract the code verifier from a state parameter.
-    
+    Check the returned ``state`` against the state cookie and get the verifier.
+
     Args:
-        state: The base64-encoded state parameter
-        
+        cookie: Value of the state cookie
+        state: The ``state`` query parameter of the callback
+
     Returns:
         str: The code verifier
-        
+
     Raises:
-        ValueError: If the state is invalid or doesn't contain a verifier
+        ValueError: If the cookie is missing, forged, older than
+            OAUTH_STATE_TTL or was issued for another state
     """
+    if not cookie or not state:
+        raise ValueError("Missing OAuth state")
     try:
-        # Decode the state from base64 to JSON
-        state_json = base64.urlsafe_b64decode(state.encode('utf-8')).decode('utf-8')
-        state_obj = json.loads(state_json)
-        
-        # Extract the verifier
-        if "verifier" not in state_obj:
-            raise ValueError("State does not contain a verifier")
-        
-        return state_obj["verifier"]
-    except Exception as e:
-        raise ValueError(f"Invalid state parameter: {str(e)}")
+        payload = _fernet().decrypt(cookie.encode('utf-8'), ttl=settings.OAUTH_STATE_TTL)
+    except InvalidToken:
+        raise ValueError("Invalid or expired OAuth state")
+    sealed = json.loads(payload)
+    if not secrets.compare_digest(sealed["state"], state):
+        raise ValueError("OAuth state mismatch")
+    return sealed["verifier"]
@@ -0,0 +1,57 @@
+"""
+Per-request context shared with code that has no access to the Request.
+
+RequestContextMiddleware stores the ASGI scope of the request being served
+in a context variable. Database event hooks run in the same context (the
+threadpool and SQLAlchemy's greenlets copy it), so they can tell which
+route issued a query.
+"""
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+current_scope: ContextVar[Optional[dict]] = ContextVar("current_scope", default=None)
+
+
+def get_current_route() -> Optional[str]:
+    """
+    Route of the request being served, e.g. ``GET /api/v1/items/{item_id}``.
+
+    Returns:
+        Optional[str]: Method and route template (the raw path before
+        routing has matched), or None outside a request
+    """
+    scope = current_scope.get()
+    if scope is None:
+        return None
+    return route_of(scope)
+
+
+def route_of(scope: dict) -> str:
+    """Method and route template of an HTTP scope, see get_current_route"""
+    # Included routers only know their own part of the path, so the full
+    # template is rebuilt by putting the parameter names back into the path
+    segments = scope.get("path", "").split("/")
+    for name, value in (scope.get("path_params") or {}).items():
+        for index in range(len(segments) - 1, -1, -1):
+            if segments[index] == str(value):
+                segments[index] = f"{{{name}}}"
+                break
+    return f"{scope.get('method', '')} {'/'.join(segments)}".strip()
+
+
+class RequestContextMiddleware:
+    """Middleware exposing the current request scope through current_scope."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
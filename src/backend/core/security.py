@@ -1,8 +1,18 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from functools import lru_cache
+from typing import Any, Callable, Optional, Union
 from jose import jwt
 from passlib.context import CryptContext
 from src.backend.core.config import get_settings
+from src.backend.core.monitoring import (
+    PASSWORD_HASH_IN_FLIGHT,
+    PASSWORD_HASH_LATENCY,
+    PASSWORD_HASH_QUEUE_DEPTH,
+)
 
 settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -24,3 +34,76 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
     return pwd_context.hash(password)
+
+
+class PasswordHasher:
+    """
+    Async bcrypt hashing backed by a bounded process pool.
+
+    bcrypt holds the GIL for tens of milliseconds per call, so running it
+    inline (or in a thread) stalls every other request on the worker. Jobs
+    run in separate processes instead; at most ``max_concurrency`` are
+    submitted at once and the rest wait in an asyncio queue, which is
+    exported as ``password_hash_queue_depth``.
+    """
+
+    def __init__(self, max_workers: int, max_concurrency: int):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Worker processes are only started on first use
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def _run(self, operation: str, func: Callable, *args: Any) -> Any:
+        start_time = time.perf_counter()
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+        queued = True
+        try:
+            async with self._semaphore:
+                PASSWORD_HASH_QUEUE_DEPTH.dec()
+                queued = False
+                with PASSWORD_HASH_IN_FLIGHT.track_inprogress():
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            if queued:
+                PASSWORD_HASH_QUEUE_DEPTH.dec()
+            PASSWORD_HASH_LATENCY.labels(operation=operation).observe(
+                time.perf_counter() - start_time
+            )
+
+    async def hash(self, password: str) -> str:
+        """Generate password hash without blocking the event loop"""
+        return await self._run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify password against hash without blocking the event loop"""
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasher:
+    """Create and cache the process-wide password hasher"""
+    max_workers = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+    return PasswordHasher(
+        max_workers=max_workers,
+        max_concurrency=settings.PASSWORD_HASH_CONCURRENCY or max_workers,
+    )
+
+async def hash_password_async(password: str) -> str:
+    """Generate password hash in the hashing process pool"""
+    return await get_password_hasher().hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash in the hashing process pool"""
+    return await get_password_hasher().verify(plain_password, hashed_password)
@@ -0,0 +1,49 @@
+"""
+Request coalescing for concurrent calls that share a key.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers with the same key.
+
+    The first caller starts the work as a task; callers arriving while it is
+    running await the same task. The entry is dropped as soon as the task
+    finishes, so neither results nor failures outlive that one call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` once for all concurrent callers using ``key``.
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument coroutine function doing the actual work
+
+        Returns:
+            Tuple[Any, bool]: The result and whether it was shared with an
+            earlier caller
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if not shared:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # Shield so one caller being cancelled does not cancel the shared work
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller went away
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,118 @@
+"""
+Incremental parsing of NDJSON and CSV request bodies.
+
+Uploads are read chunk by chunk from the request stream and split into
+records as they arrive, so only the current chunk and one partial line are
+held in memory however large the upload is. Records are handed out one
+list per chunk to keep the per-record async overhead out of the hot path.
+"""
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Union
+
+RECORD_FORMATS = ("ndjson", "csv")
+
+
+class LineTooLong(ValueError):
+    """Raised when a line exceeds the configured maximum size"""
+
+
+class RecordError(ValueError):
+    """A record that could not be parsed; returned in place of the record, not raised"""
+
+
+Record = Union[Dict[str, Any], RecordError]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[List[str]]:
+    """
+    Split a byte stream into lines.
+
+    Args:
+        chunks: Body chunks, e.g. ``request.stream()``
+        max_line_bytes: Largest line accepted
+
+    Yields:
+        List[str]: Complete, decoded lines of each chunk without line endings
+
+    Raises:
+        LineTooLong: If a line grows beyond max_line_bytes
+    """
+    pending = b""
+    async for chunk in chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        if len(pending) > max_line_bytes:
+            raise LineTooLong(f"Line longer than {max_line_bytes} bytes")
+        if lines:
+            yield [line.decode("utf-8", errors="replace").rstrip("\r") for line in lines]
+    if pending.strip():
+        yield [pending.decode("utf-8", errors="replace").rstrip("\r")]
+
+
+def _parse_json(line: str) -> Record:
+    try:
+        value = json.loads(line)
+    except ValueError as e:
+        return RecordError(f"Invalid JSON: {e}")
+    if not isinstance(value, dict):
+        return RecordError("Expected a JSON object")
+    return value
+
+
+async def iter_ndjson(lines: AsyncIterator[List[str]]) -> AsyncIterator[List[Record]]:
+    """Parse NDJSON lines into dicts, skipping blank lines"""
+    async for batch in lines:
+        records = [_parse_json(line) for line in batch if line.strip()]
+        if records:
+            yield records
+
+
+async def iter_csv(lines: AsyncIterator[List[str]]) -> AsyncIterator[List[Record]]:
+    """
+    Parse CSV lines into dicts keyed by the header row.
+
+    A quoted field may contain line breaks, so lines are joined until the
+    number of quote characters is even; escaped quotes are doubled and keep
+    the count even.
+    """
+    header = None
+    pending: List[str] = []
+    async for batch in lines:
+        complete = []
+        for line in batch:
+            pending.append(line)
+            record = "\n".join(pending)
+            if record.count('"') % 2 == 0:
+                pending = []
+                if record.strip():
+                    complete.append(record)
+        rows = list(csv.reader(complete))
+        if header is None and rows:
+            header = rows.pop(0)
+        records: List[Record] = [
+            dict(zip(header, row)) if len(row) == len(header)
+            else RecordError(f"Expected {len(header)} columns, got {len(row)}")
+            for row in rows
+        ]
+        if records:
+            yield records
+    if pending:
+        yield [RecordError("Unterminated quoted field")]
+
+
+def iter_records(chunks: AsyncIterator[bytes], format: str, max_line_bytes: int) -> AsyncIterator[List[Record]]:
+    """
+    Parse an NDJSON or CSV byte stream into records.
+
+    Args:
+        chunks: Body chunks, e.g. ``request.stream()``
+        format: ``ndjson`` or ``csv``
+        max_line_bytes: Largest line accepted
+
+    Returns:
+        AsyncIterator[List[Record]]: Dicts, or RecordError for rows that
+        could not be parsed, in input order
+    """
+    lines = iter_lines(chunks, max_line_bytes)
+    return iter_csv(lines) if format == "csv" else iter_ndjson(lines)
@@ -0,0 +1,285 @@
+"""
+Lightweight in-process request tracing.
+
+PrometheusMiddleware starts a Trace for every HTTP request in a context
+variable. Code on the request path records spans into it with ``span()``,
+``traced()`` or, for SQL, the engine hook installed by install_tracing().
+Phase totals become the ``Server-Timing`` header and the per-phase latency
+histograms; a sampled share of requests (TRACE_SAMPLE_RATE) is also
+appended to TRACE_EXPORT_FILE as OTLP/JSON, one ExportTraceServiceRequest
+per line, the format of the OpenTelemetry collector's file exporter, so no
+collector has to run to look at a trace.
+"""
+import functools
+import inspect
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.backend.core.config import get_settings
+
+settings = get_settings()
+
+# OTLP SpanKind values
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+
+class Span:
+    """One timed operation; times are time.perf_counter() readings"""
+
+    __slots__ = ("name", "kind", "span_id", "parent", "start", "end", "attributes", "error")
+
+    def __init__(self, name: str, kind: int, span_id: Optional[str], parent: Optional["Span"],
+                 start: float, attributes: Dict[str, Any]):
+        self.name = name
+        self.kind = kind
+        self.span_id = span_id
+        self.parent = parent
+        self.start = start
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.error = False
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class Trace:
+    """
+    Spans recorded while serving one request.
+
+    Span ids are only generated for sampled traces, the only ones exported.
+
+    Args:
+        name: Name of the root span, e.g. ``GET /api/v1/items``
+        sampled: Whether the trace is exported when it ends
+    """
+
+    def __init__(self, name: str, sampled: bool = False):
+        self.sampled = sampled
+        self.trace_id = os.urandom(16).hex() if sampled else None
+        self.start_ns = time.time_ns()
+        self.root = Span(name, SPAN_KIND_SERVER, self._new_id(), None, time.perf_counter(), {})
+        self.spans: List[Span] = []
+
+    def _new_id(self) -> Optional[str]:
+        return os.urandom(8).hex() if self.sampled else None
+
+    def add(self, name: str, start: float, kind: int = SPAN_KIND_INTERNAL,
+            attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """Record a span starting at ``start`` under the current span"""
+        parent = current_span.get() or self.root
+        span = Span(name, kind, self._new_id(), parent, start, attributes or {})
+        self.spans.append(span)
+        return span
+
+    def phases(self) -> Dict[str, float]:
+        """
+        Seconds spent per phase so far.
+
+        Returns:
+            Dict[str, float]: Summed span durations by name, ``other`` for
+            the time covered by no top-level span and ``total`` for the
+            whole request
+        """
+        phases: Dict[str, float] = {}
+        attributed = 0.0
+        for span in self.spans:
+            phases[span.name] = phases.get(span.name, 0.0) + span.duration
+            if span.parent is self.root:
+                attributed += span.duration
+        total = self.root.duration
+        phases["other"] = max(total - attributed, 0.0)
+        phases["total"] = total
+        return phases
+
+    def _unix_nano(self, perf: float) -> str:
+        return str(self.start_ns + int((perf - self.root.start) * 1e9))
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """The finished trace as an OTLP/JSON ExportTraceServiceRequest"""
+        return {"resourceSpans": [{
+            "resource": {"attributes": _attributes({"service.name": settings.TRACE_SERVICE_NAME})},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [self._otlp_span(span) for span in (self.root, *self.spans)],
+            }],
+        }]}
+
+    def _otlp_span(self, span: Span) -> Dict[str, Any]:
+        otlp = {
+            "traceId": self.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": self._unix_nano(span.start),
+            "endTimeUnixNano": self._unix_nano(span.end if span.end is not None else span.start),
+            "attributes": _attributes(span.attributes),
+            # STATUS_CODE_ERROR or STATUS_CODE_UNSET
+            "status": {"code": 2 if span.error else 0},
+        }
+        if span.parent is not None:
+            otlp["parentSpanId"] = span.parent.span_id
+        return otlp
+
+
+def _attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    attributes = []
+    for key, value in values.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        attributes.append({"key": key, "value": typed})
+    return attributes
+
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def start_trace(name: str) -> Optional[Trace]:
+    """
+    Create the trace of a new request, sampled at TRACE_SAMPLE_RATE.
+
+    Returns:
+        Optional[Trace]: None when TRACING_ENABLED is off
+    """
+    if not settings.TRACING_ENABLED:
+        return None
+    return Trace(name, sampled=random.random() < settings.TRACE_SAMPLE_RATE)
+
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time the enclosed block as a span of the current request.
+
+    A no-op outside a traced request. Spans opened inside become its
+    children.
+
+    Args:
+        name: Phase name, e.g. ``auth`` or ``serialize``
+        kind: OTLP span kind
+        attributes: Extra attributes of the exported span
+    """
+    trace = current_trace.get()
+    if trace is None:
+        yield None
+        return
+    recorded = trace.add(name, time.perf_counter(), kind, attributes)
+    token = current_span.set(recorded)
+    try:
+        yield recorded
+    except BaseException:
+        recorded.error = True
+        raise
+    finally:
+        recorded.end = time.perf_counter()
+        current_span.reset(token)
+
+
+def traced(name: str, kind: int = SPAN_KIND_INTERNAL) -> Callable:
+    """
+    Decorator recording every call of a function, sync or async, as a span.
+
+    The signature is kept, so decorated functions still work as FastAPI
+    dependencies.
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def server_timing(phases: Dict[str, float]) -> str:
+    """
+    Server-Timing header value for the phases of a request.
+
+    ``sql`` is left out: QueryBudgetMiddleware already reports it as ``db``,
+    together with the number of statements.
+    """
+    return ", ".join(
+        f"{name};dur={seconds * 1000:.1f}" for name, seconds in phases.items() if name != "sql"
+    )
+
+
+class TraceExporter:
+    """
+    Appends sampled traces to a file as OTLP/JSON lines.
+
+    Args:
+        path: File the traces are appended to
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        line = json.dumps(trace.to_otlp(), separators=(",", ":"))
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
+        except OSError as e:
+            # Never fail the request because the trace could not be written
+            print(f"Failed to export trace: {e}")
+
+
+trace_exporter = TraceExporter(settings.TRACE_EXPORT_FILE)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = current_trace.get()
+    info = getattr(context, "_query_info", None)
+    if trace is None or info is None:
+        return
+    recorded = trace.add(
+        "sql",
+        context._query_start,
+        SPAN_KIND_CLIENT,
+        {"db.system": conn.dialect.name, "db.operation": info.operation, "db.sql.table": info.table},
+    )
+    recorded.end = context._query_start + context._query_duration
+
+
+def install_tracing(engine: Engine) -> None:
+    """
+    Record every statement of an engine as an ``sql`` span.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+    """
+    # Imported here: src.backend.monitoring imports the metrics of
+    # core.monitoring, which imports this module
+    from src.backend.monitoring.database import instrument_engine
+
+    # Start and duration come from the statement instrumentation
+    instrument_engine(engine)
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
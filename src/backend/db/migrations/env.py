@@ -0,0 +1,50 @@
+"""
+Alembic environment.
+
+Migrations run against Settings.DATABASE_URL and compare against the
+metadata of both model bases (items and users).
+"""
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from src.backend.core.config import get_settings
+from src.backend.models.item import Base as ItemBase
+from src.backend.models.primary.base import Base as PrimaryBase
+from src.backend.models.primary import user  # noqa: F401  registers the users table
+
+settings = get_settings()
+
+target_metadata = [ItemBase.metadata, PrimaryBase.metadata]
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting to the database"""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=settings.DATABASE_URL.startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations on a live connection"""
+    connectable = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite cannot ALTER most things in place; batch mode recreates tables
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
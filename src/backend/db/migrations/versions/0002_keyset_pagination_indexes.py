@@ -0,0 +1,36 @@
+"""Composite indexes for keyset pagination
+
+Revision ID: 0002_keyset_pagination_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-16 00:00:00
+
+Item listings page with owner_id = ? AND id > ? ORDER BY id, user listings
+with (created_at, id) > (?, ?) ORDER BY created_at, id. The composite
+(owner_id, id) index replaces the single-column owner_id index, which is
+its prefix.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_keyset_pagination_indexes"
+down_revision: Union[str, Sequence[str], None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all on application startup may have created them already
+    op.create_index("ix_items_owner_id_id", "items", ["owner_id", "id"], if_not_exists=True)
+    op.drop_index("ix_items_owner_id", table_name="items", if_exists=True)
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_created_at_id", table_name="users")
+    op.create_index("ix_items_owner_id", "items", ["owner_id"])
+    op.drop_index("ix_items_owner_id_id", table_name="items")
@@ -0,0 +1,78 @@
+"""Full-text search over items
+
+Revision ID: 0003_items_full_text_search
+Revises: 0002_keyset_pagination_indexes
+Create Date: 2026-10-16 00:00:00
+
+FTS5 external-content index over items.title and items.description, kept
+in sync by triggers, then rebuilt from the existing rows. items_fts_state
+lets bulk loads defer the insert trigger and index a batch at once. SQLite only; the
+search endpoint is not available on other databases.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_items_full_text_search"
+down_revision: Union[str, Sequence[str], None] = "0002_keyset_pagination_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ITEMS_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        title, description, content='items', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    # Bulk loads set deferred inside their transaction and index their rows
+    # with one INSERT ... SELECT, which is several times faster than a
+    # trigger call per row
+    """
+    CREATE TABLE IF NOT EXISTS items_fts_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1), deferred INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "INSERT OR IGNORE INTO items_fts_state (id, deferred) VALUES (1, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items
+    WHEN coalesce((SELECT deferred FROM items_fts_state), 0) = 0 BEGIN
+        INSERT INTO items_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts (items_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF title, description ON items BEGIN
+        INSERT INTO items_fts (items_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO items_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in ITEMS_FTS_DDL:
+        op.execute(statement)
+    # Index the rows written before the triggers existed
+    op.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for trigger in ("items_fts_insert", "items_fts_delete", "items_fts_update"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS items_fts")
+    op.execute("DROP TABLE IF EXISTS items_fts_state")
@@ -0,0 +1,37 @@
+"""Row version for item ETags
+
+Revision ID: 0004_items_version
+Revises: 0003_items_full_text_search
+Create Date: 2026-10-16 00:00:00
+
+items.version starts at 1 and is incremented by every UPDATE the item
+services run. Item ETags and If-Match checks are built on it, because
+updated_at is stored with one-second resolution on SQLite and two writes in
+the same second would share a tag.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_items_version"
+down_revision: Union[str, Sequence[str], None] = "0003_items_full_text_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all on application startup may have added it already
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("items")}
+    if "version" not in columns:
+        op.add_column("items", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Plain DROP COLUMN (SQLite 3.35+): a batch table rebuild would drop the
+    # full-text triggers on items
+    op.execute("ALTER TABLE items DROP COLUMN version")
@@ -0,0 +1,37 @@
+"""Shared generations for the item read cache
+
+Revision ID: 0005_item_cache_generations
+Revises: 0004_items_version
+Create Date: 2026-10-16 00:00:00
+
+item_cache_generations holds one counter per owner, bumped in the same
+transaction as every write to their items. Workers key cached item reads by
+it, so a write on one worker invalidates the cached reads of all of them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_item_cache_generations"
+down_revision: Union[str, Sequence[str], None] = "0004_items_version"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_all on application startup may have added it already
+    if not sa.inspect(op.get_bind()).has_table("item_cache_generations"):
+        op.create_table(
+            "item_cache_generations",
+            sa.Column("owner_id", sa.String(), primary_key=True),
+            sa.Column("generation", sa.Integer(), server_default="0", nullable=False),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("item_cache_generations")
@@ -0,0 +1,71 @@
+"""Never reuse item ids
+
+Revision ID: 0006_items_autoincrement
+Revises: 0005_item_cache_generations
+Create Date: 2026-10-16 00:00:00
+
+Item ETags are "<id>-<version>". Without AUTOINCREMENT SQLite hands the id
+of a deleted newest row to the next insert, which starts again at version
+1 and so shares the deleted item's tag. SQLite cannot add AUTOINCREMENT to
+an existing table, so items is rebuilt: rows keep their ids (and items_fts
+its rowids), and the indexes and full-text triggers are recreated from
+their stored definitions. Other databases never reuse serial ids.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_items_autoincrement"
+down_revision: Union[str, Sequence[str], None] = "0005_item_cache_generations"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, title, description, owner_id, created_at, updated_at, version"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    table_sql = bind.execute(
+        sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'items'")
+    ).scalar_one()
+    # create_all on application startup may have created it this way already
+    if "AUTOINCREMENT" in table_sql.upper():
+        return
+    # Dropping items drops its indexes and triggers, so keep their DDL
+    dependents = bind.execute(
+        sa.text(
+            "SELECT sql FROM sqlite_master "
+            "WHERE tbl_name = 'items' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+        )
+    ).scalars().all()
+
+    op.create_table(
+        "items_autoincrement",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("owner_id", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True,
+    )
+    # Inserting the existing ids also starts sqlite_sequence at the highest one
+    op.execute(f"INSERT INTO items_autoincrement ({COLUMNS}) SELECT {COLUMNS} FROM items")
+    op.execute("DROP TABLE items")
+    op.execute("ALTER TABLE items_autoincrement RENAME TO items")
+    for statement in dependents:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Ids that are never reused are still valid ids; nothing to undo
+    pass
@@ -0,0 +1,160 @@
+"""
+Connection pool sizing and telemetry.
+
+Engines are built with Settings-driven pool options and a QueuePool that
+times its checkouts, so pool exhaustion shows up in Prometheus next to
+DB_QUERY_*: connections checked out, overflow in use, checkout wait time,
+checkout timeouts and connection churn (connects, invalidations, closes).
+Only public pool API is used: the pool events, and Pool.connect(), which
+is where every engine checks a connection out.
+"""
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.backend.core.config import get_settings
+from src.backend.core.monitoring import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CONNECTION_EVENTS,
+    DB_POOL_OVERFLOW,
+)
+
+settings = get_settings()
+
+
+class _TimedCheckoutMixin:
+    """
+    Time each checkout, from the call to connect() until a connection is
+    handed out, and count checkouts that give up after pool_timeout.
+    """
+
+    metrics_name = "default"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(pool=self.metrics_name).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(pool=self.metrics_name).observe(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep its metric label
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool recording checkout wait time"""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording checkout wait time"""
+
+
+def is_sqlite_file(database_url: str) -> bool:
+    """Whether the URL points at an on-disk SQLite database"""
+    url = make_url(database_url)
+    return (
+        url.get_backend_name() == "sqlite"
+        and url.database not in (None, "", ":memory:")
+        and url.query.get("mode") != "memory"
+    )
+
+
+def uses_queue_pool(database_url: str) -> bool:
+    """Whether SQLAlchemy gives this URL a sized QueuePool"""
+    # In-memory SQLite uses a singleton/static pool that cannot be sized
+    return make_url(database_url).get_backend_name() != "sqlite" or is_sqlite_file(database_url)
+
+
+def get_pool_options(
+    database_url: str,
+    is_async: bool = False,
+    pool_size: int = None,
+    max_overflow: int = None,
+) -> Dict[str, Any]:
+    """
+    Build create_engine pool arguments from settings.
+
+    Args:
+        database_url: Engine URL
+        is_async: Whether the engine is created with create_async_engine
+        pool_size: Override for DB_POOL_SIZE
+        max_overflow: Override for DB_MAX_OVERFLOW
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for create_engine/create_async_engine
+    """
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if uses_queue_pool(database_url):
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE if pool_size is None else pool_size,
+            max_overflow=settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    """
+    Label an engine's pool for metrics, track its checked-out connections
+    and count connection churn.
+
+    The listeners stay with the pools engine.dispose() creates.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+        name: Metric label for the pool
+    """
+    engine.pool.metrics_name = name
+    lock = threading.Lock()
+    checked_out = 0
+
+    def _track(change: int) -> None:
+        nonlocal checked_out
+        with lock:
+            checked_out += change
+            current = checked_out
+        DB_POOL_CHECKED_OUT.labels(pool=name).set(current)
+        # Connections beyond pool_size are the overflow ones
+        if isinstance(engine.pool, QueuePool):
+            DB_POOL_OVERFLOW.labels(pool=name).set(max(0, current - engine.pool.size()))
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        _track(1)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        _track(-1)
+
+    @event.listens_for(engine, "detach")
+    def _on_detach(dbapi_connection, connection_record):
+        # A detached connection is no longer the pool's and is never checked in
+        _track(-1)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTION_EVENTS.labels(pool=name, event="connect").inc()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_CONNECTION_EVENTS.labels(pool=name, event="invalidate").inc()
+
+    @event.listens_for(engine, "close")
+    def _on_close(dbapi_connection, connection_record):
+        DB_POOL_CONNECTION_EVENTS.labels(pool=name, event="close").inc()
@@ -0,0 +1,176 @@
+"""
+Read-replica routing for database sessions.
+
+RoutingSession sends plain SELECTs to a round-robin pool of replica engines
+and everything else (flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE,
+raw SQL) to the primary. Once a session has written, or has been pinned
+with use_primary(), all of its reads stay on the primary so callers always
+read their own writes.
+"""
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import Column, Float, Integer, MetaData, Table, event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
+
+from src.backend.core.monitoring import DB_REPLICA_LAG, DB_REPLICA_QUERY_LATENCY
+
+# Session.info key pinning a session to the primary
+USE_PRIMARY = "use_primary"
+# Session.info key holding the replica a session reads from
+REPLICA = "replica"
+
+# Single-row table the primary keeps updating; replicas lag by however old
+# their copy of the row is
+replication_heartbeat = Table(
+    "replication_heartbeat",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("written_at", Float, nullable=False),
+)
+
+
+class ReplicaPool:
+    """
+    Thread-safe round-robin pool of named replica engines.
+
+    Args:
+        engines: Replica engines by name
+        lagging: Whether the engines can trail the primary; False for
+            read-only connections to the primary's own database
+    """
+
+    def __init__(self, engines: Dict[str, Engine], lagging: bool = True):
+        self.engines = engines
+        self.lagging = lagging
+        self._names = itertools.cycle(list(engines))
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def next(self) -> Engine:
+        with self._lock:
+            return self.engines[next(self._names)]
+
+
+class RoutingSession(Session):
+    """
+    Session routing reads to replicas and writes to the primary.
+
+    Args:
+        primary: Engine receiving writes and read-your-writes reads
+        replicas: Pool of replica engines; reads use the primary when empty
+    """
+
+    def __init__(self, *args, primary: Engine, replicas: Optional[ReplicaPool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._is_write(clause):
+            # Every later read in this session must see the write
+            self.info[USE_PRIMARY] = True
+            return self.primary
+        if not self.replicas or self.info.get(USE_PRIMARY):
+            return self.primary
+        # Stick to one replica per session for a consistent snapshot
+        if REPLICA not in self.info:
+            self.info[REPLICA] = self.replicas.next()
+        return self.info[REPLICA]
+
+    def _is_write(self, clause) -> bool:
+        if self._flushing or isinstance(clause, UpdateBase):
+            return True
+        if isinstance(clause, Select):
+            return clause._for_update_arg is not None
+        # Raw SQL and anything else we cannot classify
+        return clause is not None
+
+
+def use_primary(session) -> None:
+    """
+    Pin a session (sync or async) to the primary for all its statements.
+
+    Args:
+        session: Session or AsyncSession
+    """
+    session.info[USE_PRIMARY] = True
+
+
+def reads_from_replica(session) -> bool:
+    """
+    Whether a session (sync or async) reads from replicas that can trail
+    the primary, so what it reads may miss recent writes.
+
+    Args:
+        session: Session or AsyncSession
+    """
+    session = getattr(session, "sync_session", session)
+    replicas = getattr(session, "replicas", None)
+    return bool(replicas) and replicas.lagging and not session.info.get(USE_PRIMARY)
+
+
+def instrument_replica(name: str, engine: Engine) -> None:
+    """Record per-replica statement latency"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._replica_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._replica_query_start
+        DB_REPLICA_QUERY_LATENCY.labels(replica=name).observe(elapsed)
+
+
+def write_heartbeat(primary: Engine) -> None:
+    """Upsert the heartbeat row on the primary"""
+    replication_heartbeat.create(primary, checkfirst=True)
+    with primary.begin() as connection:
+        updated = connection.execute(
+            replication_heartbeat.update()
+            .where(replication_heartbeat.c.id == 1)
+            .values(written_at=time.time())
+        )
+        if updated.rowcount == 0:
+            connection.execute(
+                replication_heartbeat.insert().values(id=1, written_at=time.time())
+            )
+
+
+def measure_replica_lag(replicas: ReplicaPool) -> Dict[str, Optional[float]]:
+    """
+    Read each replica's copy of the heartbeat and export its age as lag.
+
+    Returns:
+        Dict[str, Optional[float]]: Lag in seconds per replica, None when the
+        replica is unreachable or has not received a heartbeat yet
+    """
+    lags: Dict[str, Optional[float]] = {}
+    for name, engine in replicas.engines.items():
+        try:
+            with engine.connect() as connection:
+                written_at = connection.execute(
+                    select(replication_heartbeat.c.written_at)
+                    .where(replication_heartbeat.c.id == 1)
+                ).scalar()
+        except Exception as e:
+            print(f"Failed to read heartbeat from {name}: {e}")
+            written_at = None
+        if written_at is None:
+            lags[name] = None
+            continue
+        lags[name] = max(0.0, time.time() - written_at)
+        DB_REPLICA_LAG.labels(replica=name).set(lags[name])
+    return lags
+
+
+def replica_names(urls: Sequence[str]) -> List[str]:
+    """Stable metric labels for the configured replica URLs"""
+    return [f"replica{index}" for index in range(len(urls))]
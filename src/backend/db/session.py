@@ -1,36 +1,303 @@
 """
 Database session setup for SQLite.
 """
-from sqlalchemy import create_engine
+import asyncio
+from typing import List, Tuple
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from src.backend.core.config import get_settings
+from src.backend.core.tracing import install_tracing, span
+from src.backend.db.pool import get_pool_options, instrument_pool, is_sqlite_file
+from src.backend.monitoring.database import instrument_engine
+from src.backend.monitoring.query_budget import install_query_budget
+from src.backend.monitoring.slow_queries import slow_query_log
+from src.backend.db.replicas import (
+    ReplicaPool,
+    RoutingSession,
+    instrument_replica,
+    measure_replica_lag,
+    replica_names,
+    use_primary,
+    write_heartbeat,
+)
 
 settings = get_settings()
 
+# Requests with these methods may read from the replicas
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def get_read_only_url(database_url: str) -> str:
+    """
+    Build a read-only URI connection URL for an on-disk SQLite database.
+
+    Args:
+        database_url: SQLite URL from settings
+
+    Returns:
+        str: URL opening the same file with ``mode=ro``
+    """
+    url = make_url(database_url)
+    return url.set(
+        database=f"file:{url.database}",
+        query={**url.query, "mode": "ro", "uri": "true"},
+    ).render_as_string(hide_password=False)
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Map a DATABASE_URL onto the matching asyncio driver.
+
+    Args:
+        database_url: Sync SQLAlchemy URL from settings
+
+    Returns:
+        str: URL using aiosqlite for SQLite or asyncpg for PostgreSQL
+    """
+    if database_url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + database_url[len("sqlite:"):]
+    for prefix in ("postgresql://", "postgres://", "postgresql+psycopg2://"):
+        if database_url.startswith(prefix):
+            return "postgresql+asyncpg://" + database_url[len(prefix):]
+    return database_url
+
+
+def configure_sqlite_connection(dbapi_connection, read_only: bool = False) -> None:
+    """
+    Apply the SQLite performance pragmas to a new DBAPI connection.
+
+    WAL lets readers run alongside the single writer, and
+    ``synchronous=NORMAL`` only fsyncs at checkpoints, which is safe in WAL
+    mode. The journal mode is persistent, so read-only connections skip it.
+
+    Args:
+        dbapi_connection: Raw sqlite3 or aiosqlite connection
+        read_only: Whether the connection was opened with ``mode=ro``
+    """
+    cursor = dbapi_connection.cursor()
+    if not read_only:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}")
+    cursor.close()
+
+
+def enable_sqlite_profile(engine: Engine, read_only: bool = False) -> None:
+    """Register the pragma hook on every new connection of an engine"""
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        configure_sqlite_connection(dbapi_connection, read_only=read_only)
+
+
+# SQLite performance profile: WAL, tuned pragmas, one writer connection and
+# a separate pool of read-only connections
+sqlite_profile = settings.SQLITE_PERFORMANCE_MODE and is_sqlite_file(settings.DATABASE_URL)
+
+# For SQLite, we need to enable same thread checking
+connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+
+# A single writer connection serialises writes inside the worker instead of
+# surfacing "database is locked"; busy_timeout covers the other workers.
+# Otherwise the pool is sized from the DB_POOL_* settings
+writer_pool_options = {"pool_size": 1, "max_overflow": 0} if sqlite_profile else {}
+
 # Create database engine for SQLite
 engine = create_engine(
     settings.DATABASE_URL,
-    # For SQLite, we need to enable same thread checking
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
-    # These settings can be adjusted based on your requirements
-    pool_pre_ping=True,
-    pool_recycle=300,
+    connect_args=connect_args,
     echo=settings.DEBUG,
+    **get_pool_options(settings.DATABASE_URL, **writer_pool_options),
 )
 
-# Create sessionmaker for database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create async database engine from the same DATABASE_URL
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    **get_pool_options(settings.DATABASE_URL, is_async=True, **writer_pool_options),
+)
+instrument_pool(engine, "primary")
+instrument_engine(engine)
+slow_query_log.install(engine)
+install_query_budget(engine)
+install_tracing(engine)
+instrument_pool(async_engine.sync_engine, "primary_async")
+instrument_engine(async_engine.sync_engine)
+slow_query_log.install(async_engine.sync_engine)
+install_query_budget(async_engine.sync_engine)
+install_tracing(async_engine.sync_engine)
+
+if sqlite_profile:
+    read_only_url = get_read_only_url(settings.DATABASE_URL)
+    read_pool_options = {"pool_size": settings.SQLITE_READ_POOL_SIZE, "max_overflow": 0}
+    read_engine = create_engine(
+        read_only_url,
+        connect_args=connect_args,
+        echo=settings.DEBUG,
+        **get_pool_options(read_only_url, **read_pool_options),
+    )
+    async_read_engine = create_async_engine(
+        get_async_database_url(read_only_url),
+        echo=settings.DEBUG,
+        **get_pool_options(read_only_url, is_async=True, **read_pool_options),
+    )
+    instrument_pool(read_engine, "read")
+    instrument_engine(read_engine)
+    slow_query_log.install(read_engine)
+    install_query_budget(read_engine)
+    install_tracing(read_engine)
+    instrument_pool(async_read_engine.sync_engine, "read_async")
+    instrument_engine(async_read_engine.sync_engine)
+    slow_query_log.install(async_read_engine.sync_engine)
+    install_query_budget(async_read_engine.sync_engine)
+    install_tracing(async_read_engine.sync_engine)
+    enable_sqlite_profile(engine)
+    enable_sqlite_profile(async_engine.sync_engine)
+    enable_sqlite_profile(read_engine, read_only=True)
+    enable_sqlite_profile(async_read_engine.sync_engine, read_only=True)
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+
+
+def parse_replica_urls(value: str) -> List[str]:
+    """Split the comma-separated DATABASE_REPLICA_URLS setting"""
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+def create_replica_engines(urls: List[str]) -> Tuple[ReplicaPool, ReplicaPool]:
+    """
+    Create sync and async engines for each read replica.
+
+    SQLite replica files are opened read-only. Every replica engine records
+    its statement latency under its own metric label.
+
+    Args:
+        urls: Replica database URLs
+
+    Returns:
+        Tuple[ReplicaPool, ReplicaPool]: Sync pool and async pool; the async
+        pool holds the ``sync_engine`` of each async engine, as sessions bind
+        to those
+    """
+    sync_engines, async_engines = {}, {}
+    for name, url in zip(replica_names(urls), urls):
+        replica_args = {}
+        if url.startswith("sqlite"):
+            replica_args = {"check_same_thread": False}
+            if is_sqlite_file(url):
+                url = get_read_only_url(url)
+        sync_engines[name] = create_engine(
+            url, connect_args=replica_args, echo=settings.DEBUG, **get_pool_options(url)
+        )
+        async_engines[name] = create_async_engine(
+            get_async_database_url(url), echo=settings.DEBUG, **get_pool_options(url, is_async=True)
+        ).sync_engine
+        instrument_replica(name, sync_engines[name])
+        instrument_replica(name, async_engines[name])
+        instrument_pool(sync_engines[name], name)
+        instrument_engine(sync_engines[name])
+        slow_query_log.install(sync_engines[name])
+        install_query_budget(sync_engines[name])
+        install_tracing(sync_engines[name])
+        instrument_pool(async_engines[name], f"{name}_async")
+        instrument_engine(async_engines[name])
+        slow_query_log.install(async_engines[name])
+        install_query_budget(async_engines[name])
+        install_tracing(async_engines[name])
+    return ReplicaPool(sync_engines), ReplicaPool(async_engines)
+
+
+# Reads go to the configured replicas, else to the SQLite read-only engine,
+# else to the primary
+replica_urls = parse_replica_urls(settings.DATABASE_REPLICA_URLS)
+if replica_urls:
+    replicas, async_replicas = create_replica_engines(replica_urls)
+elif sqlite_profile:
+    # The same database file, so these reads never trail the writer
+    replicas = ReplicaPool({"local": read_engine}, lagging=False)
+    async_replicas = ReplicaPool({"local": async_read_engine.sync_engine}, lagging=False)
+else:
+    replicas, async_replicas = ReplicaPool({}), ReplicaPool({})
+
+# Create sessionmaker for database sessions; SELECTs are routed to a replica,
+# everything else to the primary
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, primary=engine, replicas=replicas
+)
+
+# Objects stay usable after commit, since async attribute refreshes would
+# otherwise need an explicit await
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    primary=async_engine.sync_engine,
+    replicas=async_replicas,
+)
+
+
+def is_read_only_request(request: Request = None) -> bool:
+    """Whether a request can be served from the replicas"""
+    return request is not None and request.method in READ_ONLY_METHODS
+
+
+async def run_replica_heartbeat(interval: float = None) -> None:
+    """
+    Periodically write the replication heartbeat and export replica lag.
+    Runs until cancelled; started from the application lifespan when
+    replicas are configured.
+    """
+    interval = interval or settings.DATABASE_REPLICA_LAG_INTERVAL
+    while True:
+        try:
+            await asyncio.to_thread(write_heartbeat, engine)
+            await asyncio.to_thread(measure_replica_lag, replicas)
+        except Exception as e:
+            print(f"Replica heartbeat failed: {e}")
+        await asyncio.sleep(interval)
 
 # Create a session dependency
-def get_db():
+def get_db(request: Request = None):
     """
     Dependency for database sessions.
     Creates a new session for each request and closes it when done.
+    Read-only requests route their SELECTs to the replicas; any other
+    request is pinned to the primary so it reads what it is about to write.
+    """
+    # Spans only cover opening and closing, the request's own queries are sql spans
+    with span("session"):
+        db = SessionLocal()
+        if not is_read_only_request(request):
+            use_primary(db)
+    try:
+        yield db
+    finally:
+        with span("session"):
+            db.close()
+
+# Create an async session dependency
+async def get_async_db(request: Request = None):
+    """
+    Dependency for async database sessions.
+    Queries are awaited, so they never block the event loop. Routed to the
+    replicas or the primary like get_db.
     """
-    db = SessionLocal()
+    with span("session"):
+        db = AsyncSessionLocal()
+        if not is_read_only_request(request):
+            use_primary(db)
     try:
         yield db
     finally:
-        db.close()
+        with span("session"):
+            await db.close()
@@ -1,5 +1,6 @@
 import httpx
 from src.backend.core.resilience import api_resilience, default_circuit_breaker
+from src.backend.core.tracing import SPAN_KIND_CLIENT, span
 from src.backend.monitoring.external import track_external_request
 
 class ResilientApiClient:
@@ -15,7 +16,9 @@ class ResilientApiClient:
     @default_circuit_breaker
     @track_external_request(service="dynamic", method="get")
     async def get(self, path: str, params: dict = None):
-        response = await self.client.get(path, params=params)
+        # One span per attempt, retries show up as separate calls
+        with span("external", SPAN_KIND_CLIENT, **{"peer.service": self.service_name, "http.method": "GET"}):
+            response = await self.client.get(path, params=params)
         response.raise_for_status()
         return response.json()
     
@@ -23,7 +26,8 @@ class ResilientApiClient:
     @default_circuit_breaker
     @track_external_request(service="dynamic", method="post")
     async def post(self, path: str, json: dict = None):
-        response = await self.client.post(path, json=json)
+        with span("external", SPAN_KIND_CLIENT, **{"peer.service": self.service_name, "http.method": "POST"}):
+            response = await self.client.post(path, json=json)
         response.raise_for_status()
         return response.json()
     
@@ -0,0 +1,191 @@
+"""
+Async client for the Supabase Auth (GoTrue) REST API.
+
+One client, and therefore one httpx connection pool, is shared by the whole
+worker. It is created in the application lifespan so auth calls never block
+the event loop.
+"""
+import time
+from typing import Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from src.backend.core.config import get_settings
+from src.backend.core.tracing import SPAN_KIND_CLIENT, span
+from src.backend.monitoring.external import track_external_request
+
+settings = get_settings()
+
+
+class SupabaseAuthError(Exception):
+    """Raised when Supabase Auth rejects a request."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SupabaseAuthClient:
+    """Non-blocking Supabase Auth client backed by a shared connection pool"""
+
+    service_name = "supabase_auth"
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = f"{base_url.rstrip('/')}/auth/v1"
+        self.api_key = api_key
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"apikey": api_key},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            transport=transport,
+        )
+
+    async def _request(self, method: str, path: str, **kwargs) -> dict:
+        start_time = time.perf_counter()
+        status_code = 0
+        try:
+            with span("external", SPAN_KIND_CLIENT, **{"peer.service": self.service_name, "http.method": method}):
+                response = await self.client.request(method, path, **kwargs)
+            status_code = response.status_code
+        finally:
+            track_external_request(
+                self.service_name, time.perf_counter() - start_time, status_code
+            )
+        if response.is_error:
+            raise SupabaseAuthError(response.status_code, response.text)
+        return response.json() if response.content else {}
+
+    async def get_user(self, access_token: str) -> dict:
+        """
+        Fetch the user that owns an access token.
+
+        Args:
+            access_token: Supabase access token
+
+        Returns:
+            dict: GoTrue user object
+        """
+        return await self._request(
+            "GET", "/user", headers={"Authorization": f"Bearer {access_token}"}
+        )
+
+    def get_authorization_url(
+        self,
+        provider: str,
+        redirect_to: str,
+        code_challenge: str,
+        scopes: Optional[str] = None,
+    ) -> str:
+        """
+        Build the PKCE authorization URL for an OAuth provider.
+
+        No request is made; the browser follows this URL directly.
+
+        Args:
+            provider: OAuth provider name, e.g. "google"
+            redirect_to: URL Supabase redirects back to with the auth code
+            code_challenge: S256 PKCE code challenge
+            scopes: Optional space separated provider scopes
+
+        Returns:
+            str: Authorization URL
+        """
+        params = {
+            "provider": provider,
+            "redirect_to": redirect_to,
+            "code_challenge": code_challenge,
+            "code_challenge_method": "s256",
+        }
+        if scopes:
+            params["scopes"] = scopes
+        return f"{self.base_url}/authorize?{urlencode(params)}"
+
+    async def exchange_code_for_session(self, auth_code: str, code_verifier: str) -> dict:
+        """
+        Exchange a PKCE auth code for a session.
+
+        Args:
+            auth_code: Code received on the OAuth callback
+            code_verifier: Verifier matching the challenge sent at login
+
+        Returns:
+            dict: Session containing ``access_token`` and ``refresh_token``
+        """
+        return await self._request(
+            "POST",
+            "/token",
+            params={"grant_type": "pkce"},
+            json={"auth_code": auth_code, "code_verifier": code_verifier},
+        )
+
+    async def sign_out(self, access_token: str) -> None:
+        """
+        Sign the user out, revoking their refresh tokens in Supabase.
+
+        Args:
+            access_token: Supabase access token of the session to end
+        """
+        await self._request(
+            "POST", "/logout", headers={"Authorization": f"Bearer {access_token}"}
+        )
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+_auth_client: Optional[SupabaseAuthClient] = None
+
+
+def create_auth_client(**kwargs) -> SupabaseAuthClient:
+    """Create a client from settings; keyword arguments override defaults."""
+    options = {
+        "base_url": settings.SUPABASE_URL or "",
+        "api_key": settings.SUPABASE_KEY or "",
+        "timeout": settings.SUPABASE_AUTH_TIMEOUT,
+        "max_connections": settings.SUPABASE_AUTH_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.SUPABASE_AUTH_MAX_KEEPALIVE,
+    }
+    options.update(kwargs)
+    return SupabaseAuthClient(**options)
+
+
+async def init_auth_client() -> SupabaseAuthClient:
+    """Create the shared client; called from the application lifespan."""
+    global _auth_client
+    if _auth_client is None:
+        _auth_client = create_auth_client()
+    return _auth_client
+
+
+async def close_auth_client() -> None:
+    """Close the shared client and its connection pool."""
+    global _auth_client
+    if _auth_client is not None:
+        await _auth_client.close()
+        _auth_client = None
+
+
+def get_auth_client() -> SupabaseAuthClient:
+    """
+    Return the shared client, creating it lazily outside the app lifespan.
+
+    Returns:
+        SupabaseAuthClient: Shared Supabase Auth client
+    """
+    global _auth_client
+    if _auth_client is None:
+        _auth_client = create_auth_client()
+    return _auth_client
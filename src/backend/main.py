@@ -1,16 +1,24 @@
 """
 Main application entry point.
 """
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.backend.api.v1.router import router as router_v1
 from src.backend.monitoring import start_metrics_server
+from src.backend.core.auth import prefetch_jwks
 from src.backend.core.config import get_settings
 from src.backend.core.monitoring import PrometheusMiddleware, APP_INFO
+from src.backend.core.request_context import RequestContextMiddleware
+from src.backend.monitoring.query_budget import QueryBudgetMiddleware
+from src.backend.core.security import get_password_hasher
+from src.backend.external.supabase_auth import init_auth_client, close_auth_client
 
 # Import models to create tables
 from src.backend.models.item import Base
-from src.backend.db.session import engine
+from src.backend.db.session import engine, replica_urls, run_replica_heartbeat
 
 # Get settings
 settings = get_settings()
@@ -18,11 +26,30 @@ settings = get_settings()
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients on startup and release them on shutdown"""
+    # Start metrics server on separate port
+    start_metrics_server()
+    # Shared async Supabase Auth client and connection pool
+    await init_auth_client()
+    # Fetch signing keys before the first asymmetric token needs them
+    await asyncio.to_thread(prefetch_jwks)
+    # Replication heartbeat and lag metrics for the read replicas
+    heartbeat = asyncio.create_task(run_replica_heartbeat()) if replica_urls else None
+    yield
+    if heartbeat is not None:
+        heartbeat.cancel()
+    await close_auth_client()
+    # Stop bcrypt worker processes
+    get_password_hasher().shutdown()
+
 # Initialize FastAPI application
 app = FastAPI(
     title="FastAPI Backend",
     description="Production-grade FastAPI backend with standardized structure",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS with settings from environment
@@ -34,7 +61,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add Prometheus middleware
+# Count each request's queries against its budget (X-DB-Queries header)
+app.add_middleware(QueryBudgetMiddleware)
+
+# Expose the current request to database hooks (slow-query log, query budget)
+app.add_middleware(RequestContextMiddleware)
+
+# Add Prometheus middleware. Added last so it is the outermost layer, and
+# the request's trace covers every other middleware
 app.add_middleware(PrometheusMiddleware)
 
 # Set application info for Prometheus
@@ -52,11 +86,6 @@ async def health_check():
     """Health check endpoint for load balancers and monitoring"""
     return {"status": "healthy"}
 
-# Start metrics server on separate port
-@app.on_event("startup")
-def startup_event():
-    start_metrics_server()
-
 @app.get("/")
 async def root():
     return {"message": "Welcome to FastAPI Backend"}
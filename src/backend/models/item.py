@@ -1,19 +1,101 @@
 """
 Item model for the example CRUD operations.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import DDL, Column, Index, Integer, String, Text, event
 from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
 
+from src.backend.models.types import Timestamp
+
 Base = declarative_base()
 
 class Item(Base):
     """Item model stored in SQLite"""
     __tablename__ = "items"
+    __table_args__ = (
+        # Keyset pagination of an owner's items: owner_id = ? AND id > ? ORDER BY id
+        Index("ix_items_owner_id_id", "owner_id", "id"),
+        # Ids are never reused, so an item recreated after a delete cannot
+        # share the ETag ("<id>-<version>") of the deleted one
+        {"sqlite_autoincrement": True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
-    owner_id = Column(String, index=True, nullable=False)  # Stores Supabase user ID
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    owner_id = Column(String, nullable=False)  # Stores Supabase user ID
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
+    # Bumped by every UPDATE; ETags use it since updated_at only has
+    # one-second resolution on SQLite
+    version = Column(Integer, nullable=False, server_default="1")
+
+
+class ItemCacheGeneration(Base):
+    """
+    Generation of an owner's cached item reads, shared by every worker.
+
+    Bumped in the transaction of each write to the owner's items; cached
+    reads are keyed by it, so a write on one worker invalidates the
+    owner's entries on all of them.
+    """
+    __tablename__ = "item_cache_generations"
+
+    owner_id = Column(String, primary_key=True)
+    generation = Column(Integer, nullable=False, server_default="0")
+
+
+# Full-text index over title and description (SQLite FTS5). It is an
+# external-content table: it stores only the index and reads the text back
+# from items, and the triggers keep it in step with every write, including
+# bulk and raw SQL ones. Existing databases get it from migration 0003.
+ITEMS_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        title, description, content='items', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    # Bulk loads set deferred inside their transaction and index their rows
+    # with one INSERT ... SELECT, which is several times faster than a
+    # trigger call per row
+    """
+    CREATE TABLE IF NOT EXISTS items_fts_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1), deferred INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "INSERT OR IGNORE INTO items_fts_state (id, deferred) VALUES (1, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items
+    WHEN coalesce((SELECT deferred FROM items_fts_state), 0) = 0 BEGIN
+        INSERT INTO items_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts (items_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF title, description ON items BEGIN
+        INSERT INTO items_fts (items_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO items_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+# Used by bulk loads while items_fts_state.deferred is set
+ITEMS_FTS_DEFER = "UPDATE items_fts_state SET deferred = :deferred"
+ITEMS_FTS_INDEX_AFTER = (
+    "INSERT INTO items_fts (rowid, title, description) "
+    "SELECT id, title, description FROM items WHERE id > :after_id"
+)
+
+for statement in ITEMS_FTS_DDL:
+    event.listen(Item.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for table_name in ("items_fts", "items_fts_state"):
+    event.listen(
+        Item.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {table_name}").execute_if(dialect="sqlite")
+    )
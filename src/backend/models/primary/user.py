@@ -1,8 +1,12 @@
-from sqlalchemy import Boolean, Column, Integer, String
+from sqlalchemy import Boolean, Column, Index, Integer, String
 from src.backend.models.primary.base import BaseModel
 
 class User(BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination of user listings in (created_at, id) order
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -0,0 +1,15 @@
+"""
+Column types shared by the models.
+"""
+from sqlalchemy import DateTime
+from sqlalchemy.dialects import sqlite
+
+# SQLite's CURRENT_TIMESTAMP server default stores "YYYY-MM-DD HH:MM:SS".
+# Bound datetimes use the same format, so comparisons against stored values
+# (keyset pagination cursors) line up instead of differing by ".000000"
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
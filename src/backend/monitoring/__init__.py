@@ -1,9 +1,11 @@
 from .metrics import start_metrics_server
-from .database import track_database_query
+from .database import describe_statement, instrument_engine, track_database_query
 from .external import track_external_request
 
 __all__ = [
     'start_metrics_server',
     'track_database_query',
+    'instrument_engine',
+    'describe_statement',
     'track_external_request'
 ]
\ No newline at end of file
@@ -1,7 +1,13 @@
+import re
 import time
-from functools import wraps
+from functools import lru_cache, wraps
+from typing import NamedTuple
+
 from prometheus_client import Counter, Histogram
-from src.backend.core.monitoring import DB_QUERY_COUNT, DB_QUERY_LATENCY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.backend.core.monitoring import DB_QUERY_COUNT, DB_QUERY_LATENCY, DB_QUERY_ROWS
 
 def track_database_query(operation: str, table: str):
     """Decorator to track database query metrics."""
@@ -18,7 +24,7 @@ def track_database_query(operation: str, table: str):
                     operation=operation,
                     table=table
                 ).observe(time.time() - start_time)
-                
+
                 # Count query
                 DB_QUERY_COUNT.labels(
                     operation=operation,
@@ -26,3 +32,168 @@ def track_database_query(operation: str, table: str):
                 ).inc()
         return wrapper
     return decorator
+
+
+# Statement normalisation for fingerprints
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+_IDENTIFIER = r"([\w.\"`\[\]]+)"
+_TABLE_PATTERNS = {
+    "insert": re.compile(rf"^INSERT\s+(?:OR\s+\w+\s+)?INTO\s+{_IDENTIFIER}", re.I),
+    "update": re.compile(rf"^UPDATE\s+(?:OR\s+\w+\s+)?{_IDENTIFIER}", re.I),
+    "delete": re.compile(rf"^DELETE\s+FROM\s+{_IDENTIFIER}", re.I),
+    "select": re.compile(rf"\bFROM\s+{_IDENTIFIER}", re.I),
+}
+_CTE_OPERATION = re.compile(r"\)\s*(INSERT|UPDATE|DELETE|SELECT)\b", re.I)
+_OTHER_OPERATIONS = {
+    "pragma", "create", "drop", "alter", "begin", "commit", "rollback",
+    "savepoint", "release", "explain", "show", "set",
+}
+
+
+class StatementInfo(NamedTuple):
+    """Labels, fingerprint and bound metric children for one SQL string"""
+    operation: str
+    table: str
+    fingerprint: str
+    count: Counter
+    latency: Histogram
+    rows: Histogram
+
+
+def fingerprint_statement(statement: str) -> str:
+    """
+    Normalise a SQL statement into a template shared by all its executions.
+
+    Literals and placeholders become ``?``, IN lists and multi-row VALUES
+    collapse to a single ``(?)`` and whitespace is squeezed.
+
+    Args:
+        statement: SQL as sent to the DBAPI cursor
+
+    Returns:
+        str: Normalised statement
+    """
+    normalised = _COMMENTS.sub(" ", statement)
+    normalised = _STRINGS.sub("?", normalised)
+    normalised = _PLACEHOLDERS.sub("?", normalised)
+    normalised = _NUMBERS.sub("?", normalised)
+    normalised = _LISTS.sub("(?)", normalised)
+    normalised = _ROWS.sub("(?)", normalised)
+    return _WHITESPACE.sub(" ", normalised).strip()
+
+
+@lru_cache(maxsize=2048)
+def describe_statement(statement: str) -> StatementInfo:
+    """
+    Derive operation and table labels and a fingerprint for a statement.
+
+    SQLAlchemy emits the same SQL string for every execution of a query, so
+    the result is cached and the per-execution cost is a dict lookup.
+
+    Args:
+        statement: SQL as sent to the DBAPI cursor
+
+    Returns:
+        StatementInfo: Description with metric children bound to its labels
+    """
+    fingerprint = fingerprint_statement(statement)
+    verb = fingerprint.split(" ", 1)[0].lower() if fingerprint else ""
+    body = fingerprint
+    if verb == "with":
+        # The statement proper follows the common table expressions
+        match = _CTE_OPERATION.search(fingerprint)
+        verb = match.group(1).lower() if match else "select"
+        body = fingerprint[match.start(1):] if match else fingerprint
+
+    if verb in _TABLE_PATTERNS:
+        operation = verb
+        match = _TABLE_PATTERNS[verb].search(body)
+        table = match.group(1).strip("\"`[]").lower() if match else "none"
+    else:
+        operation = verb if verb in _OTHER_OPERATIONS else "other"
+        table = "none"
+
+    return StatementInfo(
+        operation=operation,
+        table=table,
+        fingerprint=fingerprint,
+        count=DB_QUERY_COUNT.labels(operation=operation, table=table),
+        latency=DB_QUERY_LATENCY.labels(operation=operation, table=table),
+        rows=DB_QUERY_ROWS.labels(operation=operation, table=table),
+    )
+
+
+class _RowCountingCursor:
+    """DBAPI cursor proxy counting fetched rows until the cursor is closed"""
+
+    __slots__ = ("_cursor", "_info", "_rows")
+
+    def __init__(self, cursor, info: StatementInfo):
+        self._cursor = cursor
+        self._info = info
+        self._rows = 0
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._rows += len(rows)
+        return rows
+
+    def close(self):
+        self._info.rows.observe(self._rows)
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    info = describe_statement(statement)
+    context._query_info = info
+    context._query_duration = elapsed
+    info.count.inc()
+    info.latency.observe(elapsed)
+    if cursor.description is None:
+        # DML without RETURNING reports affected rows straight away
+        info.rows.observe(max(cursor.rowcount, 0))
+    elif context.cursor is cursor:
+        # Result rows are only known once they have been fetched
+        context.cursor = _RowCountingCursor(cursor, info)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Record count, latency and rows of every statement run on an engine.
+
+    Labels come from describe_statement, so repositories, services and
+    routers are measured without decorators.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+    """
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,172 @@
+"""
+Per-request query budget and N+1 detection.
+
+QueryBudgetMiddleware starts a QueryStats for every HTTP request in a
+context variable; the engine hook installed by install_query_budget()
+counts each statement against it. A request that runs more statements than
+its budget (QUERY_BUDGET_DEFAULT, or the route's query_budget() dependency),
+or repeats one statement fingerprint QUERY_REPEAT_THRESHOLD times, is
+reported: printed by default, or, with QUERY_BUDGET_ENFORCE=raise, raised
+as QueryBudgetExceeded once the handler has finished, so statements and
+transactions are never interrupted half way. Every response carries
+``X-DB-Queries`` and a ``Server-Timing`` db entry.
+"""
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from src.backend.core.config import get_settings
+from src.backend.core.monitoring import DB_QUERY_BUDGET_VIOLATIONS
+from src.backend.core.request_context import get_current_route
+from src.backend.monitoring.database import instrument_engine
+
+settings = get_settings()
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised at the end of a request that broke its query budget, in raise mode"""
+
+
+class QueryStats:
+    """
+    Statements run while serving one request.
+
+    Args:
+        budget: Maximum number of statements, None for no limit
+        repeat_threshold: Executions of one fingerprint reported as N+1,
+            None to never report
+        enforce: ``raise``, ``log`` or ``off``
+    """
+
+    def __init__(self, budget: Optional[int], repeat_threshold: Optional[int], enforce: str):
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+        self.enforce = enforce
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter = Counter()
+        self.violations: List[str] = []
+
+    def record(self, fingerprint: str, duration: float) -> None:
+        """Count one statement and check the budget"""
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint] += 1
+        if self.budget is not None and self.count == self.budget + 1:
+            self._violate("budget", f"{self.count} queries exceed the budget of {self.budget}")
+        if self.repeat_threshold is not None and self.fingerprints[fingerprint] == self.repeat_threshold:
+            self._violate(
+                "repeated_statement",
+                f"statement repeated {self.repeat_threshold} times (possible N+1): {fingerprint}",
+            )
+
+    def _violate(self, kind: str, message: str) -> None:
+        if self.enforce == "off":
+            return
+        route = get_current_route() or "unknown route"
+        DB_QUERY_BUDGET_VIOLATIONS.labels(kind=kind).inc()
+        self.violations.append(f"{route}: {message}")
+        # Raising here would abort the statement's transaction; check() does
+        # it once the request is done
+        if self.enforce == "log":
+            print(f"Query budget warning for {route}: {message}")
+
+    def check(self) -> None:
+        """Raise QueryBudgetExceeded for the violations recorded so far, in raise mode"""
+        if self.enforce == "raise" and self.violations:
+            raise QueryBudgetExceeded("; ".join(self.violations))
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def get_enforcement() -> str:
+    """QUERY_BUDGET_ENFORCE, log unless raising was asked for"""
+    return (settings.QUERY_BUDGET_ENFORCE or "log").lower()
+
+
+def query_budget(limit: Optional[int], repeat_threshold: Optional[int] = None) -> Callable:
+    """
+    Route dependency overriding the default query budget.
+
+    Usage:
+        @router.get("/", dependencies=[Depends(query_budget(2))])
+
+    Args:
+        limit: Maximum number of statements the route may run. None turns
+            both checks off, for routes whose statement count grows with the
+            size of the upload; statements are still counted in the headers
+        repeat_threshold: Executions of one statement reported as N+1, for
+            routes that run a statement once per batch
+    """
+    async def set_query_budget() -> None:
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.budget = limit
+            if limit is None:
+                stats.repeat_threshold = None
+            elif repeat_threshold is not None:
+                stats.repeat_threshold = repeat_threshold
+    return set_query_budget
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    info = getattr(context, "_query_info", None)
+    if stats is not None and info is not None:
+        stats.record(info.fingerprint, context._query_duration)
+
+
+def install_query_budget(engine: Engine) -> None:
+    """
+    Count an engine's statements against the current request's budget.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+    """
+    # Fingerprints and durations come from the statement instrumentation
+    instrument_engine(engine)
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryBudgetMiddleware:
+    """Middleware giving each request a QueryStats and reporting it in headers."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(
+            budget=settings.QUERY_BUDGET_DEFAULT,
+            repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+            enforce=get_enforcement(),
+        )
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                # The handler is done: fail the request before its response starts
+                stats.check()
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Queries", str(stats.count))
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+            # Streamed bodies run statements after the response started
+            stats.check()
+        finally:
+            current_query_stats.reset(token)
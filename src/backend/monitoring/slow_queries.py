@@ -0,0 +1,185 @@
+"""
+Slow-query log with captured query plans.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are recorded with their
+fingerprint, bound-parameter shapes (types only, never values), duration,
+calling route and the database's plan for them. Entries go to a bounded
+in-memory ring buffer served by the admin API and, optionally, to a JSONL
+file. Plans containing a full-table scan are flagged.
+"""
+import json
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.backend.core.config import get_settings
+from src.backend.core.monitoring import DB_SLOW_QUERIES
+from src.backend.core.request_context import get_current_route
+from src.backend.monitoring.database import describe_statement, instrument_engine
+
+settings = get_settings()
+
+# Statements worth asking the database to plan
+EXPLAINABLE_OPERATIONS = {"select", "insert", "update", "delete"}
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """
+    Describe bound parameters by type so no values end up in the log.
+
+    Args:
+        parameters: Parameters as passed to the DBAPI cursor
+        executemany: Whether ``parameters`` is a sequence of parameter sets
+
+    Returns:
+        Any: Type names mirroring the parameter structure
+    """
+    if executemany:
+        batch = list(parameters)
+        return {"batch": len(batch), "row": parameter_shape(batch[0]) if batch else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def is_full_scan(dialect_name: str, plan: List[str]) -> bool:
+    """
+    Whether a plan reads a whole table.
+
+    SQLite reports ``SCAN <table>`` without ``USING ... INDEX`` for a full
+    table scan; PostgreSQL reports ``Seq Scan``.
+    """
+    if dialect_name == "sqlite":
+        return any(line.startswith("SCAN ") and " USING " not in line for line in plan)
+    return any("Seq Scan" in line for line in plan)
+
+
+def explain(connection, dialect_name: str, statement: str, parameters: Any) -> List[str]:
+    """
+    Ask the database for its plan of a statement.
+
+    Runs on a raw DBAPI cursor of the same connection, so it bypasses the
+    engine events and cannot itself be logged as a slow query.
+
+    Args:
+        connection: SQLAlchemy Connection that ran the statement
+        dialect_name: Dialect name, e.g. ``sqlite`` or ``postgresql``
+        statement: SQL as sent to the DBAPI cursor
+        parameters: Parameters of the execution
+
+    Returns:
+        List[str]: One line per plan node
+    """
+    prefix = "EXPLAIN QUERY PLAN " if dialect_name == "sqlite" else "EXPLAIN "
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    if dialect_name == "sqlite":
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [str(row[0]) for row in rows]
+
+
+class SlowQueryLog:
+    """
+    Bounded log of slow statements.
+
+    Args:
+        threshold_ms: Minimum duration of a recorded statement
+        maxsize: Number of entries kept in memory
+        path: Optional JSONL file every entry is appended to
+        capture_plan: Whether to run EXPLAIN for recorded statements
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        maxsize: int = 100,
+        path: Optional[str] = None,
+        capture_plan: bool = True,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.path = path
+        self.capture_plan = capture_plan
+        self._entries = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+
+    def install(self, engine: Engine) -> None:
+        """
+        Record slow statements of an engine.
+
+        Args:
+            engine: Sync engine, or the ``sync_engine`` of an async engine
+        """
+        # Durations come from the statement instrumentation, whose hook
+        # must run first
+        instrument_engine(engine)
+        if not event.contains(engine, "after_cursor_execute", self._after_cursor_execute):
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = getattr(context, "_query_duration", 0.0)
+        if duration < self.threshold:
+            return
+        try:
+            self.record(conn, statement, parameters, executemany, duration)
+        except Exception as e:
+            # Never fail the query because the log could not be written
+            print(f"Failed to record slow query: {e}")
+
+    def record(self, conn, statement: str, parameters: Any, executemany: bool, duration: float) -> Dict[str, Any]:
+        """Build, store and return the log entry for one slow execution"""
+        info = describe_statement(statement)
+        dialect_name = conn.dialect.name
+        plan: List[str] = []
+        if self.capture_plan and info.operation in EXPLAINABLE_OPERATIONS:
+            plan_parameters = parameters[0] if executemany else parameters
+            try:
+                plan = explain(conn, dialect_name, statement, plan_parameters)
+            except Exception as e:
+                plan = [f"plan unavailable: {e}"]
+
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 3),
+            "route": get_current_route(),
+            "operation": info.operation,
+            "table": info.table,
+            "fingerprint": info.fingerprint,
+            "parameters": parameter_shape(parameters, executemany),
+            "plan": plan,
+            "full_scan": is_full_scan(dialect_name, plan),
+        }
+        DB_SLOW_QUERIES.labels(operation=info.operation, table=info.table).inc()
+        with self._lock:
+            self._entries.append(entry)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as log_file:
+                    log_file.write(json.dumps(entry) + "\n")
+        return entry
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Recorded entries, newest first"""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    maxsize=settings.SLOW_QUERY_LOG_SIZE,
+    path=settings.SLOW_QUERY_LOG_FILE,
+    capture_plan=settings.SLOW_QUERY_CAPTURE_PLAN,
+)
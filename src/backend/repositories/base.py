@@ -1,16 +1,133 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import bindparam, event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from src.backend.core.config import get_settings
+from src.backend.core.pagination import keyset_page, page_results
 from src.backend.models.primary.base import BaseModel as DBBaseModel
 
+settings = get_settings()
+
 ModelType = TypeVar("ModelType", bound=DBBaseModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Session.info keys of the rows loaded through repositories, keyed by
+# (model, id), and of the get_by lookups mapped to those ids. Sessions are
+# request-scoped, so both are too. The identity map only holds weak
+# references, so the rows are kept here to make sure they are not read again.
+ROWS = "repository_rows"
+LOOKUPS = "repository_lookups"
+
+
+def _rows(session) -> Dict[Any, Any]:
+    return session.info.setdefault(ROWS, {})
+
+
+def _lookups(session) -> Dict[Any, Any]:
+    return session.info.setdefault(LOOKUPS, {})
+
+
+def _lookup_key(model: Any, filters: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (model, tuple(sorted(filters.items())))
+
+
+def _remember(session, model: Any, rows: Sequence[Any]) -> None:
+    remembered = _rows(session)
+    for row in rows:
+        remembered[(model, row.id)] = row
+
+
+@event.listens_for(Session, "after_flush")
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _forget(session, *args) -> None:
+    """
+    Drop the rows and lookups of a session once it writes or rolls back.
+
+    Listening on Session covers every write, including those made through
+    the session directly or by services that do not use repositories, and
+    AsyncSession, whose sync_session is a Session.
+    """
+    session.info.pop(ROWS, None)
+    session.info.pop(LOOKUPS, None)
+
+
+def _chunks(values: Sequence[Any]) -> Iterator[Sequence[Any]]:
+    """Split ids or rows into statements of at most BULK_CHUNK_SIZE"""
+    for start in range(0, len(values), settings.BULK_CHUNK_SIZE):
+        yield values[start:start + settings.BULK_CHUNK_SIZE]
+
+
+def _loaded(session, model: Any, ids: Sequence[Any]) -> Dict[Any, Any]:
+    """Rows of ``ids`` already loaded through a repository in this session"""
+    remembered = _rows(session)
+    found = {}
+    for id in ids:
+        obj = remembered.get((model, id))
+        if obj is not None:
+            found[id] = obj
+    return found
+
+
+def _in_order(ids: Sequence[Any], found: Dict[Any, Any]) -> Tuple[List[Any], List[Any]]:
+    """Found rows in the order of ``ids``, and the ids that were not found"""
+    return [found[id] for id in ids if id in found], [id for id in ids if id not in found]
+
+
+def _values(obj_in: Any, exclude_unset: bool = False) -> Dict[str, Any]:
+    if isinstance(obj_in, dict):
+        return obj_in
+    return obj_in.model_dump(exclude_unset=exclude_unset)
+
+
+def _bulk_insert(model: Any):
+    """
+    INSERT ... RETURNING sent as one multi-row statement per chunk.
+
+    Rows come back in the order of the parameters (sort_by_parameter_order).
+    """
+    return insert(model).returning(model, sort_by_parameter_order=True)
+
+
+def _bulk_updates(model: Any, changes: Mapping[Any, Any]) -> List[Tuple[Any, List[Dict[str, Any]]]]:
+    """
+    Batched UPDATE statements for a chunk of a bulk update.
+
+    Rows changing the same columns share one executemany statement.
+
+    Returns:
+        List of (statement, parameter sets) pairs
+    """
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for id, obj_in in changes.items():
+        values = _values(obj_in, exclude_unset=True)
+        if values:
+            groups.setdefault(tuple(sorted(values)), []).append({"row_id": id, **values})
+    table = model.__table__
+    return [
+        (
+            update(table)
+            .where(table.c.id == bindparam("row_id"))
+            .values({key: bindparam(key) for key in keys}),
+            parameters,
+        )
+        for keys, parameters in groups.items()
+    ]
+
+
+def _select_many(model: Any, ids: Sequence[Any]):
+    return select(model).where(model.id.in_(ids))
+
+
+def _existing_ids(model: Any, ids: Sequence[Any]):
+    return select(model.id).where(model.id.in_(ids))
+
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC):
     """
@@ -21,15 +138,82 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC
         self.db = db
     
     def get(self, id: Any) -> Optional[ModelType]:
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        obj = _rows(self.db).get((self.model, id))
+        if obj is None:
+            obj = self.db.get(self.model, id)
+            if obj is not None:
+                _remember(self.db, self.model, [obj])
+        return obj
     
     def get_by(self, **kwargs) -> Optional[ModelType]:
+        """
+        Get the first row matching ``kwargs``.
+
+        The row found is remembered until the session next writes, so
+        repeating the lookup in the same request does not query again.
+        """
+        key = _lookup_key(self.model, kwargs)
+        id = _lookups(self.db).get(key)
+        if id is not None:
+            return self.get(id)
         filters = [getattr(self.model, key) == value for key, value in kwargs.items()]
-        return self.db.query(self.model).filter(*filters).first()
+        obj = self.db.query(self.model).filter(*filters).first()
+        if obj is not None:
+            _remember(self.db, self.model, [obj])
+            _lookups(self.db)[key] = obj.id
+        return obj
+    
+    def get_many(self, ids: Sequence[Any]) -> Tuple[List[ModelType], List[Any]]:
+        """
+        Get many rows by id with chunked ``IN`` queries.
+
+        Args:
+            ids: Ids to look up; duplicates are looked up once
+
+        Returns:
+            Tuple[List[ModelType], List[Any]]: Rows found, in the order of
+            ``ids``, and the ids that do not exist
+        """
+        ids = list(dict.fromkeys(ids))
+        found = _loaded(self.db, self.model, ids)
+        for chunk in _chunks([id for id in ids if id not in found]):
+            rows = self.db.scalars(_select_many(self.model, chunk)).all()
+            _remember(self.db, self.model, rows)
+            found.update((obj.id, obj) for obj in rows)
+        return _in_order(ids, found)
+    
+    def exists_many(self, ids: Sequence[Any]) -> List[Tuple[Any, bool]]:
+        """
+        Check which ids exist, selecting only the id column.
+
+        Returns:
+            List[Tuple[Any, bool]]: Each distinct id in request order and
+            whether it exists
+        """
+        ids = list(dict.fromkeys(ids))
+        existing = set(_loaded(self.db, self.model, ids))
+        for chunk in _chunks([id for id in ids if id not in existing]):
+            existing.update(self.db.scalars(_existing_ids(self.model, chunk)))
+        return [(id, id in existing) for id in ids]
     
     def get_multi(self, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
         return self.db.query(self.model).offset(skip).limit(limit).all()
     
+    def get_page(self, *, limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Get one page in (created_at, id) order without OFFSET.
+
+        Args:
+            limit: Page size
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Tuple[List[ModelType], Optional[str]]: Rows and the next page's cursor
+        """
+        keys = (self.model.created_at, self.model.id)
+        rows = self.db.scalars(keyset_page(select(self.model), keys, limit, cursor)).all()
+        return page_results(rows, keys, limit)
+    
     def create(self, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
@@ -38,12 +222,30 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC
         self.db.refresh(db_obj)
         return db_obj
     
+    def bulk_create(self, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]) -> List[ModelType]:
+        """
+        Create many rows in one transaction, one INSERT ... RETURNING per chunk.
+
+        Args:
+            objs_in: Schemas or dicts of the new rows; every one must set the
+                same columns
+
+        Returns:
+            List[ModelType]: Created rows, in input order
+        """
+        created: List[ModelType] = []
+        for chunk in _chunks(objs_in):
+            rows = self.db.scalars(_bulk_insert(self.model), [_values(obj_in) for obj_in in chunk]).all()
+            created.extend(rows)
+        self.db.commit()
+        return created
+    
     def update(self, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> ModelType:
         obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
         for field in obj_data:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
@@ -52,8 +254,144 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC
         self.db.refresh(db_obj)
         return db_obj
     
+    def bulk_update(
+        self, changes: Mapping[Any, Union[UpdateSchemaType, Dict[str, Any]]]
+    ) -> Tuple[List[ModelType], List[Any]]:
+        """
+        Update many rows in one transaction.
+
+        Args:
+            changes: New values keyed by row id; schemas only change the
+                fields that were set
+
+        Returns:
+            Tuple[List[ModelType], List[Any]]: Updated rows in the order of
+            ``changes``, and the ids that do not exist
+        """
+        ids = list(changes)
+        found: Dict[Any, ModelType] = {}
+        for chunk in _chunks(ids):
+            for statement, parameters in _bulk_updates(self.model, {id: changes[id] for id in chunk}):
+                self.db.execute(statement, parameters)
+            # Reload rows the identity map may already hold with old values
+            statement = _select_many(self.model, chunk).execution_options(populate_existing=True)
+            found.update((obj.id, obj) for obj in self.db.scalars(statement))
+        self.db.commit()
+        return _in_order(ids, found)
+    
     def remove(self, *, id: int) -> ModelType:
         obj = self.db.query(self.model).get(id)
         self.db.delete(obj)
         self.db.commit()
         return obj
+
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC):
+    """
+    Abstract base repository with common data access methods for AsyncSession
+    """
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        self.model = model
+        self.db = db
+    
+    async def get(self, id: Any) -> Optional[ModelType]:
+        obj = _rows(self.db).get((self.model, id))
+        if obj is None:
+            obj = await self.db.get(self.model, id)
+            if obj is not None:
+                _remember(self.db, self.model, [obj])
+        return obj
+    
+    async def get_by(self, **kwargs) -> Optional[ModelType]:
+        """Async counterpart of BaseRepository.get_by"""
+        key = _lookup_key(self.model, kwargs)
+        id = _lookups(self.db).get(key)
+        if id is not None:
+            return await self.get(id)
+        filters = [getattr(self.model, key) == value for key, value in kwargs.items()]
+        result = await self.db.execute(select(self.model).where(*filters))
+        obj = result.scalars().first()
+        if obj is not None:
+            _remember(self.db, self.model, [obj])
+            _lookups(self.db)[key] = obj.id
+        return obj
+    
+    async def get_many(self, ids: Sequence[Any]) -> Tuple[List[ModelType], List[Any]]:
+        """Async counterpart of BaseRepository.get_many"""
+        ids = list(dict.fromkeys(ids))
+        found = _loaded(self.db, self.model, ids)
+        for chunk in _chunks([id for id in ids if id not in found]):
+            rows = (await self.db.scalars(_select_many(self.model, chunk))).all()
+            _remember(self.db, self.model, rows)
+            found.update((obj.id, obj) for obj in rows)
+        return _in_order(ids, found)
+    
+    async def exists_many(self, ids: Sequence[Any]) -> List[Tuple[Any, bool]]:
+        """Async counterpart of BaseRepository.exists_many"""
+        ids = list(dict.fromkeys(ids))
+        existing = set(_loaded(self.db, self.model, ids))
+        for chunk in _chunks([id for id in ids if id not in existing]):
+            existing.update(await self.db.scalars(_existing_ids(self.model, chunk)))
+        return [(id, id in existing) for id in ids]
+    
+    async def get_multi(self, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        result = await self.db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    async def get_page(self, *, limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[ModelType], Optional[str]]:
+        """Async counterpart of BaseRepository.get_page"""
+        keys = (self.model.created_at, self.model.id)
+        result = await self.db.execute(keyset_page(select(self.model), keys, limit, cursor))
+        return page_results(result.scalars().all(), keys, limit)
+    
+    async def create(self, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+    
+    async def bulk_create(self, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]) -> List[ModelType]:
+        """Async counterpart of BaseRepository.bulk_create"""
+        created: List[ModelType] = []
+        for chunk in _chunks(objs_in):
+            rows = await self.db.scalars(_bulk_insert(self.model), [_values(obj_in) for obj_in in chunk])
+            created.extend(rows.all())
+        await self.db.commit()
+        return created
+    
+    async def update(self, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> ModelType:
+        obj_data = jsonable_encoder(db_obj)
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+    
+    async def bulk_update(
+        self, changes: Mapping[Any, Union[UpdateSchemaType, Dict[str, Any]]]
+    ) -> Tuple[List[ModelType], List[Any]]:
+        """Async counterpart of BaseRepository.bulk_update"""
+        ids = list(changes)
+        found: Dict[Any, ModelType] = {}
+        for chunk in _chunks(ids):
+            for statement, parameters in _bulk_updates(self.model, {id: changes[id] for id in chunk}):
+                await self.db.execute(statement, parameters)
+            statement = _select_many(self.model, chunk).execution_options(populate_existing=True)
+            found.update((obj.id, obj) for obj in await self.db.scalars(statement))
+        await self.db.commit()
+        return _in_order(ids, found)
+    
+    async def remove(self, *, id: int) -> Optional[ModelType]:
+        obj = await self.db.get(self.model, id)
+        if obj is not None:
+            await self.db.delete(obj)
+            await self.db.commit()
+        return obj
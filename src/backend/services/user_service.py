@@ -1,11 +1,62 @@
-from typing import Any, Dict, Optional, Union
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple, Union
 from sqlalchemy.orm import Session
 
-from src.backend.core.security import get_password_hash, verify_password
+from src.backend.core.cache import TTLCache
+from src.backend.core.config import get_settings
+from src.backend.core.monitoring import AUTH_PRINCIPAL_CACHE
+from src.backend.core.security import (
+    get_password_hash,
+    hash_password_async,
+    verify_password,
+    verify_password_async,
+)
 from src.backend.models.primary.user import User
 from src.backend.repositories.user_repository import UserRepository
 from src.backend.api.v1.schemas.user import UserCreate, UserUpdate
 
+settings = get_settings()
+
+
+class Principal:
+    """
+    The fields of an authenticated user that authorization checks read.
+
+    A detached snapshot rather than the ORM object, so it can be shared
+    across requests and sessions.
+    """
+    __slots__ = ("id", "email", "is_active", "is_superuser")
+
+    def __init__(self, id: int, email: str, is_active: bool, is_superuser: bool):
+        self.id = id
+        self.email = email
+        self.is_active = is_active
+        self.is_superuser = is_superuser
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(user.id, user.email, bool(user.is_active), bool(user.is_superuser))
+
+
+# Principals keyed by user id. The cache lives in each worker process:
+# changes made here are invalidated right away, but other workers keep
+# their copy until AUTH_PRINCIPAL_CACHE_TTL expires, so the TTL is the
+# longest a deactivated or demoted user can still pass their checks.
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    Drop the cached principal of a user after it was changed or deleted.
+
+    Only this worker's cache is cleared; other workers pick the change up
+    once their entry expires.
+    """
+    principal_cache.delete(user_id)
+
 
 class UserService:
     def __init__(self, db: Session):
@@ -14,34 +65,69 @@ class UserService:
     def get(self, id: int) -> Optional[User]:
         return self.repository.get(id)
     
+    def get_principal(self, id: int) -> Optional[Principal]:
+        """
+        Get the principal of a user, from the cache when possible.
+
+        Args:
+            id: User id from the access token
+
+        Returns:
+            Optional[Principal]: Snapshot of the user, None if it does not
+            exist. Missing users are not cached.
+        """
+        principal = principal_cache.get(id)
+        if principal is not None:
+            AUTH_PRINCIPAL_CACHE.labels(result="hit").inc()
+            return principal
+        AUTH_PRINCIPAL_CACHE.labels(result="miss").inc()
+        user = self.repository.get(id)
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        principal_cache.set(id, principal)
+        return principal
+    
     def get_by_email(self, email: str) -> Optional[User]:
         return self.repository.get_by_email(email=email)
     
     def get_users(self, skip: int = 0, limit: int = 100) -> list[User]:
         return self.repository.get_multi(skip=skip, limit=limit)
     
+    def get_users_page(self, limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[User], Optional[str]]:
+        """One page of users in (created_at, id) order and the next page's cursor"""
+        return self.repository.get_page(limit=limit, cursor=cursor)
+    
     def create(self, obj_in: UserCreate) -> User:
-        db_obj = User(
-            email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
-            full_name=obj_in.full_name,
-            is_superuser=obj_in.is_superuser,
-            is_active=obj_in.is_active,
-        )
+        db_obj = self._build_user(obj_in, get_password_hash(obj_in.password))
         return self.repository.create(obj_in=db_obj)
     
+    async def create_async(self, obj_in: UserCreate) -> User:
+        """Create a user, hashing the password in the hashing process pool"""
+        db_obj = self._build_user(obj_in, await hash_password_async(obj_in.password))
+        # The session is synchronous, so the write runs off the event loop
+        return await asyncio.to_thread(self.repository.create, obj_in=db_obj)
+    
     def update(
         self, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
     ) -> User:
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
+        update_data = self._update_data(obj_in)
         if "password" in update_data and update_data["password"]:
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return self.repository.update(db_obj=db_obj, obj_in=update_data)
+        return self._update(db_obj, update_data)
+    
+    async def update_async(
+        self, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        """Update a user, hashing a new password in the hashing process pool"""
+        update_data = self._update_data(obj_in)
+        if "password" in update_data and update_data["password"]:
+            hashed_password = await hash_password_async(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+        return await asyncio.to_thread(self._update, db_obj, update_data)
     
     def authenticate(self, email: str, password: str) -> Optional[User]:
         user = self.get_by_email(email=email)
@@ -51,6 +137,33 @@ class UserService:
             return None
         return user
     
+    async def authenticate_async(self, email: str, password: str) -> Optional[User]:
+        """Authenticate a user, verifying the password in the hashing process pool"""
+        user = await asyncio.to_thread(self.get_by_email, email=email)
+        if not user:
+            return None
+        if not await verify_password_async(password, user.hashed_password):
+            return None
+        return user
+    
+    def _update(self, db_obj: User, update_data: Dict[str, Any]) -> User:
+        user = self.repository.update(db_obj=db_obj, obj_in=update_data)
+        invalidate_principal(user.id)
+        return user
+    
+    def _build_user(self, obj_in: UserCreate, hashed_password: str) -> User:
+        return User(
+            email=obj_in.email,
+            hashed_password=hashed_password,
+            is_superuser=obj_in.is_superuser,
+            is_active=obj_in.is_active,
+        )
+    
+    def _update_data(self, obj_in: Union[UserUpdate, Dict[str, Any]]) -> Dict[str, Any]:
+        if isinstance(obj_in, dict):
+            return dict(obj_in)
+        return obj_in.model_dump(exclude_unset=True)
+    
     def is_active(self, user: User) -> bool:
         return user.is_active
     
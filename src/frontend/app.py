@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 
 # Get URLs from environment
 BACKEND_URL = os.getenv('BACKEND_URL', 'http://127.0.0.1:8000')
+# Backend URL as the browser reaches it, if it differs from BACKEND_URL
+PUBLIC_BACKEND_URL = os.getenv('PUBLIC_BACKEND_URL', BACKEND_URL)
 
 @app.route('/')
 def home():
@@ -23,23 +25,11 @@ def home():
         return redirect(url_for('profile'))
     logger.debug("User is not logged in")
     
-    # Get auth URL from backend
-    try:
-        response = requests.get(f"{BACKEND_URL}/api/v1/auth/login/google")
-        response.raise_for_status()
-        auth_data = response.json()
-        logger.debug(f"Got auth data from backend: {auth_data}")
-        auth_url = auth_data.get('authorization_url')
-        
-        if not auth_url:
-            logger.error("No auth URL received from backend")
-            return render_template('login.html', error="Failed to get auth URL")
-            
-        return render_template('login.html', auth_url=auth_url)
-        
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error getting auth URL: {str(e)}")
-        return render_template('login.html', error="Error getting auth URL")
+    # The browser opens the backend's login endpoint itself: it sets the
+    # OAuth state cookie that the backend's callback checks, which would be
+    # lost if this server fetched the endpoint on the user's behalf
+    auth_url = f"{PUBLIC_BACKEND_URL}/api/v1/auth/login/google"
+    return render_template('login.html', auth_url=auth_url)
 
 @app.route('/auth-callback')
 def auth_callback():
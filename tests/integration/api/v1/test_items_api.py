@@ -0,0 +1,498 @@
+"""
+Tests for the Items API
+
+This module contains integration tests for the item endpoints, running the
+router end-to-end against a temporary SQLite database through AsyncSession.
+"""
+import json
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from src.backend.api.v1.schemas.item import ItemUpdate
+from src.backend.api.v1.services.item import ItemService, item_cache
+from src.backend.core.auth import get_current_user
+from src.backend.core.config import get_settings
+from src.backend.core.monitoring import REQUEST_PHASE_LATENCY
+from src.backend.core.tracing import install_tracing
+from src.backend.db.session import get_async_db
+from src.backend.main import app
+from src.backend.models.item import Base
+from src.backend.monitoring.query_budget import install_query_budget
+
+OWNER = {"id": "owner-1", "email": "owner@example.com", "is_active": True}
+OTHER = {"id": "owner-2", "email": "other@example.com", "is_active": True}
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    """Create the items table in a temporary SQLite file"""
+    path = tmp_path / "items.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def client(database_path, monkeypatch):
+    """Test client with the async session and current user overridden"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    # Route query budgets are enforced (raised) in tests
+    monkeypatch.setattr(get_settings(), "QUERY_BUDGET_ENFORCE", "raise")
+    install_query_budget(engine.sync_engine)
+    install_tracing(engine.sync_engine)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    current_user = {"value": OWNER}
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_user] = lambda: current_user["value"]
+    # Every test starts from an empty database, so cached reads must not carry over
+    item_cache.clear()
+    test_client = TestClient(app)
+    test_client.current_user = current_user
+    yield test_client
+    app.dependency_overrides.clear()
+
+
+def test_create_and_read_item(client):
+    """Test creating an item and reading it back"""
+    # Act
+    created = client.post("/api/v1/items/", json={"title": "First", "description": "One"})
+    fetched = client.get(f"/api/v1/items/{created.json()['id']}")
+
+    # Assert
+    assert created.status_code == status.HTTP_200_OK
+    assert created.json()["owner_id"] == OWNER["id"]
+    assert fetched.json()["title"] == "First"
+
+
+def test_list_only_returns_own_items(client):
+    """Test that the listing is scoped to the current user"""
+    # Arrange
+    client.post("/api/v1/items/", json={"title": "Mine"})
+    client.current_user["value"] = OTHER
+    client.post("/api/v1/items/", json={"title": "Theirs"})
+
+    # Act
+    response = client.get("/api/v1/items/")
+
+    # Assert
+    assert [item["title"] for item in response.json()["items"]] == ["Theirs"]
+
+
+def test_list_pages_with_cursor(client):
+    """Test following next_cursor through the item listing"""
+    # Arrange
+    for title in ("A", "B", "C"):
+        client.post("/api/v1/items/", json={"title": title})
+
+    # Act
+    first = client.get("/api/v1/items/", params={"limit": 2}).json()
+    second = client.get("/api/v1/items/", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    invalid = client.get("/api/v1/items/", params={"cursor": "garbage"})
+
+    # Assert
+    assert [item["title"] for item in first["items"]] == ["A", "B"]
+    assert [item["title"] for item in second["items"]] == ["C"]
+    assert second["next_cursor"] is None
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_export_streams_own_items(client):
+    """Test the NDJSON and CSV export endpoint"""
+    # Arrange
+    client.post("/api/v1/items/bulk", json=[{"title": "A"}, {"title": "B"}])
+    client.current_user["value"] = OTHER
+    client.post("/api/v1/items/", json={"title": "Theirs"})
+    client.current_user["value"] = OWNER
+
+    # Act
+    ndjson = client.get("/api/v1/items/export")
+    csv = client.get("/api/v1/items/export", params={"format": "csv"})
+    invalid = client.get("/api/v1/items/export", params={"format": "xml"})
+
+    # Assert
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["title"] for line in ndjson.text.splitlines()] == ["A", "B"]
+    assert ndjson.headers["X-DB-Queries"] == "1"
+    assert csv.text.splitlines()[0] == "id,title,description,owner_id,created_at,updated_at"
+    assert len(csv.text.splitlines()) == 3
+    assert invalid.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_import_reports_batches_and_row_errors(client, monkeypatch):
+    """Test an NDJSON import with an invalid row and a CSV import with quoted newlines"""
+    # Arrange
+    monkeypatch.setattr(get_settings(), "IMPORT_BATCH_SIZE", 2)
+    ndjson = '{"title": "A"}\n{"description": "no title"}\nnot json\n{"title": "B"}\n{"title": "C"}'
+    csv = 'title,description\nD,"two\nlines"\nE,\n'
+
+    # Act
+    imported = client.post("/api/v1/items/import", content=ndjson).json()
+    from_csv = client.post("/api/v1/items/import", params={"format": "csv"}, content=csv).json()
+    items = client.get("/api/v1/items/").json()["items"]
+    client.post("/api/v1/items/", json={"title": "F lines"})
+    searched = client.get("/api/v1/items/search", params={"q": "lines"}).json()["items"]
+
+    # Assert
+    assert (imported["rows"], imported["imported"], imported["failed"]) == (5, 3, 2)
+    assert [error["row"] for error in imported["errors"]] == [2, 3]
+    assert [(batch["first_row"], batch["last_row"]) for batch in imported["batches"]] == [(1, 4), (5, 5)]
+    assert from_csv["imported"] == 2
+    assert [item["title"] for item in items] == ["A", "B", "C", "D", "E"]
+    assert items[3]["description"] == "two\nlines"
+    # Imported batches are indexed for search, and later writes are too
+    assert sorted(hit["item"]["title"] for hit in searched) == ["D", "F lines"]
+
+
+def test_atomic_import_rolls_back_on_error(client):
+    """Test that atomic=true imports nothing when a row is invalid"""
+    # Act
+    result = client.post(
+        "/api/v1/items/import", params={"atomic": "true"}, content='{"title": "A"}\n{"title": null}\n'
+    ).json()
+
+    # Assert
+    assert (result["imported"], result["failed"]) == (0, 2)
+    assert client.get("/api/v1/items/").json()["items"] == []
+
+
+def test_search_ranks_highlights_and_pages_own_items(client):
+    """Test FTS5 search ranking, snippets, pagination and trigger sync"""
+    # Arrange
+    client.post("/api/v1/items/bulk", json=[
+        {"title": "Apple pie", "description": "Bake the <apple> filling"},
+        {"title": "Shopping", "description": "Buy an <apple>"},
+        {"title": "Banana bread"},
+    ])
+    client.current_user["value"] = OTHER
+    client.post("/api/v1/items/", json={"title": "Apple"})
+    client.current_user["value"] = OWNER
+
+    # Act
+    first = client.get("/api/v1/items/search", params={"q": "apple", "limit": 1}).json()
+    second = client.get("/api/v1/items/search", params={"q": "apple", "cursor": first["next_cursor"]}).json()
+    client.put(f"/api/v1/items/{first['items'][0]['item']['id']}", json={"title": "Cherry pie", "description": "x"})
+    after_update = client.get("/api/v1/items/search", params={"q": "cherry"}).json()
+    syntax = client.get("/api/v1/items/search", params={"q": 'apple" OR NEAR('})
+
+    # Assert
+    assert first["items"][0]["item"]["title"] == "Apple pie"
+    assert first["items"][0]["snippet"] == "<mark>Apple</mark> pie"
+    assert [hit["item"]["title"] for hit in second["items"]] == ["Shopping"]
+    assert second["items"][0]["snippet"] == "Buy an &lt;<mark>apple</mark>&gt;"
+    assert second["next_cursor"] is None
+    assert [hit["item"]["title"] for hit in after_update["items"]] == ["Cherry pie"]
+    assert syntax.status_code == status.HTTP_200_OK
+
+
+def test_update_ignores_null_fields(client):
+    """Test that fields sent as null are left unchanged"""
+    # Arrange
+    item_id = client.post("/api/v1/items/", json={"title": "Old", "description": "Keep"}).json()["id"]
+
+    # Act
+    response = client.put(f"/api/v1/items/{item_id}", json={"title": "New", "description": None})
+
+    # Assert
+    assert response.json()["title"] == "New"
+    assert response.json()["description"] == "Keep"
+
+
+def test_sync_update_ignores_null_fields(client, database_path):
+    """Test that ItemService.update_item treats null fields like AsyncItemService"""
+    # Arrange
+    item_id = client.post("/api/v1/items/", json={"title": "Old", "description": "Keep"}).json()["id"]
+    engine = create_engine(f"sqlite:///{database_path}")
+
+    # Act
+    with Session(engine) as db:
+        item = ItemService(db).update_item(item_id, ItemUpdate(title="New", description=None), owner_id=OWNER["id"])
+        title, description = item.title, item.description
+    engine.dispose()
+
+    # Assert
+    assert (title, description) == ("New", "Keep")
+
+
+def test_writes_run_a_single_statement(client):
+    """Test that create, update and delete each run one RETURNING statement plus the cache bump"""
+    # Act
+    created = client.post("/api/v1/items/", json={"title": "Once"})
+    updated = client.put(f"/api/v1/items/{created.json()['id']}", json={"title": "Twice"})
+    deleted = client.delete(f"/api/v1/items/{created.json()['id']}")
+
+    # Assert
+    assert created.json()["created_at"] is not None
+    assert updated.json()["title"] == "Twice"
+    assert updated.json()["updated_at"] is not None
+    assert [response.headers["X-DB-Queries"] for response in (created, updated, deleted)] == ["2", "2", "2"]
+
+
+def test_reads_are_cached_until_the_owner_writes(client):
+    """Test that repeated reads only check the cache generation and writes invalidate them"""
+    # Arrange
+    item_id = client.post("/api/v1/items/", json={"title": "Polled"}).json()["id"]
+    client.get("/api/v1/items/")
+    client.get(f"/api/v1/items/{item_id}")
+
+    # Act
+    cached_list = client.get("/api/v1/items/")
+    cached_item = client.get(f"/api/v1/items/{item_id}")
+    client.current_user["value"] = OTHER
+    client.post("/api/v1/items/", json={"title": "Elsewhere"})
+    client.current_user["value"] = OWNER
+    unaffected = client.get("/api/v1/items/")
+    client.put(f"/api/v1/items/{item_id}", json={"title": "Changed"})
+    after_update = client.get(f"/api/v1/items/{item_id}")
+    after_update_list = client.get("/api/v1/items/")
+
+    # Assert
+    assert [r.headers["X-DB-Queries"] for r in (cached_list, cached_item, unaffected)] == ["1", "1", "1"]
+    assert cached_item.json()["title"] == "Polled"
+    assert after_update.headers["X-DB-Queries"] == "2"
+    assert after_update.json()["title"] == "Changed"
+    assert [item["title"] for item in after_update_list.json()["items"]] == ["Changed"]
+
+
+def test_writes_on_other_workers_invalidate_cached_reads(client, database_path):
+    """Test that the cache generation is shared through the database"""
+    # Arrange
+    item_id = client.post("/api/v1/items/", json={"title": "Shared"}).json()["id"]
+    client.get(f"/api/v1/items/{item_id}")
+    page = client.get("/api/v1/items/")
+    engine = create_engine(f"sqlite:///{database_path}")
+
+    # Act
+    # Another worker's write only reaches this one through the database
+    with Session(engine) as db:
+        ItemService(db).update_item(item_id, ItemUpdate(title="Elsewhere"), owner_id=OWNER["id"])
+    engine.dispose()
+    response = client.get(f"/api/v1/items/{item_id}")
+    item_cache.clear()
+    changed_page = client.get("/api/v1/items/", headers={"If-None-Match": page.headers["ETag"]})
+
+    # Assert
+    assert response.json()["title"] == "Elsewhere"
+    # The list ETag follows the shared generation, even without a cached page
+    assert changed_page.status_code == status.HTTP_200_OK
+    assert changed_page.headers["ETag"] != page.headers["ETag"]
+
+
+def test_conditional_requests_use_etags(client):
+    """Test 304 on If-None-Match and 412 on a stale If-Match"""
+    # Arrange
+    created = client.post("/api/v1/items/", json={"title": "Tagged"})
+    item_id = created.json()["id"]
+    item = client.get(f"/api/v1/items/{item_id}")
+    page = client.get("/api/v1/items/")
+
+    # Act
+    unchanged = client.get(f"/api/v1/items/{item_id}", headers={"If-None-Match": item.headers["ETag"]})
+    unchanged_page = client.get("/api/v1/items/", headers={"If-None-Match": page.headers["ETag"]})
+    item_cache.clear()
+    uncached = client.get(f"/api/v1/items/{item_id}", headers={"If-None-Match": item.headers["ETag"]})
+    uncached_page = client.get("/api/v1/items/", headers={"If-None-Match": page.headers["ETag"]})
+    updated = client.put(f"/api/v1/items/{item_id}", json={"title": "New"}, headers={"If-Match": item.headers["ETag"]})
+    # Second update within the same second as the first
+    again = client.put(f"/api/v1/items/{item_id}", json={"title": "Newer"}, headers={"If-Match": updated.headers["ETag"]})
+    stale = client.put(f"/api/v1/items/{item_id}", json={"title": "Lost"}, headers={"If-Match": item.headers["ETag"]})
+    stale_delete = client.delete(f"/api/v1/items/{item_id}", headers={"If-Match": updated.headers["ETag"]})
+    changed_page = client.get("/api/v1/items/", headers={"If-None-Match": page.headers["ETag"]})
+    deleted = client.delete(f"/api/v1/items/{item_id}", headers={"If-Match": again.headers["ETag"]})
+
+    # Assert
+    assert item.headers["ETag"] == created.headers["ETag"]
+    assert page.headers["ETag"].startswith('W/"')
+    assert [r.status_code for r in (unchanged, unchanged_page, uncached, uncached_page)] == [304] * 4
+    assert [r.headers["X-DB-Queries"] for r in (unchanged, uncached, uncached_page)] == ["1", "2", "1"]
+    assert uncached.content == b""
+    assert [r.status_code for r in (updated, again)] == [status.HTTP_200_OK] * 2
+    assert len({item.headers["ETag"], updated.headers["ETag"], again.headers["ETag"]}) == 3
+    assert stale.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert stale_delete.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert changed_page.status_code == status.HTTP_200_OK
+    assert changed_page.json()["items"][0]["title"] == "Newer"
+    assert deleted.status_code == status.HTTP_200_OK
+
+
+def test_recreated_item_does_not_match_deleted_items_etag(client):
+    """Test that an If-Match for a deleted item never matches the row created after it"""
+    # Arrange
+    client.post("/api/v1/items/", json={"title": "Kept"})
+    deleted = client.post("/api/v1/items/", json={"title": "Deleted"})
+    client.delete(f"/api/v1/items/{deleted.json()['id']}")
+
+    # Act
+    recreated = client.post("/api/v1/items/", json={"title": "Recreated"})
+    stale = client.put(
+        f"/api/v1/items/{recreated.json()['id']}",
+        json={"title": "Lost"},
+        headers={"If-Match": deleted.headers["ETag"]},
+    )
+
+    # Assert
+    assert recreated.json()["id"] != deleted.json()["id"]
+    assert recreated.headers["ETag"] != deleted.headers["ETag"]
+    assert stale.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert client.get(f"/api/v1/items/{recreated.json()['id']}").json()["title"] == "Recreated"
+
+
+def test_list_rows_serialize_like_item_response(client):
+    """Test that the validation-free list serializer matches ItemResponse"""
+    # Arrange
+    item_id = client.post("/api/v1/items/", json={"title": "Same", "description": "d"}).json()["id"]
+    client.put(f"/api/v1/items/{item_id}", json={"title": "Same again"})
+
+    # Act
+    listed = client.get("/api/v1/items/").json()["items"]
+    detail = client.get(f"/api/v1/items/{item_id}").json()
+
+    # Assert
+    assert listed == [detail]
+    assert detail["updated_at"] is not None
+
+
+def test_fields_project_list_detail_and_export(client):
+    """Test that fields= returns only the requested fields, id always included"""
+    # Arrange
+    item_id = client.post("/api/v1/items/", json={"title": "Narrow", "description": "x" * 1000}).json()["id"]
+
+    # Act
+    page = client.get("/api/v1/items/", params={"fields": "title"})
+    full_page = client.get("/api/v1/items/")
+    item = client.get(f"/api/v1/items/{item_id}", params={"fields": "title,updated_at"})
+    full_item = client.get(f"/api/v1/items/{item_id}")
+    updated = client.put(f"/api/v1/items/{item_id}", json={"title": "Wide"}, headers={"If-Match": item.headers["ETag"]})
+    csv = client.get("/api/v1/items/export", params={"format": "csv", "fields": "title,id"})
+    invalid = client.get("/api/v1/items/", params={"fields": "title,secret"})
+
+    # Assert
+    assert page.json()["items"] == [{"id": item_id, "title": "Narrow"}]
+    assert page.headers["ETag"] != full_page.headers["ETag"]
+    assert item.json() == {"id": item_id, "title": "Narrow", "updated_at": None}
+    assert item.headers["ETag"] != full_item.headers["ETag"]
+    assert updated.status_code == status.HTTP_200_OK
+    assert csv.text.splitlines() == ["id,title", f"{item_id},Wide"]
+    assert invalid.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_other_users_item_is_not_found(client):
+    """Test that items of other owners cannot be read, updated or deleted"""
+    # Arrange
+    item_id = client.post("/api/v1/items/", json={"title": "Private"}).json()["id"]
+    client.current_user["value"] = OTHER
+
+    # Act / Assert
+    assert client.get(f"/api/v1/items/{item_id}").status_code == status.HTTP_404_NOT_FOUND
+    assert client.put(f"/api/v1/items/{item_id}", json={"title": "x"}).status_code == status.HTTP_404_NOT_FOUND
+    assert client.delete(f"/api/v1/items/{item_id}").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_delete_item(client):
+    """Test deleting an item"""
+    # Arrange
+    item_id = client.post("/api/v1/items/", json={"title": "Temporary"}).json()["id"]
+
+    # Act
+    response = client.delete(f"/api/v1/items/{item_id}")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert client.get(f"/api/v1/items/{item_id}").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_bulk_create_returns_items_in_order_one_statement_per_chunk(client, monkeypatch):
+    """Test that a bulk create runs one INSERT per chunk and keeps request order"""
+    # Arrange
+    monkeypatch.setattr(get_settings(), "BULK_CHUNK_SIZE", 2)
+    payload = [{"title": f"Bulk {i}"} for i in range(5)]
+
+    # Act
+    response = client.post("/api/v1/items/bulk", json=payload)
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["title"] for item in response.json()] == [entry["title"] for entry in payload]
+    assert all(item["owner_id"] == OWNER["id"] for item in response.json())
+    assert response.headers["X-DB-Queries"] == "4"
+
+
+def test_bulk_update_and_delete_skip_other_users_items(client):
+    """Test per-item results and set-based ownership of bulk update and delete"""
+    # Arrange
+    mine = [item["id"] for item in client.post("/api/v1/items/bulk", json=[{"title": "A"}, {"title": "B"}]).json()]
+    client.current_user["value"] = OTHER
+    theirs = client.post("/api/v1/items/", json={"title": "Theirs"}).json()["id"]
+    client.current_user["value"] = OWNER
+
+    # Act
+    updated = client.patch("/api/v1/items/bulk", json=[
+        {"id": mine[1], "description": "Changed"},
+        {"id": theirs, "title": "Stolen"},
+        {"id": mine[0], "title": "A2"},
+    ]).json()
+    deleted = client.request("DELETE", "/api/v1/items/bulk", json={"ids": [theirs, mine[0]]}).json()
+
+    # Assert
+    assert [(entry["id"], entry["status"]) for entry in updated] == [
+        (mine[1], "updated"), (theirs, "not_found"), (mine[0], "updated"),
+    ]
+    assert updated[0]["item"]["description"] == "Changed"
+    assert updated[2]["item"]["title"] == "A2"
+    assert [entry["status"] for entry in deleted] == ["not_found", "deleted"]
+    client.current_user["value"] = OTHER
+    assert client.get(f"/api/v1/items/{theirs}").json()["title"] == "Theirs"
+
+
+def test_bulk_rejects_oversized_requests(client, monkeypatch):
+    """Test the BULK_MAX_ITEMS limit"""
+    # Arrange
+    monkeypatch.setattr(get_settings(), "BULK_MAX_ITEMS", 2)
+
+    # Act
+    response = client.post("/api/v1/items/bulk", json=[{"title": "x"}] * 3)
+
+    # Assert
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+
+def test_responses_report_query_count(client):
+    """Test the X-DB-Queries and Server-Timing headers"""
+    # Arrange
+    item_id = client.post("/api/v1/items/", json={"title": "Counted"}).json()["id"]
+
+    # Act
+    response = client.get(f"/api/v1/items/{item_id}")
+
+    # Assert
+    assert response.headers["X-DB-Queries"] == "2"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_responses_report_phase_timings(client):
+    """Test the Server-Timing phase breakdown and the phase histograms"""
+    # Arrange
+    item_id = client.post("/api/v1/items/", json={"title": "Traced"}).json()["id"]
+    sql = REQUEST_PHASE_LATENCY.labels(route="GET /api/v1/items/{item_id}", phase="sql")
+    before = sql._sum.get()
+
+    # Act
+    response = client.get(f"/api/v1/items/{item_id}")
+
+    # Assert
+    phases = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert phases[0] == "db"
+    assert {"serialize", "other", "total"} <= set(phases)
+    assert "sql" not in phases
+    assert sql._sum.get() > before
@@ -0,0 +1,114 @@
+"""
+Tests for the Google OAuth login flow
+
+This module drives the browser side of the login: /auth/login/google sets
+the state cookie on its redirect and /auth/callback must receive it back.
+"""
+import base64
+import hashlib
+import json
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.backend.api.v1.routers import auth as auth_router
+from src.backend.core.config import get_settings
+from src.backend.core.pkce import OAUTH_STATE_COOKIE
+from src.backend.external.supabase_auth import create_auth_client
+from src.backend.main import app
+
+settings = get_settings()
+
+
+@pytest.fixture
+def auth_client(monkeypatch):
+    """Supabase Auth client whose token endpoint checks the PKCE verifier"""
+    challenges = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        digest = hashlib.sha256(body["code_verifier"].encode("utf-8")).digest()
+        challenge = base64.urlsafe_b64encode(digest).decode("utf-8").rstrip("=")
+        if challenge not in challenges:
+            return httpx.Response(400, json={"error": "invalid_grant"})
+        return httpx.Response(200, json={"access_token": "supabase-access-token"})
+
+    client = create_auth_client(
+        base_url="http://supabase.test", api_key="anon", transport=httpx.MockTransport(handler)
+    )
+    original = client.get_authorization_url
+
+    def get_authorization_url(**kwargs):
+        challenges.append(kwargs["code_challenge"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(client, "get_authorization_url", get_authorization_url)
+    monkeypatch.setattr(auth_router, "get_auth_client", lambda: client)
+    return client
+
+
+def start_login(client):
+    """Open the login endpoint like a browser and return the state sent to the provider"""
+    response = client.get("/api/v1/auth/login/google", follow_redirects=False)
+    assert response.status_code == status.HTTP_302_FOUND
+    query = parse_qs(urlparse(response.headers["location"]).query)
+    redirect_to = urlparse(query["redirect_to"][0])
+    return response, parse_qs(redirect_to.query)["state"][0]
+
+
+def test_login_redirects_and_sets_state_cookie(auth_client):
+    """Test the login endpoint redirects to the provider with the state cookie"""
+    # Arrange
+    client = TestClient(app)
+
+    # Act
+    response, state = start_login(client)
+
+    # Assert
+    assert response.headers["location"].startswith("http://supabase.test/auth/v1/authorize")
+    cookie = response.headers["set-cookie"]
+    assert cookie.startswith(f"{OAUTH_STATE_COOKIE}=")
+    assert "HttpOnly" in cookie
+    assert state
+
+
+def test_callback_completes_with_cookie_from_login(auth_client):
+    """Test the cookie set at login carries through to the callback"""
+    # Arrange
+    client = TestClient(app)
+    _, state = start_login(client)
+
+    # Act
+    response = client.get(
+        "/api/v1/auth/callback",
+        params={"code": "auth-code", "state": state},
+        follow_redirects=False,
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_307_TEMPORARY_REDIRECT
+    assert response.headers["location"] == (
+        f"{settings.FRONTEND_URL}/auth-callback?token=supabase-access-token"
+    )
+
+
+def test_callback_without_cookie_is_rejected(auth_client):
+    """Test a callback from a browser that did not start the login fails"""
+    # Arrange
+    _, state = start_login(TestClient(app))
+    other_browser = TestClient(app)
+
+    # Act
+    response = other_browser.get(
+        "/api/v1/auth/callback",
+        params={"code": "auth-code", "state": state},
+        follow_redirects=False,
+    )
+
+    # Assert
+    location = response.headers["location"]
+    assert location.startswith(f"{settings.FRONTEND_URL}/auth-callback?error=")
+    assert "token=" not in location
@@ -0,0 +1,322 @@
+"""
+Tests for Supabase token verification in core.auth
+
+This module covers local JWT verification and the verified-claims cache
+used by get_current_user.
+"""
+import asyncio
+import time
+
+import httpx
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.backend.core import auth
+from src.backend.core.cache import token_digest
+from src.backend.core.monitoring import (
+    AUTH_CLAIMS_CACHE,
+    AUTH_TOKEN_REJECTIONS,
+    AUTH_VALIDATIONS_COALESCED,
+)
+from src.backend.external.supabase_auth import create_auth_client
+
+SECRET = "test-secret-with-at-least-32-characters"
+ISSUER = "http://localhost:54321/auth/v1"
+
+
+@pytest.fixture(autouse=True)
+def auth_settings(monkeypatch):
+    """Configure local verification against a known secret"""
+    monkeypatch.setattr(auth.settings, "SUPABASE_JWT_SECRET", SECRET)
+    monkeypatch.setattr(auth.settings, "SUPABASE_JWT_ISSUER", ISSUER)
+    monkeypatch.setattr(auth.settings, "AUTH_LOCAL_VERIFICATION", True)
+    monkeypatch.setattr(auth.settings, "AUTH_STRICT_MODE", False)
+    caches = (auth._claims_cache, auth._rejected_tokens,
+              auth._revoked_tokens, auth._revoked_users)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+def make_token(**overrides):
+    """Create a signed Supabase-style access token"""
+    claims = {
+        "sub": "user-123",
+        "email": "user@example.com",
+        "role": "authenticated",
+        "aud": "authenticated",
+        "iss": ISSUER,
+        "exp": int(time.time()) + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, SECRET, algorithm="HS256")
+
+
+def call_get_current_user(token):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(auth.get_current_user(credentials))
+
+
+def cache_count(result):
+    return AUTH_CLAIMS_CACHE.labels(result=result)._value.get()
+
+
+def test_valid_token_is_verified_locally(monkeypatch):
+    """Test that a valid token never reaches Supabase"""
+    # Arrange
+    async def fail(token):
+        raise AssertionError("Supabase should not be called")
+    monkeypatch.setattr(auth, "_validate_with_supabase", fail)
+
+    # Act
+    user = call_get_current_user(make_token())
+
+    # Assert
+    assert user["id"] == "user-123"
+    assert user["email"] == "user@example.com"
+    assert user["is_superuser"] is False
+
+
+def test_second_call_is_served_from_cache():
+    """Test that verified claims are cached by token digest"""
+    # Arrange
+    token = make_token()
+    hits, misses = cache_count("hit"), cache_count("miss")
+
+    # Act
+    call_get_current_user(token)
+    call_get_current_user(token)
+
+    # Assert
+    assert cache_count("miss") == misses + 1
+    assert cache_count("hit") == hits + 1
+
+
+@pytest.mark.parametrize(
+    "overrides, detail",
+    [
+        ({"exp": int(time.time()) - 10}, "Token has expired"),
+        ({"aud": "someone-else"}, "Invalid token"),
+        ({"iss": "https://evil.example.com/auth/v1"}, "Invalid token"),
+    ],
+)
+def test_rejected_claims_raise_401(overrides, detail):
+    """Test that exp, aud and iss are enforced"""
+    with pytest.raises(HTTPException) as exc_info:
+        call_get_current_user(make_token(**overrides))
+
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == detail
+
+
+def test_bad_signature_raises_401():
+    """Test that tokens signed with another key are rejected"""
+    token = jwt.encode(
+        {"sub": "user-123", "aud": "authenticated", "iss": ISSUER,
+         "exp": int(time.time()) + 3600},
+        "another-secret-with-at-least-32-characters",
+        algorithm="HS256",
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        call_get_current_user(token)
+
+    assert exc_info.value.status_code == 401
+
+
+def test_strict_mode_confirms_with_supabase(monkeypatch):
+    """Test that strict mode bypasses the cache and calls Supabase"""
+    # Arrange
+    calls = []
+
+    async def confirm(token):
+        calls.append(token)
+        return {"id": "user-123", "email": "user@example.com"}
+
+    monkeypatch.setattr(auth.settings, "AUTH_STRICT_MODE", True)
+    monkeypatch.setattr(auth, "_validate_with_supabase", confirm)
+    token = make_token()
+
+    # Act
+    call_get_current_user(token)
+    call_get_current_user(token)
+
+    # Assert
+    assert calls == [token, token]
+
+
+def test_concurrent_validations_are_coalesced(monkeypatch):
+    """Test that parallel requests with one token share one validation"""
+    # Arrange
+    calls = []
+
+    async def confirm(token):
+        calls.append(token)
+        await asyncio.sleep(0.05)
+        return {"id": "user-123", "email": "user@example.com"}
+
+    monkeypatch.setattr(auth.settings, "AUTH_STRICT_MODE", True)
+    monkeypatch.setattr(auth, "_validate_with_supabase", confirm)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token())
+    coalesced = AUTH_VALIDATIONS_COALESCED._value.get()
+
+    async def burst():
+        return await asyncio.gather(
+            *(auth.get_current_user(credentials) for _ in range(10))
+        )
+
+    # Act
+    users = asyncio.run(burst())
+
+    # Assert
+    assert len(calls) == 1
+    assert all(user["id"] == "user-123" for user in users)
+    assert AUTH_VALIDATIONS_COALESCED._value.get() == coalesced + 9
+
+
+def test_coalesced_failure_is_not_cached(monkeypatch):
+    """Test that a failed validation is only shared by in-flight callers"""
+    # Arrange
+    calls = []
+
+    async def reject(token):
+        calls.append(token)
+        await asyncio.sleep(0.01)
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    monkeypatch.setattr(auth.settings, "AUTH_STRICT_MODE", True)
+    monkeypatch.setattr(auth, "_validate_with_supabase", reject)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token())
+
+    async def burst():
+        return await asyncio.gather(
+            *(auth.get_current_user(credentials) for _ in range(5)),
+            return_exceptions=True,
+        )
+
+    # Act
+    first = asyncio.run(burst())
+    second = asyncio.run(burst())
+
+    # Assert
+    assert all(isinstance(result, HTTPException) for result in first + second)
+    assert len(calls) == 2
+
+
+def test_rejected_token_is_refused_from_negative_cache(monkeypatch):
+    """Test that a retried bad token is rejected without decoding"""
+    # Arrange
+    token = make_token(exp=int(time.time()) - 10)
+    with pytest.raises(HTTPException):
+        call_get_current_user(token)
+
+    def fail(token):
+        raise AssertionError("Token should not be decoded again")
+    monkeypatch.setattr(auth, "verify_token_locally", fail)
+    rejections = AUTH_TOKEN_REJECTIONS.labels(reason="negative_cache")._value.get()
+
+    # Act
+    with pytest.raises(HTTPException) as exc_info:
+        call_get_current_user(token)
+
+    # Assert
+    assert exc_info.value.detail == "Token has expired"
+    assert AUTH_TOKEN_REJECTIONS.labels(reason="negative_cache")._value.get() == rejections + 1
+
+
+def test_revoked_token_is_dropped_from_claims_cache():
+    """Test that revoke_token invalidates a cached token"""
+    # Arrange
+    token = make_token()
+    other_token = make_token(email="other@example.com")
+    call_get_current_user(token)
+    call_get_current_user(other_token)
+
+    # Act
+    auth.revoke_token(token)
+
+    # Assert
+    with pytest.raises(HTTPException) as exc_info:
+        call_get_current_user(token)
+    assert exc_info.value.detail == "Token has been revoked"
+    assert call_get_current_user(other_token)["id"] == "user-123"
+
+
+def test_revoke_user_tokens_rejects_earlier_tokens_only():
+    """Test that user revocation applies to tokens issued before it"""
+    # Arrange
+    old_token = make_token(iat=int(time.time()) - 60)
+    call_get_current_user(old_token)
+
+    # Act
+    auth.revoke_user_tokens("user-123")
+    # Backdate the revocation so a token issued "now" is newer than it
+    auth._revoked_users.set("user-123", time.time() - 30)
+
+    # Assert
+    with pytest.raises(HTTPException):
+        call_get_current_user(old_token)
+    new_token = make_token(iat=int(time.time()))
+    assert call_get_current_user(new_token)["id"] == "user-123"
+
+
+@pytest.mark.parametrize("status_code, negative_cached", [(403, True), (503, False)])
+def test_supabase_failures_never_authenticate(monkeypatch, status_code, negative_cached):
+    """Test that a token Supabase does not confirm is refused, not decoded unverified"""
+    # Arrange
+    client = create_auth_client(
+        base_url="http://supabase.test",
+        transport=httpx.MockTransport(lambda request: httpx.Response(status_code, text="no")),
+    )
+    monkeypatch.setattr(auth.settings, "AUTH_STRICT_MODE", True)
+    monkeypatch.setattr(auth, "get_auth_client", lambda: client)
+    token = make_token(role="service_role")
+
+    # Act
+    with pytest.raises(HTTPException) as exc_info:
+        call_get_current_user(token)
+
+    # Assert
+    assert exc_info.value.status_code == 401
+    assert (auth._rejected_tokens.get(token_digest(token)) is not None) is negative_cached
+    assert auth._claims_cache.get(token_digest(token)) is None
+
+
+def test_unreachable_key_set_is_not_negative_cached(monkeypatch):
+    """Test that a JWKS fetch failure rejects the request but not the token"""
+    # Arrange
+    def unreachable(token):
+        raise jwt.PyJWKClientConnectionError("Fail to fetch data from the url")
+    monkeypatch.setattr(auth, "verify_token_locally", unreachable)
+    token = make_token()
+
+    # Act
+    with pytest.raises(HTTPException) as exc_info:
+        call_get_current_user(token)
+
+    # Assert
+    assert exc_info.value.status_code == 401
+    assert auth._rejected_tokens.get(token_digest(token)) is None
+
+
+def test_supabase_result_is_cached_until_token_expiry(monkeypatch):
+    """Test that a user confirmed by Supabase is not cached past the token's exp"""
+    # Arrange
+    async def confirm(token):
+        return {"id": "user-123", "email": "user@example.com"}
+
+    monkeypatch.setattr(auth.settings, "AUTH_LOCAL_VERIFICATION", False)
+    monkeypatch.setattr(auth, "_validate_with_supabase", confirm)
+    exp = int(time.time()) + 5
+    token = make_token(exp=exp)
+
+    # Act
+    call_get_current_user(token)
+
+    # Assert
+    expires_at, _ = auth._claims_cache._data[token_digest(token)]
+    assert expires_at - time.monotonic() <= 5
@@ -0,0 +1,53 @@
+"""
+Tests for the in-process caches in core.cache
+
+This module covers the byte accounting of TTLCache and the per-scope
+generations of GenerationalCache.
+"""
+from src.backend.core.cache import GenerationalCache, TTLCache
+from src.backend.core.monitoring import CACHE_LOOKUPS
+
+
+def test_ttl_cache_tracks_value_sizes():
+    """Test that nbytes follows replacements, deletions and evictions"""
+    # Arrange
+    cache = TTLCache(maxsize=2, ttl=60, sizeof=len)
+
+    # Act / Assert
+    cache.set("a", b"12345")
+    cache.set("a", b"123")
+    cache.set("b", b"1234")
+    assert cache.nbytes == 7
+    cache.set("c", b"1")
+    assert cache.get("a") is None
+    assert cache.nbytes == 5
+    cache.delete("b")
+    assert cache.nbytes == 1
+    assert TTLCache(maxsize=1, ttl=60).nbytes is None
+
+
+def test_invalidate_hides_only_its_scope():
+    """Test that invalidation moves one scope to a new generation"""
+    # Arrange
+    cache = GenerationalCache(TTLCache(maxsize=10, ttl=60, sizeof=len), name="test")
+    hits = CACHE_LOOKUPS.labels(cache="test", result="hit")
+    before = hits._value.get()
+    _, key = cache.lookup("owner-1", "page")
+    cache.store(key, b"old")
+    _, other_key = cache.lookup("owner-2", "page")
+    cache.store(other_key, b"other")
+
+    # Act
+    cached, _ = cache.lookup("owner-1", "page")
+    cache.invalidate("owner-1")
+    after, new_key = cache.lookup("owner-1", "page")
+    # A value read before the write is stored under the old generation
+    cache.store(key, b"stale")
+
+    # Assert
+    assert cached == b"old"
+    assert after is None
+    assert cache.lookup("owner-1", "page")[0] is None
+    assert new_key != key
+    assert cache.lookup("owner-2", "page")[0] == b"other"
+    assert hits._value.get() - before == 2
@@ -0,0 +1,27 @@
+"""
+Tests for the entity tag helpers in core.etag
+"""
+import pytest
+
+from src.backend.core.etag import not_modified, parse_etags, strong_etag, strong_matches
+
+
+def test_parse_etags_keeps_weak_prefix_and_drops_junk():
+    """Test splitting a list header into tags"""
+    # Act
+    tags = parse_etags('"1-2", W/"abc" ,junk, "x"')
+
+    # Assert
+    assert tags == ['"1-2"', 'W/"abc"', '"x"']
+    assert strong_matches(tags) == ['"1-2"', '"x"']
+    assert parse_etags(" * ") == ["*"]
+    assert parse_etags(None) is None
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "expected"),
+    [(None, False), ('"1-2"', True), ('W/"1-2"', True), ('"1-3", "1-2"', True), ('"1-3"', False), ("*", True)],
+)
+def test_not_modified_uses_weak_comparison(if_none_match, expected):
+    """Test If-None-Match matching against a strong ETag"""
+    assert not_modified(if_none_match, strong_etag(1, 2)) is expected
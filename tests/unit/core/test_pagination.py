@@ -0,0 +1,89 @@
+"""
+Tests for keyset pagination
+
+This module checks cursor encoding and walks pages of a temporary SQLite
+items table through ItemService and BaseRepository.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from src.backend.api.v1.services.item import ItemService, _items_page
+from src.backend.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from src.backend.models.item import Base, Item
+from src.backend.repositories.base import BaseRepository
+
+
+class ItemRepository(BaseRepository):
+    def __init__(self, db):
+        super().__init__(Item, db)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Session on a temporary database with 7 items of owner-1 and 3 of owner-2"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        # Inserted in one statement, so every row shares its created_at second
+        connection.execute(insert(Item), [
+            {"title": f"Item {i}", "owner_id": "owner-1" if i % 10 < 7 else "owner-2"} for i in range(10)
+        ])
+    with Session(engine) as session:
+        yield session
+
+
+def walk(fetch_page):
+    """Follow next_cursor until the last page, returning every page"""
+    pages, cursor = [], None
+    while True:
+        rows, cursor = fetch_page(cursor)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    """Test that datetimes survive encoding for DateTime keys"""
+    created_at = datetime(2026, 1, 2, 3, 4, 5)
+
+    values = decode_cursor(encode_cursor([created_at, 42]), (Item.created_at, Item.id))
+
+    assert values == [created_at, 42]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor([1, 2]), "e30"])
+def test_invalid_cursor(cursor):
+    """Test that malformed or mismatched cursors are rejected"""
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, (Item.id,))
+
+
+def test_item_pages_cover_owner_items_once(db):
+    """Test walking an owner's items page by page"""
+    pages = walk(lambda cursor: ItemService(db).get_items_page(limit=3, cursor=cursor, owner_id="owner-1"))
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [item.id for page in pages for item in page] == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_repository_pages_handle_created_at_ties(db):
+    """Test (created_at, id) paging when all rows share a timestamp"""
+    pages = walk(lambda cursor: ItemRepository(db).get_page(limit=4, cursor=cursor))
+
+    assert [item.id for page in pages for item in page] == list(range(1, 11))
+
+
+def test_item_page_seeks_through_composite_index(db):
+    """Test that deep pages are an index range scan, not a scan and sort"""
+    statement = _items_page("owner-1", 100, encode_cursor([5]), skip=0)
+    compiled = statement.compile(db.get_bind())
+
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params[name] for name in compiled.positiontup)
+    ).all()
+
+    assert len(plan) == 1
+    assert plan[0][-1].startswith("SEARCH items USING INDEX ix_items_owner_id_id (owner_id=? AND")
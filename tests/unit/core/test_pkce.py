@@ -0,0 +1,46 @@
+"""
+Tests for the PKCE state cookie in core.pkce
+
+This module checks that the code verifier only comes back for the state it
+was sealed with, and never from a forged or expired cookie.
+"""
+import pytest
+
+from src.backend.core import pkce
+
+
+def test_sealed_verifier_opens_for_its_state():
+    """Test the round trip and that the cookie does not reveal the verifier"""
+    # Arrange
+    verifier, _ = pkce.generate_pkce_pair()
+    state = pkce.generate_state()
+
+    # Act
+    cookie = pkce.seal_state(state, verifier)
+
+    # Assert
+    assert verifier not in cookie
+    assert pkce.open_state(cookie, state) == verifier
+
+
+@pytest.mark.parametrize("cookie, state", [
+    (None, "state"),
+    ("not-a-sealed-cookie", "state"),
+    ("sealed", "another-state"),
+])
+def test_unbound_states_are_rejected(cookie, state):
+    """Test missing, forged and mismatched states"""
+    if cookie == "sealed":
+        cookie = pkce.seal_state("state", "verifier")
+
+    with pytest.raises(ValueError):
+        pkce.open_state(cookie, state)
+
+
+def test_expired_state_is_rejected(monkeypatch):
+    """Test that a cookie older than OAUTH_STATE_TTL is refused"""
+    cookie = pkce.seal_state("state", "verifier")
+    monkeypatch.setattr(pkce.settings, "OAUTH_STATE_TTL", -1)
+
+    with pytest.raises(ValueError, match="expired"):
+        pkce.open_state(cookie, "state")
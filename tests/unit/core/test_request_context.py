@@ -0,0 +1,27 @@
+"""
+Tests for the request context
+
+This module checks the route template reported to database hooks.
+"""
+from src.backend.core.request_context import current_scope, get_current_route
+
+
+def test_current_route_rebuilds_template_from_path_params():
+    """Test that path parameter values are replaced by their names"""
+    # Arrange
+    token = current_scope.set({
+        "type": "http",
+        "method": "PUT",
+        "path": "/api/v1/items/1",
+        "path_params": {"item_id": 1},
+    })
+
+    # Act
+    try:
+        route = get_current_route()
+    finally:
+        current_scope.reset(token)
+
+    # Assert
+    assert route == "PUT /api/v1/items/{item_id}"
+    assert get_current_route() is None
@@ -0,0 +1,47 @@
+"""
+Tests for password hashing in core.security
+
+This module covers the process-pool backed PasswordHasher used by the
+awaitable UserService variants.
+"""
+import asyncio
+
+import pytest
+
+from src.backend.core.monitoring import PASSWORD_HASH_QUEUE_DEPTH
+from src.backend.core.security import PasswordHasher, pwd_context, verify_password
+
+
+@pytest.fixture
+def hasher():
+    """Create a single-process hasher"""
+    hasher = PasswordHasher(max_workers=1, max_concurrency=1)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_in_pool_verifies_inline(hasher):
+    """Test that hashes produced in the pool are regular bcrypt hashes"""
+    hashed = asyncio.run(hasher.hash("password123"))
+
+    assert verify_password("password123", hashed)
+
+
+def test_concurrent_verifications_drain_the_queue(hasher):
+    """Test that queued jobs all complete and the queue gauge returns to zero"""
+    # Arrange
+    hashed = pwd_context.using(bcrypt__rounds=4).hash("password123")
+
+    async def burst():
+        return await asyncio.gather(
+            hasher.verify("password123", hashed),
+            hasher.verify("wrong_password", hashed),
+            hasher.verify("password123", hashed),
+        )
+
+    # Act
+    results = asyncio.run(burst())
+
+    # Assert
+    assert results == [True, False, True]
+    assert PASSWORD_HASH_QUEUE_DEPTH._value.get() == 0
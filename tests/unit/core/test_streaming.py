@@ -0,0 +1,50 @@
+"""
+Tests for incremental NDJSON/CSV parsing
+
+This module feeds bodies split at awkward chunk boundaries into
+iter_records and checks the records, row errors and line size limit.
+"""
+import asyncio
+
+import pytest
+
+from src.backend.core.streaming import LineTooLong, RecordError, iter_records
+
+
+def parse(body: bytes, format: str, chunk_size: int = 3, max_line_bytes: int = 1024):
+    """Split body into chunk_size pieces and collect every parsed record"""
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    async def collect():
+        return [record async for batch in iter_records(chunks(), format, max_line_bytes) for record in batch]
+
+    return asyncio.run(collect())
+
+
+def test_ndjson_across_chunk_boundaries():
+    """Test lines split over chunks, CRLF endings, blank lines and bad rows"""
+    # Act
+    records = parse(b'{"title": "A"}\r\n\n[1]\n{"title": "\xc3\xa9"}', "ndjson")
+
+    # Assert
+    assert records[0] == {"title": "A"}
+    assert isinstance(records[1], RecordError)
+    assert records[2] == {"title": "é"}
+
+
+def test_csv_with_quoted_newlines_and_short_rows():
+    """Test CSV records spanning lines, doubled quotes and column mismatches"""
+    # Act
+    records = parse(b'title,description\n"A ""x""","line1\nline2"\nB\n', "csv", chunk_size=5)
+
+    # Assert
+    assert records[0] == {"title": 'A "x"', "description": "line1\nline2"}
+    assert str(records[1]) == "Expected 2 columns, got 1"
+
+
+def test_line_too_long():
+    """Test that an unterminated oversized line is rejected"""
+    with pytest.raises(LineTooLong):
+        parse(b'{"title": "' + b"x" * 100, "ndjson", chunk_size=50, max_line_bytes=64)
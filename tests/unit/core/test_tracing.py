@@ -0,0 +1,114 @@
+"""
+Tests for request tracing in core.tracing
+
+This module records spans into a Trace directly, checks the phase totals
+behind the Server-Timing header and the OTLP/JSON export of sampled traces.
+"""
+import asyncio
+import json
+
+from sqlalchemy import create_engine, text
+
+from src.backend.core.tracing import (
+    Trace,
+    TraceExporter,
+    current_trace,
+    install_tracing,
+    server_timing,
+    span,
+    traced,
+)
+
+
+def run_in_trace(trace, fn):
+    """Call fn with trace as the current request's trace"""
+    token = current_trace.set(trace)
+    try:
+        return fn()
+    finally:
+        current_trace.reset(token)
+
+
+def test_spans_outside_a_request_are_no_ops():
+    """Test that span() and traced() work without a current trace"""
+    @traced("serialize")
+    def encode():
+        return b"{}"
+
+    with span("auth") as recorded:
+        assert recorded is None
+    assert encode() == b"{}"
+
+
+def test_phases_sum_spans_and_attribute_the_rest_to_other():
+    """Test nesting, per-phase totals and the Server-Timing value"""
+    # Arrange
+    trace = Trace("GET /api/v1/items")
+
+    @traced("auth")
+    async def authenticate():
+        with span("external"):
+            await asyncio.sleep(0.01)
+        return "user"
+
+    def handle():
+        user = asyncio.run(authenticate())
+        with span("serialize"):
+            pass
+        return user
+
+    # Act
+    user = run_in_trace(trace, handle)
+    trace.root.end = trace.root.start + 1.0
+    phases = trace.phases()
+
+    # Assert
+    assert user == "user"
+    external, = [recorded for recorded in trace.spans if recorded.name == "external"]
+    assert external.parent.name == "auth"
+    assert phases["auth"] >= phases["external"] >= 0.01
+    assert phases["total"] == 1.0
+    assert abs(phases["other"] - (1.0 - phases["auth"] - phases["serialize"])) < 1e-9
+    assert server_timing({"sql": 0.002, "auth": 0.0125}) == "auth;dur=12.5"
+
+
+def test_sql_statements_become_spans():
+    """Test the engine hook records one sql span per statement"""
+    # Arrange
+    engine = create_engine("sqlite://")
+    install_tracing(engine)
+    trace = Trace("GET /")
+
+    def query():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    # Act
+    run_in_trace(trace, query)
+
+    # Assert
+    assert [recorded.name for recorded in trace.spans] == ["sql"]
+    assert trace.spans[0].attributes["db.operation"] == "select"
+    assert trace.spans[0].end > trace.spans[0].start
+
+
+def test_sampled_traces_export_as_otlp_json(tmp_path):
+    """Test one ExportTraceServiceRequest line per exported trace"""
+    # Arrange
+    path = tmp_path / "traces.jsonl"
+    trace = Trace("GET /api/v1/items", sampled=True)
+    auth_span = trace.add("auth", trace.root.start)
+    auth_span.end = auth_span.start + 0.001
+    trace.root.end = trace.root.start + 0.002
+
+    # Act
+    TraceExporter(str(path)).export(trace)
+
+    # Assert
+    line, = path.read_text().splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root, auth = spans
+    assert len(root["traceId"]) == 32 and auth["traceId"] == root["traceId"]
+    assert auth["parentSpanId"] == root["spanId"] and "parentSpanId" not in root
+    assert root["kind"] == 2
+    assert abs(int(auth["endTimeUnixNano"]) - int(auth["startTimeUnixNano"]) - 1_000_000) <= 1
@@ -0,0 +1,79 @@
+"""
+Tests for connection pool sizing and telemetry
+
+This module checks the Settings-driven pool options and the Prometheus
+metrics exported by instrument_pool.
+"""
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from src.backend.core.monitoring import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CONNECTION_EVENTS,
+    DB_POOL_OVERFLOW,
+)
+from src.backend.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, get_pool_options, instrument_pool
+
+
+def test_pool_options_follow_settings():
+    """Test that file databases get a sized, instrumented pool"""
+    options = get_pool_options("sqlite:///./app.db", pool_size=3)
+    async_options = get_pool_options("postgresql://db/app", is_async=True)
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 3
+    assert async_options["poolclass"] is InstrumentedAsyncQueuePool
+    assert "pool_timeout" in async_options
+
+
+def test_in_memory_sqlite_keeps_default_pool():
+    """Test that unsized in-memory pools only get pre-ping and recycle"""
+    assert set(get_pool_options("sqlite://")) == {"pool_pre_ping", "pool_recycle"}
+
+
+def test_pool_metrics(tmp_path):
+    """Test checked-out, overflow, wait time, timeout and churn metrics"""
+    # Arrange
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        **{**get_pool_options("sqlite:///pool.db", pool_size=1, max_overflow=1), "pool_timeout": 0.05},
+    )
+    instrument_pool(engine, "test")
+    connects = DB_POOL_CONNECTION_EVENTS.labels(pool="test", event="connect")._value.get()
+    waits = DB_POOL_CHECKOUT_WAIT.labels(pool="test")._sum.get()
+
+    # Act
+    first, second = engine.connect(), engine.connect()
+    checked_out = DB_POOL_CHECKED_OUT.labels(pool="test")._value.get()
+    overflow = DB_POOL_OVERFLOW.labels(pool="test")._value.get()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    second.invalidate()
+    second.close()
+    first.execute(text("SELECT 1"))
+    first.close()
+
+    # Assert
+    assert checked_out == 2
+    assert overflow == 1
+    assert DB_POOL_CHECKED_OUT.labels(pool="test")._value.get() == 0
+    assert DB_POOL_CHECKOUT_TIMEOUTS.labels(pool="test")._value.get() == 1
+    assert DB_POOL_CHECKOUT_WAIT.labels(pool="test")._sum.get() - waits >= 0.05
+    assert DB_POOL_CONNECTION_EVENTS.labels(pool="test", event="connect")._value.get() - connects == 2
+    assert DB_POOL_CONNECTION_EVENTS.labels(pool="test", event="invalidate")._value.get() == 1
+
+
+def test_metrics_survive_dispose(tmp_path):
+    """Test that the recreated pool after dispose keeps its label and listeners"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", **get_pool_options("sqlite:///pool.db"))
+    instrument_pool(engine, "disposed")
+
+    engine.dispose()
+    with engine.connect():
+        checked_out = DB_POOL_CHECKED_OUT.labels(pool="disposed")._value.get()
+
+    assert engine.pool.metrics_name == "disposed"
+    assert checked_out == 1
+    assert DB_POOL_CHECKED_OUT.labels(pool="disposed")._value.get() == 0
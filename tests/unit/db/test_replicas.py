@@ -0,0 +1,195 @@
+"""
+Tests for read-replica routing
+
+This module runs RoutingSession against a primary and two replicas, each a
+separate local SQLite file holding a differently titled item, so every read
+reveals which database served it.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from src.backend.api.v1.services.item import AsyncItemService, ItemService
+from src.backend.core.monitoring import DB_REPLICA_LAG, DB_REPLICA_QUERY_LATENCY
+from src.backend.db.replicas import (
+    ReplicaPool,
+    RoutingSession,
+    instrument_replica,
+    measure_replica_lag,
+    reads_from_replica,
+    replication_heartbeat,
+    use_primary,
+    write_heartbeat,
+)
+from src.backend.models.item import Base, Item
+from src.backend.repositories.base import BaseRepository
+
+
+class ItemRepository(BaseRepository):
+    def __init__(self, db):
+        super().__init__(Item, db)
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """Create primary, replica0 and replica1 files, each with one item"""
+    urls = {}
+    for name in ("primary", "replica0", "replica1"):
+        urls[name] = f"sqlite:///{tmp_path / name}.db"
+        engine = create_engine(urls[name])
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(Item.__table__.insert().values(id=1, title=name, owner_id="owner-1"))
+        engine.dispose()
+    return urls
+
+
+@pytest.fixture
+def session_factory(databases):
+    """Routing sessionmaker over the primary and both replicas"""
+    replicas = ReplicaPool({
+        name: create_engine(databases[name], poolclass=NullPool) for name in ("replica0", "replica1")
+    })
+    for name, engine in replicas.engines.items():
+        instrument_replica(name, engine)
+    primary = create_engine(databases["primary"], poolclass=NullPool)
+    return sessionmaker(class_=RoutingSession, autoflush=False, primary=primary, replicas=replicas)
+
+
+def test_reads_round_robin_across_replicas(session_factory):
+    """Test that repository and service reads are spread over the replicas"""
+    # Arrange
+    before = DB_REPLICA_QUERY_LATENCY.labels(replica="replica0")._sum.get()
+
+    # Act
+    titles = []
+    for _ in range(2):
+        with session_factory() as db:
+            titles.append(ItemRepository(db).get(1).title)
+        with session_factory() as db:
+            titles.append(ItemService(db).get_items()[0].title)
+
+    # Assert
+    assert titles == ["replica0", "replica1", "replica0", "replica1"]
+    assert DB_REPLICA_QUERY_LATENCY.labels(replica="replica0")._sum.get() > before
+
+
+def test_session_sticks_to_one_replica(session_factory):
+    """Test that all reads of one session come from the same replica"""
+    with session_factory() as db:
+        titles = {ItemRepository(db).get_multi()[0].title for _ in range(3)}
+
+    assert len(titles) == 1
+
+
+def test_writes_and_later_reads_use_primary(session_factory):
+    """Test read-your-writes: a session that wrote reads from the primary"""
+    with session_factory() as db:
+        # Act
+        db.execute(update(Item).where(Item.id == 1).values(description="changed"))
+        item = db.execute(select(Item).where(Item.id == 1)).scalar_one()
+
+        # Assert
+        assert item.title == "primary"
+        assert item.description == "changed"
+
+
+def test_flush_pins_session_to_primary(session_factory):
+    """Test that ORM inserts go to the primary and are visible afterwards"""
+    with session_factory() as db:
+        # Act
+        db.add(Item(id=2, title="new", owner_id="owner-1"))
+        db.commit()
+
+        # Assert
+        assert [item.title for item in ItemService(db).get_items()] == ["primary", "new"]
+
+
+def test_use_primary_routes_reads_to_primary(session_factory):
+    """Test that a pinned session never touches the replicas"""
+    with session_factory() as db:
+        use_primary(db)
+
+        assert ItemRepository(db).get(1).title == "primary"
+
+
+def test_replica_reads_skip_the_item_cache(session_factory, databases):
+    """Test that only sessions reading from lagging replicas get no cache generation"""
+    # Arrange
+    primary = create_engine(databases["primary"], poolclass=NullPool)
+    local = sessionmaker(
+        class_=RoutingSession, primary=primary,
+        replicas=ReplicaPool({"local": primary}, lagging=False),
+    )
+
+    with session_factory() as db, session_factory() as pinned, local() as same_file:
+        use_primary(pinned)
+
+        # Act
+        generations = [ItemService(session).get_cache_generation("owner-1") for session in (db, pinned, same_file)]
+
+        # Assert
+        assert [reads_from_replica(session) for session in (db, pinned, same_file)] == [True, False, False]
+        assert generations == [None, 0, 0]
+
+
+def test_async_session_routes_reads_to_replicas(databases):
+    """Test that AsyncSession uses the same routing via sync_session_class"""
+    # Arrange
+    engines = {
+        name: create_async_engine(url.replace("sqlite:", "sqlite+aiosqlite:"), poolclass=NullPool)
+        for name, url in databases.items()
+    }
+    factory = async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+        primary=engines["primary"].sync_engine,
+        replicas=ReplicaPool({
+            name: engines[name].sync_engine for name in ("replica0", "replica1")
+        }),
+    )
+
+    async def read_and_write():
+        async with factory() as db:
+            read = (await AsyncItemService(db).get_item(1)).title
+        async with factory() as db:
+            await db.execute(update(Item).where(Item.id == 1).values(description="x"))
+            written = (await AsyncItemService(db).get_item(1)).title
+        for engine in engines.values():
+            await engine.dispose()
+        return read, written
+
+    # Act
+    read, written = asyncio.run(read_and_write())
+
+    # Assert
+    assert read == "replica0"
+    assert written == "primary"
+
+
+def test_measure_replica_lag(databases, session_factory):
+    """Test that lag is the age of each replica's copy of the heartbeat"""
+    # Arrange
+    primary = create_engine(databases["primary"])
+    write_heartbeat(primary)
+    with primary.connect() as connection:
+        written_at = connection.execute(select(replication_heartbeat.c.written_at)).scalar()
+    # Stand-in replication: replica0 receives a 5 second old heartbeat,
+    # replica1 receives nothing
+    replica0 = create_engine(databases["replica0"])
+    replication_heartbeat.create(replica0)
+    with replica0.begin() as connection:
+        connection.execute(replication_heartbeat.insert().values(id=1, written_at=written_at - 5))
+
+    # Act
+    lags = measure_replica_lag(session_factory.kw["replicas"])
+
+    # Assert
+    assert lags["replica0"] >= 5
+    assert lags["replica1"] is None
+    assert DB_REPLICA_LAG.labels(replica="replica0")._value.get() == lags["replica0"]
@@ -0,0 +1,119 @@
+"""
+Tests for the batch helpers and lookup cache of BaseRepository
+
+This module runs an items repository against a temporary SQLite file and
+counts the statements each call sends to the database.
+"""
+import pytest
+from sqlalchemy import create_engine, event, insert, update
+from sqlalchemy.orm import Session
+
+from src.backend.models.item import Base, Item
+from src.backend.repositories.base import BaseRepository
+
+
+class ItemRepository(BaseRepository):
+    def __init__(self, db):
+        super().__init__(Item, db)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine on a temporary database holding items 1 to 5"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Item), [
+            {"id": i, "title": f"Item {i}", "owner_id": "owner-1"} for i in range(1, 6)
+        ])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements executed on the engine, appended as they run"""
+    executed = []
+    event.listen(engine, "before_cursor_execute", lambda *args: executed.append(args[2]))
+    return executed
+
+
+def test_get_many_preserves_order_and_reports_missing(engine, statements, monkeypatch):
+    """Test that ids are fetched in chunked IN queries, skipping loaded rows"""
+    monkeypatch.setattr("src.backend.repositories.base.settings.BULK_CHUNK_SIZE", 2)
+    with Session(engine) as db:
+        repository = ItemRepository(db)
+        repository.get(4)
+        statements.clear()
+
+        # Act
+        found, missing = repository.get_many([5, 9, 1, 4, 1, 2])
+
+        # Assert
+        assert [item.id for item in found] == [5, 1, 4, 2]
+        assert missing == [9]
+        # 5, 9, 1, 2 still had to be read: two chunks of two
+        assert len(statements) == 2
+        assert repository.exists_many([3, 9, 4]) == [(3, True), (9, False), (4, True)]
+
+
+def test_repeated_lookups_hit_the_session(engine, statements):
+    """Test that get and get_by only query once per session until a write"""
+    with Session(engine) as db:
+        repository = ItemRepository(db)
+
+        # Act
+        first = repository.get_by(title="Item 2")
+        again = repository.get_by(title="Item 2")
+        by_id = repository.get(2)
+        queried = len(statements)
+        repository.update(db_obj=first, obj_in={"title": "Renamed"})
+
+        # Assert
+        assert again is first and by_id is first
+        assert queried == 1
+        assert repository.get_by(title="Item 2") is None
+        assert repository.get_by(title="Renamed").id == 2
+
+
+def test_writes_outside_the_repository_drop_lookups(engine, statements):
+    """Test that a commit made through the session clears the remembered rows"""
+    with Session(engine) as db:
+        repository = ItemRepository(db)
+        assert repository.get_by(title="Item 3").id == 3
+
+        # Act
+        db.execute(update(Item).where(Item.id == 3).values(title="Moved"))
+        db.commit()
+        statements.clear()
+
+        # Assert
+        assert repository.get_by(title="Item 3") is None
+        assert repository.get(3).title == "Moved"
+        assert len(statements) == 2
+
+
+def test_bulk_create_and_update(engine):
+    """Test that bulk helpers return rows in input order and report missing ids"""
+    with Session(engine) as db:
+        repository = ItemRepository(db)
+        repository.get(1)
+
+        # Act
+        created = repository.bulk_create([
+            {"title": f"New {i}", "description": None, "owner_id": "owner-2"} for i in range(3)
+        ])
+        updated, missing = repository.bulk_update({
+            1: {"title": "Changed"},
+            created[0].id: {"description": "bulk"},
+            99: {"title": "Nowhere"},
+        })
+
+        # Assert
+        assert [item.title for item in created] == ["New 0", "New 1", "New 2"]
+        assert [(item.id, item.title, item.description) for item in updated] == [
+            (1, "Changed", None),
+            (created[0].id, "New 0", "bulk"),
+        ]
+        assert missing == [99]
+        assert repository.get(1).title == "Changed"
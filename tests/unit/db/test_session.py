@@ -0,0 +1,59 @@
+"""
+Tests for database session setup
+
+This module covers the SQLite performance profile helpers in db.session.
+"""
+import sqlite3
+
+import pytest
+
+from src.backend.db.session import (
+    configure_sqlite_connection,
+    get_async_database_url,
+    get_read_only_url,
+    is_sqlite_file,
+)
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("sqlite:///./app.db", True),
+        ("sqlite://", False),
+        ("sqlite:///:memory:", False),
+        ("postgresql://user:pass@db/app", False),
+    ],
+)
+def test_is_sqlite_file(url, expected):
+    """Test that only on-disk SQLite databases get the profile"""
+    assert is_sqlite_file(url) is expected
+
+
+def test_read_only_url_opens_same_file_read_only(tmp_path):
+    """Test that the reader URL cannot write to the database"""
+    # Arrange
+    path = tmp_path / "app.db"
+    sqlite3.connect(path).execute("CREATE TABLE items (id INTEGER)")
+    read_only_url = get_read_only_url(f"sqlite:///{path}")
+
+    # Act
+    async_url = get_async_database_url(read_only_url)
+
+    # Assert
+    assert "mode=ro" in read_only_url and "uri=true" in read_only_url
+    assert async_url.startswith("sqlite+aiosqlite:///")
+
+
+def test_configure_sqlite_connection_applies_pragmas(tmp_path):
+    """Test that writer connections switch to WAL with the tuned pragmas"""
+    # Arrange
+    connection = sqlite3.connect(tmp_path / "app.db")
+
+    # Act
+    configure_sqlite_connection(connection)
+
+    # Assert
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert connection.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert connection.execute("PRAGMA busy_timeout").fetchone()[0] > 0
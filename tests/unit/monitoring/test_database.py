@@ -0,0 +1,72 @@
+"""
+Tests for automatic database statement instrumentation
+
+This module checks statement description and fingerprinting, and that an
+instrumented engine records count, latency and rows for ORM queries.
+"""
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session
+
+from src.backend.api.v1.services.item import ItemService
+from src.backend.core.monitoring import DB_QUERY_COUNT, DB_QUERY_LATENCY, DB_QUERY_ROWS
+from src.backend.models.item import Base, Item
+from src.backend.monitoring.database import describe_statement, fingerprint_statement, instrument_engine
+
+
+@pytest.mark.parametrize(
+    "statement, operation, table",
+    [
+        ("SELECT items.id FROM items WHERE items.owner_id = ?", "select", "items"),
+        ('INSERT INTO "items" (title) VALUES (?)', "insert", "items"),
+        ("UPDATE items SET title=? WHERE items.id = ?", "update", "items"),
+        ("DELETE FROM items WHERE items.id = ?", "delete", "items"),
+        ("SELECT count(*) FROM (SELECT id FROM users) AS anon_1", "select", "users"),
+        ("WITH t AS (SELECT 1) DELETE FROM items WHERE id IN (SELECT * FROM t)", "delete", "items"),
+        ("PRAGMA journal_mode=WAL", "pragma", "none"),
+        ("SELECT 1", "select", "none"),
+    ],
+)
+def test_describe_statement(statement, operation, table):
+    """Test operation and table labels derived from SQL"""
+    info = describe_statement(statement)
+
+    assert (info.operation, info.table) == (operation, table)
+
+
+def test_fingerprint_normalises_literals_and_lists():
+    """Test that executions differing only in values share a fingerprint"""
+    first = fingerprint_statement("SELECT * FROM items WHERE id IN (1, 2, 3) AND title = 'a'  LIMIT 10")
+    second = fingerprint_statement("SELECT * FROM items\nWHERE id IN (?, ?) AND title = :title LIMIT %s")
+    rows = fingerprint_statement("INSERT INTO items (title) VALUES (?), (?), (?)")
+
+    assert first == second == "SELECT * FROM items WHERE id IN (?) AND title = ? LIMIT ?"
+    assert rows == "INSERT INTO items (title) VALUES (?)"
+    assert fingerprint_statement("SELECT items_1.id FROM items AS items_1") == "SELECT items_1.id FROM items AS items_1"
+
+
+def test_instrumented_engine_records_queries(tmp_path):
+    """Test that ORM queries are measured without any decorators"""
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    instrument_engine(engine)
+    instrument_engine(engine)  # idempotent
+    selects = DB_QUERY_COUNT.labels(operation="select", table="items")._value.get()
+    select_rows = DB_QUERY_ROWS.labels(operation="select", table="items")._sum.get()
+    deleted_rows = DB_QUERY_ROWS.labels(operation="delete", table="items")._sum.get()
+
+    # Act
+    with Session(engine) as db:
+        db.add_all([Item(title=f"Item {i}", owner_id="owner-1") for i in range(3)])
+        db.commit()
+        items = ItemService(db).get_items(owner_id="owner-1")
+        db.execute(delete(Item).where(Item.title == "Item 0"))
+        db.commit()
+
+    # Assert
+    assert len(items) == 3
+    assert DB_QUERY_COUNT.labels(operation="select", table="items")._value.get() - selects == 1
+    assert DB_QUERY_LATENCY.labels(operation="select", table="items")._sum.get() > 0
+    assert DB_QUERY_ROWS.labels(operation="select", table="items")._sum.get() - select_rows == 3
+    assert DB_QUERY_ROWS.labels(operation="delete", table="items")._sum.get() - deleted_rows == 1
@@ -0,0 +1,97 @@
+"""
+Tests for the per-request query budget
+
+This module checks budget and repeated-statement detection on QueryStats
+and that the engine hook counts statements of the current request.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.backend.models.item import Base, Item
+from src.backend.monitoring import query_budget as query_budget_module
+from src.backend.monitoring.query_budget import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    QueryStats,
+    current_query_stats,
+    install_query_budget,
+)
+
+
+def test_budget_overrun_raises_on_check():
+    """Test that an overrun is recorded, and only raised by check() in raise mode"""
+    stats = QueryStats(budget=2, repeat_threshold=10, enforce="raise")
+    for statement in ("SELECT a", "SELECT b", "SELECT c"):
+        stats.record(statement, 0.001)
+
+    assert stats.count == 3
+    with pytest.raises(QueryBudgetExceeded, match="3 queries exceed the budget of 2"):
+        stats.check()
+
+
+def test_repeated_statement_is_logged_once(capsys):
+    """Test N+1 detection in log mode"""
+    # Arrange
+    stats = QueryStats(budget=100, repeat_threshold=3, enforce="log")
+
+    # Act
+    for _ in range(5):
+        stats.record("SELECT * FROM items WHERE id = ?", 0.001)
+
+    # Assert
+    assert len(stats.violations) == 1
+    assert "possible N+1" in capsys.readouterr().out
+
+
+def test_engine_hook_counts_request_statements(tmp_path):
+    """Test that an N+1 loop through the ORM is caught"""
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    install_query_budget(engine)
+    stats = QueryStats(budget=100, repeat_threshold=3, enforce="raise")
+    token = current_query_stats.set(stats)
+
+    # Act
+    try:
+        with Session(engine) as db:
+            db.scalars(select(Item)).all()
+            for item_id in range(5):
+                db.get(Item, item_id)
+    finally:
+        current_query_stats.reset(token)
+
+    # Assert
+    assert stats.count == 6
+    assert stats.duration > 0
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+        stats.check()
+
+
+@pytest.mark.parametrize("enforce", ["log", "raise"])
+def test_middleware_raises_only_when_asked_after_the_handler(monkeypatch, enforce):
+    """Test that the handler runs to the end and raise mode fails the request afterwards"""
+    # Arrange
+    monkeypatch.setattr(query_budget_module.settings, "QUERY_BUDGET_ENFORCE", enforce)
+    finished = []
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware)
+
+    @app.get("/")
+    def over_budget():
+        stats = current_query_stats.get()
+        for statement in range(query_budget_module.settings.QUERY_BUDGET_DEFAULT + 1):
+            stats.record(f"SELECT {statement}", 0.001)
+        finished.append(True)
+        return {}
+
+    # Act / Assert
+    if enforce == "raise":
+        with pytest.raises(QueryBudgetExceeded):
+            TestClient(app).get("/")
+    else:
+        assert TestClient(app).get("/").status_code == 200
+    assert finished == [True]
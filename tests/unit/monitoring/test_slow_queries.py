@@ -0,0 +1,89 @@
+"""
+Tests for the slow-query log
+
+This module records queries against a temporary SQLite items table with a
+zero threshold and checks the captured entry, plan and full-scan flag.
+"""
+import json
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.backend.core.request_context import current_scope
+from src.backend.models.item import Base, Item
+from src.backend.monitoring.slow_queries import SlowQueryLog, is_full_scan, parameter_shape
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Temporary SQLite database with the items table"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def test_records_fingerprint_shape_route_and_flags_full_scan(engine, tmp_path):
+    """Test the entry of an unindexed filter run inside a request"""
+    # Arrange
+    path = tmp_path / "slow.jsonl"
+    log = SlowQueryLog(threshold_ms=0, path=str(path))
+    log.install(engine)
+    token = current_scope.set({"type": "http", "method": "GET", "path": "/api/v1/items/"})
+
+    # Act
+    try:
+        with Session(engine) as db:
+            db.scalars(select(Item).where(Item.description == "x").limit(5)).all()
+    finally:
+        current_scope.reset(token)
+
+    # Assert
+    entry = next(entry for entry in log.entries() if entry["table"] == "items")
+    assert entry["route"] == "GET /api/v1/items/"
+    assert entry["fingerprint"].endswith("WHERE items.description = ? LIMIT ? OFFSET ?")
+    assert entry["parameters"] == ["str", "int", "int"]
+    assert entry["full_scan"] is True
+    assert any(line.startswith("SCAN items") for line in entry["plan"])
+    assert json.loads(path.read_text().splitlines()[-1]) == log.entries()[0]
+
+
+def test_indexed_lookup_is_not_flagged(engine):
+    """Test that a search on an indexed column is not a full scan"""
+    # Arrange
+    log = SlowQueryLog(threshold_ms=0)
+    log.install(engine)
+
+    # Act
+    with Session(engine) as db:
+        db.scalars(select(Item).where(Item.owner_id == "owner-1")).all()
+
+    # Assert
+    entry = log.entries()[0]
+    assert entry["full_scan"] is False
+    assert "USING INDEX" in entry["plan"][0]
+
+
+def test_log_is_bounded_and_respects_threshold(engine):
+    """Test the ring buffer size and that fast queries are skipped"""
+    # Arrange
+    bounded, strict = SlowQueryLog(threshold_ms=0, maxsize=2), SlowQueryLog(threshold_ms=60_000)
+    bounded.install(engine)
+    strict.install(engine)
+
+    # Act
+    with Session(engine) as db:
+        for item_id in range(3):
+            db.get(Item, item_id)
+
+    # Assert
+    assert len(bounded.entries()) == 2
+    assert strict.entries() == []
+
+
+def test_helpers():
+    """Test parameter shapes and plan classification"""
+    assert parameter_shape({"id": 1, "title": "x"}) == {"id": "int", "title": "str"}
+    assert parameter_shape([(1,), (2,)], executemany=True) == {"batch": 2, "row": ["int"]}
+    assert is_full_scan("postgresql", ["Seq Scan on items  (cost=0.00..1.01 rows=1 width=4)"])
+    assert not is_full_scan("sqlite", ["SCAN items USING COVERING INDEX ix_items_owner_id"])
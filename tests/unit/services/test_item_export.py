@@ -0,0 +1,96 @@
+"""
+Tests for the streaming item export
+
+This module drives AsyncItemService.export_items directly against a
+temporary SQLite file and checks the encoded output and that memory stays
+bounded while a million rows are streamed.
+"""
+import asyncio
+import csv
+import io
+import json
+import os
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.api.v1.services.item import AsyncItemService
+from src.backend.models.item import Base
+
+
+def seed(path, rows, owners=1):
+    """Create the items table and insert rows with raw executemany"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    connection = sqlite3.connect(path)
+    # The export does not read the search index, so skip maintaining it
+    connection.execute("UPDATE items_fts_state SET deferred = 1")
+    connection.executemany(
+        "INSERT INTO items (title, description, owner_id, created_at) VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+        ((f"Item {i}", "a, \"quoted\" description", f"owner-{i % owners}") for i in range(rows)),
+    )
+    connection.commit()
+    connection.close()
+
+
+def export(path, owner_id, format, consume):
+    """Run export_items and hand every chunk to consume"""
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with AsyncSession(engine) as db:
+            async for chunk in await AsyncItemService(db).export_items(owner_id, format=format):
+                consume(chunk)
+        await engine.dispose()
+    asyncio.run(run())
+
+
+def resident_memory():
+    """Current RSS in bytes"""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def test_ndjson_and_csv_contain_only_the_owners_items(tmp_path):
+    """Test both formats, including CSV quoting"""
+    # Arrange
+    path = tmp_path / "items.db"
+    seed(path, rows=6, owners=2)
+    ndjson, text = [], []
+
+    # Act
+    export(path, "owner-1", "ndjson", ndjson.append)
+    export(path, "owner-1", "csv", lambda chunk: text.append(chunk.decode()))
+
+    # Assert
+    items = [json.loads(line) for line in b"".join(ndjson).splitlines()]
+    assert [item["title"] for item in items] == ["Item 1", "Item 3", "Item 5"]
+    assert {item["owner_id"] for item in items} == {"owner-1"}
+    rows = list(csv.DictReader(io.StringIO("".join(text))))
+    assert [row["id"] for row in rows] == [str(item["id"]) for item in items]
+    assert rows[0]["description"] == 'a, "quoted" description'
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc to read RSS")
+def test_export_of_a_million_rows_keeps_memory_bounded(tmp_path):
+    """Test that RSS does not grow with the number of exported rows"""
+    # Arrange
+    path = tmp_path / "items.db"
+    seed(path, rows=1_000_000)
+    counted = {"lines": 0, "peak": 0}
+    baseline = resident_memory()
+
+    def consume(chunk):
+        counted["lines"] += chunk.count(b"\n")
+        counted["peak"] = max(counted["peak"], resident_memory())
+
+    # Act
+    export(path, "owner-0", "ndjson", consume)
+
+    # Assert
+    assert counted["lines"] == 1_000_000
+    # The whole export is ~150 MB of NDJSON; streaming keeps growth to a few batches
+    assert counted["peak"] - baseline < 50 * 1024 * 1024
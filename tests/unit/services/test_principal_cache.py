@@ -0,0 +1,85 @@
+"""
+Tests for the principal cache behind api.deps.get_current_user
+
+This module runs UserService against an in-memory SQLite database and
+checks that principals are served from the cache until the user changes.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.backend.core.monitoring import AUTH_PRINCIPAL_CACHE
+from src.backend.models.primary.base import Base
+from src.backend.models.primary.user import User
+from src.backend.services.user_service import (
+    Principal,
+    UserService,
+    invalidate_principal,
+    principal_cache,
+)
+
+
+@pytest.fixture
+def db():
+    """Session on a fresh database holding one active user"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    principal_cache.clear()
+    with Session(engine) as session:
+        session.add(User(id=1, email="user@example.com", hashed_password="x", is_active=True))
+        session.commit()
+        yield session
+    principal_cache.clear()
+    engine.dispose()
+
+
+def lookups(result):
+    return AUTH_PRINCIPAL_CACHE.labels(result=result)._value.get()
+
+
+def test_principal_is_a_cached_snapshot(db):
+    """Test that the second lookup is a hit returning a detached snapshot"""
+    # Arrange
+    service = UserService(db)
+    hits, misses = lookups("hit"), lookups("miss")
+
+    # Act
+    first = service.get_principal(1)
+    second = service.get_principal(1)
+
+    # Assert
+    assert isinstance(first, Principal)
+    assert second is first
+    assert (first.id, first.email, first.is_active, first.is_superuser) == (1, "user@example.com", True, False)
+    assert not hasattr(first, "__dict__")
+    assert lookups("hit") - hits == 1
+    assert lookups("miss") - misses == 1
+
+
+def test_update_invalidates_the_principal(db):
+    """Test that a deactivation is seen on the next lookup"""
+    # Arrange
+    service = UserService(db)
+    assert service.get_principal(1).is_active
+
+    # Act
+    service.update(service.get(1), {"is_active": False})
+
+    # Assert
+    assert service.get_principal(1).is_active is False
+
+
+def test_missing_users_are_not_cached(db):
+    """Test that a user created after a failed lookup is found"""
+    # Arrange
+    service = UserService(db)
+    assert service.get_principal(2) is None
+
+    # Act
+    db.add(User(id=2, email="new@example.com", hashed_password="x"))
+    db.commit()
+
+    # Assert
+    assert service.get_principal(2).email == "new@example.com"
+    invalidate_principal(2)
+    assert principal_cache.get(2) is None
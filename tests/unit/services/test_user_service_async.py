@@ -0,0 +1,81 @@
+"""
+Tests for the async UserService methods
+
+This module runs create_async, update_async and authenticate_async against
+a real SQLite session and the process-wide password hashing pool.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.backend.api.v1.schemas.user import UserCreate, UserUpdate
+from src.backend.core.security import get_password_hasher, verify_password
+from src.backend.models.primary.base import Base
+from src.backend.models.primary.user import User
+from src.backend.services.user_service import UserService, principal_cache
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Session on a fresh database file, usable from the worker threads"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'users.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    principal_cache.clear()
+    with Session(engine) as session:
+        yield session
+    principal_cache.clear()
+    get_password_hasher().shutdown()
+    engine.dispose()
+
+
+def test_create_async_stores_a_hashed_user(db):
+    """Test that create_async persists the user with a pooled password hash"""
+    # Arrange
+    service = UserService(db)
+    user_in = UserCreate(email="new@example.com", password="password123", full_name="New User")
+
+    # Act
+    user = asyncio.run(service.create_async(user_in))
+
+    # Assert
+    stored = db.query(User).filter_by(email="new@example.com").one()
+    assert stored.id == user.id
+    assert stored.is_active and not stored.is_superuser
+    assert stored.hashed_password != "password123"
+    assert verify_password("password123", stored.hashed_password)
+
+
+def test_update_async_rehashes_a_new_password(db):
+    """Test that update_async hashes the new password and keeps other fields"""
+    # Arrange
+    service = UserService(db)
+    user = asyncio.run(service.create_async(UserCreate(email="user@example.com", password="old-password")))
+
+    # Act
+    updated = asyncio.run(service.update_async(user, UserUpdate(password="new-password")))
+
+    # Assert
+    assert updated.email == "user@example.com"
+    assert verify_password("new-password", updated.hashed_password)
+    assert not verify_password("old-password", updated.hashed_password)
+
+
+def test_authenticate_async_checks_the_password(db):
+    """Test that authenticate_async accepts the right password only"""
+    # Arrange
+    service = UserService(db)
+    user = asyncio.run(service.create_async(UserCreate(email="user@example.com", password="password123")))
+
+    # Act
+    authenticated = asyncio.run(service.authenticate_async("user@example.com", "password123"))
+    wrong_password = asyncio.run(service.authenticate_async("user@example.com", "wrong_password"))
+    unknown_email = asyncio.run(service.authenticate_async("nobody@example.com", "password123"))
+
+    # Assert
+    assert authenticated.id == user.id
+    assert wrong_password is None
+    assert unknown_email is None